@@ -0,0 +1,286 @@
+"""
+Decode benchmark for selective getSynset decoding.
+
+Decodes the same getSynset bodies three ways and reports, per body, the decode
+time, the time to also encode the result for the response cache (what a fetch
+pays before answering), the peak memory, and the size of what is kept in
+memory and in the cache:
+
+- full: the whole body (what the client did before selective decoding)
+- projected: the whole body, projected in place with the get_definition
+  projection (the default with SELECTIVE_DECODE)
+- streamed: parsed incrementally with ijson, building only the projected parts
+  (STREAM_DECODE; skipped when ijson is not installed)
+
+Each mode runs in its own process with the same bodies loaded, so their peak
+RSS readings compare directly. Bodies are recorded getSynset responses (fixture files in the
+benchmarks/fixtures format), synsets from a dump (see `babelnet-mcp
+import-dump`), or generated popular concepts with thousands of senses.
+
+Usage:
+    python benchmarks/decode.py
+    python benchmarks/decode.py --senses 8000 --count 5
+    python benchmarks/decode.py --fixtures ./recorded/*.jsonl
+    python benchmarks/decode.py --dump ./dumps/synsets.jsonl
+"""
+
+import argparse
+import gc
+import json
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from babelnet_mcp.decode import (  # noqa: E402
+    DEFINITION_PROJECTION,
+    STREAM_CHUNK_BYTES,
+    ChunkReader,
+    can_stream,
+    decode_projected,
+)
+from babelnet_mcp.local_store import iter_dump  # noqa: E402
+from babelnet_mcp.model import loads  # noqa: E402
+
+LANGUAGES = [
+    "EN", "IT", "ES", "FR", "DE", "PT", "ZH", "JA", "RU", "AR", "NL", "PL", "SV", "TR",
+    "KO", "FI", "CS", "HU", "EL", "HE", "FA", "UK", "RO", "DA", "NO", "CA", "VI", "ID",
+]
+SOURCES = ["WN", "OMWN", "WIKI", "WIKIDATA", "WIKIRED", "WIKT", "OMWIKI", "MSTERM", "GEONM"]
+MODES = ("full", "projected", "streamed")
+MB = 1024 ** 2
+
+
+def popular_synset(index: int, senses: int, rng: random.Random) -> Dict[str, Any]:
+    """Generate a getSynset payload shaped like a popular concept (e.g. a country)."""
+    sid = f"bn:{index:08d}n"
+    sense_list = []
+    for n in range(senses):
+        lang = rng.choice(LANGUAGES)
+        lemma = f"lemma_{index}_{n}_{lang.lower()}"
+        sense_list.append({
+            "type": "BabelSense",
+            "properties": {
+                "fullLemma": lemma,
+                "simpleLemma": lemma,
+                "source": rng.choice(SOURCES),
+                "senseKey": f"{rng.randint(0, 10 ** 9)}",
+                "frequency": rng.randint(0, 50),
+                "language": lang,
+                "pos": "NOUN",
+                "synsetID": {"id": sid, "pos": "NOUN", "source": "BABELNET"},
+                "translationInfo": "",
+                "pronunciations": {
+                    "audios": [
+                        {"lemma": lemma, "language": lang, "filename": f"{lemma}.ogg"}
+                        for _ in range(rng.randint(0, 2))
+                    ],
+                    "transcriptions": [f"/{lemma}/"] if rng.random() < 0.3 else [],
+                },
+                "bKeySense": rng.random() < 0.05,
+                "idSense": rng.randint(0, 10 ** 8),
+                "lemma": {"lemma": lemma, "type": rng.choice(["HIGH_QUALITY", "POTENTIAL"])},
+            },
+        })
+    glosses = [
+        {
+            "source": rng.choice(SOURCES),
+            "sourceSense": rng.randint(0, 10 ** 8),
+            "language": lang,
+            "gloss": f"Definition of synset {index} in {lang}, a sentence of typical length.",
+            "tokens": [
+                {"start": 0, "end": 10, "id": {"id": sid, "pos": "NOUN", "source": "BABELNET"},
+                 "word": "Definition"}
+            ],
+        }
+        for lang in LANGUAGES
+    ]
+    return {
+        "senses": sense_list,
+        "wnOffsets": [{"id": f"wn:{index:08d}n", "pos": "NOUN", "source": "WN"}],
+        "glosses": glosses,
+        "examples": [
+            {"source": "WIKT", "language": lang, "example": f"An example sentence in {lang}."}
+            for lang in LANGUAGES
+        ],
+        "images": [
+            {
+                "name": f"image_{n}.jpg", "languages": LANGUAGES[:5], "urlSource": "WIKI",
+                "license": "CC_BY_SA_30", "thumbUrl": f"https://upload.example.org/t/{n}.jpg",
+                "url": f"https://upload.example.org/{n}.jpg", "badImage": False,
+            }
+            for n in range(senses // 20)
+        ],
+        "sigle": [],
+        "categories": [
+            {"category": f"Category_{n}", "language": rng.choice(LANGUAGES)}
+            for n in range(senses // 10)
+        ],
+        "translations": {},
+        "domains": {"GEOGRAPHY_AND_PLACES": 0.7},
+        "synsetType": "NAMED_ENTITY",
+        "bkeyConcepts": True,
+        "filterLangs": LANGUAGES,
+        "bkeySenses": [],
+    }
+
+
+def load_bodies(args: argparse.Namespace) -> List[bytes]:
+    bodies: List[bytes] = []
+    if args.fixtures:
+        for file in args.fixtures:
+            with open(file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    record = json.loads(line) if line.strip() else {}
+                    if record.get("path") == "getSynset":
+                        bodies.append(json.dumps(record["response"]).encode("utf-8"))
+    elif args.dump:
+        for record in iter_dump([Path(p) for p in args.dump]):
+            bodies.append(json.dumps(record["synset"]).encode("utf-8"))
+    else:
+        rng = random.Random(args.seed)
+        bodies = [
+            json.dumps(popular_synset(i, args.senses, rng)).encode("utf-8")
+            for i in range(args.count)
+        ]
+    return bodies[:args.count]
+
+
+def decoder(mode: str) -> Callable[[bytes], Any]:
+    if mode == "full":
+        return loads
+    if mode == "projected":
+        return lambda body: decode_projected(body, DEFINITION_PROJECTION)
+    # Feed the parser in network-sized chunks, as a streamed response would
+    return lambda body: decode_projected(
+        ChunkReader(
+            body[i:i + STREAM_CHUNK_BYTES] for i in range(0, len(body), STREAM_CHUNK_BYTES)
+        ),
+        DEFINITION_PROJECTION,
+        stream=True,
+    )
+
+
+def cache_encode(value: Any) -> bytes:
+    """Encode a response the way ResponseCache.put stores it."""
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def max_rss() -> int:
+    """Peak resident set size of this process, in bytes."""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def worker(mode: str, bodies_path: Path, repeat: int) -> Dict[str, Any]:
+    """Measure one mode; runs in a fresh process."""
+    with open(bodies_path, 'rb') as f:
+        bodies = [line.rstrip(b"\n") for line in f]
+    decode = decoder(mode)
+    gc.collect()
+    kept_bytes = 0
+    for body in bodies:
+        kept_bytes += len(cache_encode(decode(body)))
+    peak_rss = max_rss()
+
+    timings = []
+    stored = []
+    for _ in range(repeat):
+        for body in bodies:
+            start = time.perf_counter()
+            value = decode(body)
+            decoded = time.perf_counter()
+            cache_encode(value)
+            timings.append(decoded - start)
+            stored.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    peak_heap = held = 0
+    for body in bodies:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        value = decode(body)
+        current, peak = tracemalloc.get_traced_memory()
+        peak_heap = max(peak_heap, peak - before)
+        held = max(held, current - before)
+        del value
+    tracemalloc.stop()
+    timings.sort()
+    stored.sort()
+    return {
+        "mode": mode,
+        "ms_median": timings[len(timings) // 2] * 1000,
+        "ms_stored": stored[len(stored) // 2] * 1000,
+        "peak_rss": peak_rss,
+        "peak_heap": peak_heap,
+        "held": held,
+        "kept_bytes": kept_bytes / len(bodies),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare full and selective getSynset decoding")
+    parser.add_argument("--count", type=int, default=3, help="Number of synsets")
+    parser.add_argument("--senses", type=int, default=5000, help="Senses per generated synset")
+    parser.add_argument("--fixtures", nargs="*", help="Recorded fixture files (getSynset entries)")
+    parser.add_argument("--dump", nargs="*", help="Read payloads from dump files instead")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed decodes per body")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=str, help="Also write the results to this file")
+    parser.add_argument("--worker", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--bodies", type=str, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(worker(args.worker, Path(args.bodies), args.repeat)))
+        return
+
+    bodies = load_bodies(args)
+    if not bodies:
+        sys.exit("No getSynset bodies to measure")
+    size = sum(len(body) for body in bodies) / len(bodies)
+    print(f"{len(bodies)} synsets, {size / MB:.2f} MB of JSON each on average")
+    modes = [m for m in MODES if m != "streamed" or can_stream()]
+    if "streamed" not in modes:
+        print("ijson is not installed: streamed mode skipped (pip install babelnet-mcp[decode])")
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        bodies_path = Path(tmp) / "bodies.jsonl"
+        bodies_path.write_bytes(b"\n".join(bodies))
+        for mode in modes:
+            out = subprocess.run(
+                [sys.executable, __file__, "--worker", mode, "--bodies", str(bodies_path),
+                 "--repeat", str(args.repeat)],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            results.append(json.loads(out))
+
+    print(f"{'mode':<12}{'decode ms':>11}{'+cache ms':>11}{'peak RSS MB':>13}"
+          f"{'peak heap MB':>14}{'held MB':>9}{'cached KB':>11}")
+    for r in results:
+        print(f"{r['mode']:<12}{r['ms_median']:>11.1f}{r['ms_stored']:>11.1f}"
+              f"{r['peak_rss'] / MB:>13.1f}{r['peak_heap'] / MB:>14.1f}"
+              f"{r['held'] / MB:>9.1f}{r['kept_bytes'] / 1024:>11.1f}")
+    full = results[0]
+    for r in results[1:]:
+        print(f"{r['mode']} vs full: decode {r['ms_median'] / full['ms_median']:.2f}x time, "
+              f"decode+cache {r['ms_stored'] / full['ms_stored']:.2f}x time, "
+              f"peak heap {r['peak_heap'] / max(full['peak_heap'], 1):.2f}x, "
+              f"held {r['held'] / max(full['held'], 1):.2f}x, "
+              f"cached {r['kept_bytes'] / full['kept_bytes']:.2f}x")
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,382 @@
+"""
+Local stand-in for the BabelNet REST API.
+
+Serves getVersion, getSynsetIds, getSynset, getSenses and getOutgoingEdges
+from recorded fixtures, with configurable latency and error injection, so the
+client and tools can be benchmarked and tested without network or Babelcoins.
+Requests missing from the fixtures get a deterministic synthetic response
+(unless --no-synthesize), or are forwarded to a real endpoint and recorded
+when --upstream is given.
+
+Fixtures are JSON lines of {"path", "params", "response"} records.
+
+Usage:
+    python benchmarks/fake_server.py --port 8765 --latency 0.05 --jitter 0.02
+    python benchmarks/fake_server.py --error-rate 0.05 --error-status 503 429
+    python benchmarks/fake_server.py --upstream https://babelnet.io/v9 --api-key KEY \\
+        --record benchmarks/fixtures/recorded.jsonl
+
+Point the client at it with BabelNetHTTPClient(..., base_url="http://127.0.0.1:8765").
+GET /__stats returns request counts per endpoint; GET /__reset clears them.
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+ENDPOINTS = ("getVersion", "getSynsetIds", "getSynset", "getSenses", "getOutgoingEdges")
+
+QUOTA_MESSAGE = (
+    "Your key is not valid or the daily requests limit has been reached. "
+    "Please visit http://babelnet.org."
+)
+
+_LANGS = ["EN", "IT", "ES", "FR", "DE", "PT", "NL", "PL", "RU", "JA"]
+_SOURCES = ["WN", "OMWN", "WIKI", "WIKIDATA", "WIKIRED", "WIKT"]
+_POINTERS = [
+    ("@", "Hypernym", "is-a", "HYPERNYM"),
+    ("~", "Hyponym", "has-kind", "HYPONYM"),
+    ("%p", "Part holonym", "part_of", "HOLONYM"),
+    ("#p", "Part meronym", "has_part", "MERONYM"),
+    ("r", "Semantically related form", "related", "OTHER"),
+]
+
+
+def request_key(path: str, params: Dict[str, Any]) -> str:
+    """Key of a request, independent of the API key and of list vs scalar params."""
+    normalized = {
+        name: sorted(str(v) for v in (value if isinstance(value, list) else [value]))
+        for name, value in params.items()
+        if name != "key"
+    }
+    return path + "?" + json.dumps(normalized, sort_keys=True)
+
+
+def load_fixtures(paths: Iterable[Path]) -> Dict[str, Any]:
+    """Read fixture files (or directories of *.jsonl files) into a request-key map."""
+    fixtures: Dict[str, Any] = {}
+    for path in paths:
+        files = sorted(path.glob("*.jsonl")) if path.is_dir() else [path]
+        for file in files:
+            with open(file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        fixtures[request_key(record["path"], record["params"])] = record["response"]
+    return fixtures
+
+
+# -- Synthetic responses ----------------------------------------------------
+
+def _rng(*parts: str) -> random.Random:
+    digest = hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+    return random.Random(int(digest[:16], 16))
+
+
+def _synset_ids_for(lemma: str, pos: Optional[str]) -> List[Dict[str, Any]]:
+    rng = _rng("ids", lemma.lower(), pos or "")
+    tag = (pos or "NOUN").upper()
+    suffix = {"NOUN": "n", "VERB": "v", "ADJECTIVE": "a", "ADVERB": "r"}.get(tag, "n")
+    return [
+        {
+            "id": f"bn:{rng.randrange(10 ** 7, 10 ** 8):08d}{suffix}",
+            "pos": tag,
+            "source": "BABELNET",
+        }
+        for _ in range(rng.randint(2, 12))
+    ]
+
+
+def _sense(lemma: str, lang: str, source: str, sid: str, pos: str) -> Dict[str, Any]:
+    return {
+        "type": "BabelSense",
+        "properties": {
+            "fullLemma": lemma,
+            "simpleLemma": lemma,
+            "source": source,
+            "language": lang,
+            "pos": pos,
+            "synsetID": {"id": sid, "pos": pos, "source": "BABELNET"},
+            "lemma": {"lemma": lemma, "type": "HIGH_QUALITY"},
+        },
+    }
+
+
+def synthetic_synset(sid: str) -> Dict[str, Any]:
+    rng = _rng("synset", sid)
+    pos = {"n": "NOUN", "v": "VERB", "a": "ADJECTIVE", "r": "ADVERB"}.get(sid[-1], "NOUN")
+    word = f"concept{sid[3:-1].lstrip('0')}"
+    senses = [
+        _sense(f"{word}_{n}" if n else word, rng.choice(_LANGS), rng.choice(_SOURCES), sid, pos)
+        for n in range(rng.randint(8, 30))
+    ]
+    senses[0]["properties"]["language"] = "EN"
+    glosses = [
+        {
+            "source": rng.choice(_SOURCES),
+            "language": "EN" if n == 0 else rng.choice(_LANGS),
+            "gloss": f"Synthetic definition {n} of {word}, about as long as a real gloss.",
+            "tokens": [],
+        }
+        for n in range(rng.randint(2, 8))
+    ]
+    return {"senses": senses, "glosses": glosses, "synsetType": "CONCEPT"}
+
+
+def synthetic_edges(sid: str) -> List[Dict[str, Any]]:
+    rng = _rng("edges", sid)
+    edges = []
+    for _ in range(rng.randint(3, 15)):
+        symbol, name, short, group = rng.choice(_POINTERS)
+        edges.append({
+            "language": "EN",
+            "pointer": {
+                "fSymbol": symbol, "name": name, "shortName": short,
+                "relationGroup": group, "isAutomatic": False,
+            },
+            "target": f"bn:{rng.randrange(10 ** 7, 10 ** 8):08d}n",
+            "weight": 0.0,
+            "normalizedWeight": round(rng.random(), 3),
+        })
+    return edges
+
+
+def synthetic_response(path: str, params: Dict[str, List[str]]) -> Any:
+    """Deterministic response for any request, shaped like the real API's."""
+    if path == "getVersion":
+        return {"version": "V5_3"}
+    if path in ("getSynsetIds", "getSenses"):
+        lemma = params.get("lemma", [""])[0]
+        pos = params.get("pos", [None])[0]
+        ids = _synset_ids_for(lemma, pos)
+        if path == "getSynsetIds":
+            return ids
+        langs = params.get("searchLang", ["EN"])
+        return [
+            _sense(lemma, lang, "WN", item["id"], item["pos"]) for item in ids for lang in langs
+        ]
+    if path == "getSynset":
+        return synthetic_synset(params.get("id", [""])[0])
+    if path == "getOutgoingEdges":
+        edges = synthetic_edges(params.get("id", [""])[0])
+        pointer = params.get("pointer", [None])[0]
+        if pointer:
+            edges = [
+                e for e in edges if pointer in (e["pointer"]["name"], e["pointer"]["shortName"])
+            ]
+        return edges
+    return None
+
+
+# -- Server -------------------------------------------------------------------
+
+class FakeBabelNet:
+    """Threaded fake BabelNet server, usable in-process or from the command line."""
+
+    def __init__(
+        self,
+        fixtures: Optional[Dict[str, Any]] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_statuses: Tuple[int, ...] = (503,),
+        retry_after: Optional[float] = None,
+        quota_after: Optional[int] = None,
+        synthesize: bool = True,
+        upstream: Optional[str] = None,
+        api_key: Optional[str] = None,
+        record_path: Optional[Path] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        Configure the server.
+
+        Args:
+            fixtures: Responses keyed by request_key
+            latency: Base delay added to every response (seconds)
+            jitter: Uniform random delay added on top of latency (seconds)
+            error_rate: Fraction of requests answered with an error status
+            error_statuses: Statuses used for injected errors
+            retry_after: Retry-After header sent with injected errors
+            quota_after: Answer with the over-quota message after this many requests
+            synthesize: Generate responses for requests missing from the fixtures
+            upstream: Real endpoint that fixture misses are forwarded to
+            api_key: API key used for upstream requests
+            record_path: JSONL file that forwarded responses are appended to
+            seed: Seed of the latency and error randomness
+        """
+        self.fixtures = fixtures or {}
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_statuses = error_statuses
+        self.retry_after = retry_after
+        self.quota_after = quota_after
+        self.synthesize = synthesize
+        self.upstream = upstream.rstrip("/") if upstream else None
+        self.api_key = api_key
+        self.record_path = record_path
+        self.counts: Dict[str, int] = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def total(self) -> int:
+        with self._lock:
+            return sum(self.counts.values())
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counts.clear()
+
+    def _count(self, path: str) -> int:
+        with self._lock:
+            self.counts[path] = self.counts.get(path, 0) + 1
+            return sum(self.counts.values())
+
+    def _forward(self, path: str, params: Dict[str, List[str]]) -> Any:
+        query = {**params, "key": [self.api_key or ""]}
+        url = f"{self.upstream}/{path}?{urllib.parse.urlencode(query, doseq=True)}"
+        with urllib.request.urlopen(url, timeout=30) as resp:
+            data = json.loads(resp.read())
+        if self.record_path is not None:
+            record = {"path": path, "params": params, "response": data}
+            with self._lock, open(self.record_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return data
+
+    def respond(self, path: str, params: Dict[str, List[str]]) -> Tuple[int, Dict[str, str], Any]:
+        """Build the (status, headers, body) answer to one request."""
+        if path not in ENDPOINTS:
+            return 404, {}, {"message": f"Unknown endpoint {path}"}
+        total = self._count(path)
+        with self._lock:
+            delay = self.latency + self._rng.uniform(0, self.jitter)
+            fail = self._rng.random() < self.error_rate
+            status = self._rng.choice(self.error_statuses)
+        if delay > 0:
+            time.sleep(delay)
+        if self.quota_after is not None and total > self.quota_after:
+            return 200, {}, {"message": QUOTA_MESSAGE}
+        if fail:
+            headers = {"Retry-After": f"{self.retry_after:g}"} if self.retry_after else {}
+            return status, headers, {"message": f"Injected error {status}"}
+        key = request_key(path, params)
+        if key in self.fixtures:
+            return 200, {}, self.fixtures[key]
+        if self.upstream:
+            data = self._forward(path, params)
+            with self._lock:
+                self.fixtures[key] = data
+            return 200, {}, data
+        if self.synthesize:
+            return 200, {}, synthetic_response(path, params)
+        return 200, {}, [] if path != "getSynset" else {"message": "Invalid synset ID"}
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """
+        Start serving from a daemon thread.
+
+        Returns:
+            Base URL to pass to BabelNetHTTPClient
+        """
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:  # noqa: N802 (http.server API)
+                url = urllib.parse.urlsplit(self.path)
+                path = url.path.rstrip("/").rsplit("/", 1)[-1]
+                if path == "__stats":
+                    status, headers, body = 200, {}, {"counts": fake.counts, "total": fake.total}
+                elif path == "__reset":
+                    fake.reset()
+                    status, headers, body = 200, {}, {"reset": True}
+                else:
+                    params = urllib.parse.parse_qs(url.query)
+                    params.pop("key", None)
+                    status, headers, body = fake.respond(path, params)
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        bound_host, bound_port = self._server.server_address[:2]
+        return f"http://{bound_host}:{bound_port}"
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local stand-in for the BabelNet REST API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--fixtures", nargs="*", default=[str(FIXTURES_DIR)], help="Fixture files or directories"
+    )
+    parser.add_argument("--latency", type=float, default=0.0, help="Base response delay (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra delay (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of failed requests")
+    parser.add_argument("--error-status", type=int, nargs="+", default=[503])
+    parser.add_argument("--retry-after", type=float, help="Retry-After sent with injected errors")
+    parser.add_argument(
+        "--quota-after", type=int, help="Report an exhausted quota after N requests"
+    )
+    parser.add_argument("--no-synthesize", action="store_true", help="Only serve fixtures")
+    parser.add_argument("--upstream", help="Forward fixture misses to this endpoint")
+    parser.add_argument("--api-key", help="API key for --upstream")
+    parser.add_argument("--record", help="Append forwarded responses to this JSONL file")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    fake = FakeBabelNet(
+        load_fixtures(Path(p) for p in args.fixtures),
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_statuses=tuple(args.error_status),
+        retry_after=args.retry_after,
+        quota_after=args.quota_after,
+        synthesize=not args.no_synthesize,
+        upstream=args.upstream,
+        api_key=args.api_key,
+        record_path=Path(args.record) if args.record else None,
+        seed=args.seed,
+    )
+    url = fake.start(args.host, args.port)
+    print(f"Fake BabelNet serving {len(fake.fixtures)} fixtures at {url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        fake.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""
+Offline benchmark harness for the BabelNet MCP tools.
+
+Starts the fake BabelNet server (benchmarks/fake_server.py) in-process, or uses
+one given with --base-url, and drives each tool at controlled concurrency
+through the real client stack (cache, coalescing, retries, worker pool).
+Reports latency percentiles, throughput, upstream calls and memory.
+
+Usage:
+    python benchmarks/run.py
+    python benchmarks/run.py --tools get_definition --concurrency 1 8 32 --latency 0.05
+    python benchmarks/run.py --no-cache --error-rate 0.02 --json results.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fake_server import FIXTURES_DIR, FakeBabelNet, load_fixtures, synthetic_response  # noqa: E402
+
+from babelnet_mcp.async_client import AsyncBabelNetClient  # noqa: E402
+from babelnet_mcp.cache import ResponseCache  # noqa: E402
+from babelnet_mcp.http_client import BabelNetHTTPClient  # noqa: E402
+from babelnet_mcp.tools import (  # noqa: E402
+    register_definition_tool,
+    register_sense_tools,
+    register_synset_tools,
+)
+
+TOOLS = ("get_definition", "get_synsets", "get_senses", "get_synset_by_id")
+
+
+class ToolCollector:
+    """Stands in for FastMCP: keeps the registered tool functions."""
+
+    def __init__(self) -> None:
+        self.tools: Dict[str, Callable[..., Awaitable[Any]]] = {}
+
+    def tool(self, *args: Any, **kwargs: Any) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+            self.tools[kwargs.get("name") or fn.__name__] = fn
+            return fn
+        return decorator
+
+    def resource(
+        self, *args: Any, **kwargs: Any
+    ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        return lambda fn: fn
+
+
+def rss_mb() -> float:
+    """Resident set size of this process in MB."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except OSError:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10
+
+
+def make_calls(tool: str, words: List[str]) -> List[Callable[[Dict[str, Any]], Awaitable[Any]]]:
+    """One zero-config call per word, for the given tool."""
+    if tool == "get_synset_by_id":
+        ids = [
+            item["id"]
+            for word in words
+            for item in synthetic_response("getSynsetIds", {"lemma": [word]})[:2]
+        ]
+        return [lambda tools, sid=sid: tools["get_synset_by_id"](sid) for sid in ids]
+    return [lambda tools, word=word: tools[tool](word) for word in words]
+
+
+async def drive(
+    tools: Dict[str, Any],
+    calls: List[Callable[[Dict[str, Any]], Awaitable[Any]]],
+    requests: int,
+    concurrency: int,
+    seed: int,
+) -> Dict[str, Any]:
+    """Issue requests tool calls, at most concurrency at a time, and time each one."""
+    rng = random.Random(seed)
+    # Zipf-like popularity: a few hot words, a long tail of cold ones
+    weights = [1 / (rank + 1) for rank in range(len(calls))]
+    plan = rng.choices(calls, weights=weights, k=requests)
+    latencies: List[float] = []
+    errors = 0
+    queue: "asyncio.Queue[Callable[[Dict[str, Any]], Awaitable[Any]]]" = asyncio.Queue()
+    for call in plan:
+        queue.put_nowait(call)
+
+    async def worker() -> None:
+        nonlocal errors
+        while not queue.empty():
+            call = queue.get_nowait()
+            start = time.perf_counter()
+            try:
+                result = await call(tools)
+                if isinstance(result, dict) and result.get("error"):
+                    errors += 1
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "throughput": round(requests / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p99_ms": round(latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))] * 1000, 2),
+    }
+
+
+def run_case(
+    args: argparse.Namespace,
+    base_url: str,
+    fake: Optional[FakeBabelNet],
+    tool: str,
+    concurrency: int,
+) -> Dict[str, Any]:
+    """Benchmark one tool at one concurrency level with a fresh client and cache."""
+    client = BabelNetHTTPClient(
+        "benchmark",
+        cache=None if args.no_cache else ResponseCache(persistent=False),
+        pool_size=max(10, args.max_concurrency),
+        max_retries=args.max_retries,
+        backoff_base=0.01,
+        base_url=base_url,
+    )
+    aclient = AsyncBabelNetClient(client, args.max_concurrency)
+    collector = ToolCollector()
+    register_definition_tool(collector, client, aclient)
+    register_synset_tools(collector, client, aclient)
+    register_sense_tools(collector, client, aclient)
+
+    words = ["bank"] + [f"word{i}" for i in range(args.words - 1)]
+    calls = make_calls(tool, words)
+    if fake is not None:
+        fake.reset()
+    rss_before = rss_mb()
+    result = asyncio.run(drive(collector.tools, calls, args.requests, concurrency, args.seed))
+    http = client.request_stats.snapshot()
+    result.update({
+        "tool": tool,
+        "concurrency": concurrency,
+        "upstream_calls": fake.total if fake is not None else http["requests"],
+        "retries": http["retries"],
+        "rss_mb": round(rss_mb(), 1),
+        "rss_growth_mb": round(rss_mb() - rss_before, 1),
+    })
+    aclient.close()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the MCP tools against a fake BabelNet")
+    parser.add_argument("--tools", nargs="+", choices=TOOLS, default=list(TOOLS))
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=200, help="Tool calls per case")
+    parser.add_argument("--words", type=int, default=50, help="Distinct words in the workload")
+    parser.add_argument("--max-concurrency", type=int, default=8, help="Client worker pool size")
+    parser.add_argument("--max-retries", type=int, default=3)
+    parser.add_argument("--no-cache", action="store_true", help="Disable the response cache")
+    parser.add_argument("--base-url", help="Use a running fake server instead of starting one")
+    parser.add_argument("--latency", type=float, default=0.02, help="Fake server latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.01, help="Fake server jitter (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Injected error rate")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    fake: Optional[FakeBabelNet] = None
+    base_url = args.base_url
+    if base_url is None:
+        fake = FakeBabelNet(
+            load_fixtures([FIXTURES_DIR]),
+            latency=args.latency,
+            jitter=args.jitter,
+            error_rate=args.error_rate,
+            seed=args.seed,
+        )
+        base_url = fake.start()
+
+    columns = (
+        "tool", "concurrency", "requests", "errors", "throughput", "p50_ms", "p99_ms",
+        "upstream_calls", "retries", "rss_mb",
+    )
+    print(" ".join(f"{c:>16}" if i == 0 else f"{c:>14}" for i, c in enumerate(columns)))
+    results = []
+    try:
+        for tool in args.tools:
+            for concurrency in args.concurrency:
+                result = run_case(args, base_url, fake, tool, concurrency)
+                results.append(result)
+                print(" ".join(
+                    f"{result[c]!s:>16}" if i == 0 else f"{result[c]!s:>14}"
+                    for i, c in enumerate(columns)
+                ))
+    finally:
+        if fake is not None:
+            fake.stop()
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Startup-time benchmark for the BabelNet MCP server.
+
+Spawns the server repeatedly in each validation mode and measures the time
+from process launch until it logs "Server ready". The 'lazy' mode needs no
+network and no valid key; 'version' and 'probe' need a real API key.
+
+Usage:
+    python benchmarks/startup.py --runs 10 --modes lazy
+    python benchmarks/startup.py --runs 5 --modes lazy version probe --api-key KEY
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+READY_MARKER = "Server ready"
+
+
+def time_startup(mode: str, api_key: str, cache_path: Path, timeout: float) -> float:
+    """Launch the server once and return the seconds until it is ready."""
+    cmd = [
+        sys.executable, "-m", "babelnet_mcp.server",
+        "--api-key", api_key,
+        "--cache-path", str(cache_path),
+        "--validate", mode,
+    ]
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    try:
+        assert proc.stderr is not None
+        for line in proc.stderr:
+            if READY_MARKER in line:
+                return time.perf_counter() - start
+            if time.perf_counter() - start > timeout:
+                break
+        raise RuntimeError(f"server did not become ready in '{mode}' mode")
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure BabelNet MCP server startup time")
+    parser.add_argument("--runs", type=int, default=10, help="Launches per mode (default: 10)")
+    parser.add_argument(
+        "--modes", nargs="+", default=["lazy"], choices=["lazy", "version", "probe"],
+        help="Validation modes to compare (default: lazy)"
+    )
+    parser.add_argument("--api-key", default="benchmark-key", help="BabelNet API key")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-launch timeout (s)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = Path(tmp) / "cache.sqlite"
+        print(f"{'mode':<10}{'min (ms)':>12}{'median (ms)':>14}{'max (ms)':>12}")
+        for mode in args.modes:
+            samples: List[float] = [
+                time_startup(mode, args.api_key, cache_path, args.timeout)
+                for _ in range(args.runs)
+            ]
+            print(
+                f"{mode:<10}{min(samples) * 1000:>12.1f}"
+                f"{statistics.median(samples) * 1000:>14.1f}{max(samples) * 1000:>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
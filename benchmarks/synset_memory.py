@@ -0,0 +1,118 @@
+"""
+Memory benchmark for the compact synset model.
+
+Decodes the same getSynset payloads into raw dictionaries and into
+babelnet_mcp.model.Synset objects, measures the retained memory of each with
+tracemalloc and reports how many synsets fit in 1 GB. Payloads come from a
+JSON dump (see `babelnet-mcp import-dump`) or are generated with a realistic
+shape: a few dozen senses and glosses spread over many languages.
+
+Usage:
+    python benchmarks/synset_memory.py --count 20000
+    python benchmarks/synset_memory.py --dump ./dumps/synsets.jsonl
+"""
+
+import argparse
+import gc
+import json
+import random
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from babelnet_mcp.local_store import iter_dump  # noqa: E402
+from babelnet_mcp.model import loads, parse_synset  # noqa: E402
+
+LANGUAGES = ["EN", "IT", "ES", "FR", "DE", "PT", "ZH", "JA", "RU", "AR", "NL", "PL", "SV", "TR"]
+SOURCES = ["WN", "OMWN", "WIKI", "WIKIDATA", "WIKIRED", "WIKT", "OMWIKI"]
+GB = 1024 ** 3
+
+
+def synthetic_synset(index: int, rng: random.Random) -> Dict[str, Any]:
+    """Generate a getSynset payload shaped like a typical concept."""
+    sid = f"bn:{index:08d}n"
+    senses = []
+    for n in range(rng.randint(10, 40)):
+        lemma = f"lemma_{index}_{n}"
+        senses.append({
+            "type": "BabelSense",
+            "properties": {
+                "fullLemma": lemma,
+                "simpleLemma": lemma,
+                "source": rng.choice(SOURCES),
+                "senseKey": f"{lemma}%1:14:00::",
+                "frequency": rng.randint(0, 50),
+                "language": rng.choice(LANGUAGES),
+                "pos": "NOUN",
+                "synsetID": {"id": sid, "pos": "NOUN", "source": "BABELNET"},
+                "translationInfo": "",
+                "pronunciations": {"audios": [], "transcriptions": []},
+                "bKeySense": False,
+                "idSense": rng.randint(0, 10 ** 8),
+                "lemma": {"lemma": lemma, "type": "HIGH_QUALITY"},
+            },
+        })
+    glosses = [
+        {
+            "source": rng.choice(SOURCES),
+            "sourceSense": rng.randint(0, 10 ** 8),
+            "language": rng.choice(LANGUAGES),
+            "gloss": f"Definition {n} of synset {index}, a sentence of typical length.",
+            "tokens": [],
+        }
+        for n in range(rng.randint(3, 12))
+    ]
+    return {"senses": senses, "glosses": glosses, "synsetType": "CONCEPT"}
+
+
+def load_bodies(args: argparse.Namespace) -> List[bytes]:
+    if args.dump:
+        bodies = []
+        for record in iter_dump([Path(p) for p in args.dump]):
+            bodies.append(json.dumps(record["synset"]).encode("utf-8"))
+            if len(bodies) >= args.count:
+                break
+        return bodies
+    rng = random.Random(args.seed)
+    return [json.dumps(synthetic_synset(i, rng)).encode("utf-8") for i in range(args.count)]
+
+
+def retained(bodies: List[bytes], decode: Callable[[bytes], Any]) -> int:
+    """Bytes still allocated after decoding every body and keeping the results."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [decode(body) for body in bodies]
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare raw dicts and compact synsets in memory")
+    parser.add_argument("--count", type=int, default=10000, help="Number of synsets")
+    parser.add_argument("--dump", nargs="*", help="Read payloads from dump files instead")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    bodies = load_bodies(args)
+    if not bodies:
+        sys.exit("No synsets to measure")
+    payload = sum(len(body) for body in bodies) / len(bodies)
+    print(f"{len(bodies)} synsets, {payload:,.0f} bytes of JSON each on average")
+    print(f"{'representation':<16}{'bytes/synset':>14}{'synsets/GB':>14}")
+    results = {}
+    for name, decode in (("dict", loads), ("model", parse_synset)):
+        per_synset = retained(bodies, decode) / len(bodies)
+        results[name] = per_synset
+        print(f"{name:<16}{per_synset:>14,.0f}{GB / per_synset:>14,.0f}")
+    print(f"model is {results['dict'] / results['model']:.1f}x smaller")
+
+
+if __name__ == "__main__":
+    main()
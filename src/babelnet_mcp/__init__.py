@@ -8,6 +8,14 @@ __version__ = "0.1.0"
 __author__ = "Antonio Scaiella"
 __email__ = ""
 
-from .server import main
+from typing import Any
 
 __all__ = ["main"]
+
+
+def __getattr__(name: str) -> Any:
+    # Import the server (and the MCP SDK) only when it is actually needed
+    if name == "main":
+        from .server import main
+        return main
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
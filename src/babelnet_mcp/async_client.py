@@ -0,0 +1,137 @@
+"""
+asyncio front-end for the BabelNet HTTP client.
+"""
+
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, TypeVar, Union
+
+from .cache import cache_key
+from .decode import SynsetProjection
+from .http_client import BabelNetHTTPClient
+
+# Default number of upstream requests allowed in flight at once
+DEFAULT_MAX_CONCURRENCY = 8
+
+T = TypeVar("T")
+
+
+class AsyncBabelNetClient:
+    """
+    Awaitable counterpart of BabelNetHTTPClient.
+
+    Calls run on a dedicated thread pool around the shared client, so they reuse
+    its session and cache. The pool size bounds how many requests are in flight,
+    and identical concurrent calls are coalesced before they take a pool slot.
+    """
+
+    def __init__(
+        self, client: BabelNetHTTPClient, max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    ) -> None:
+        self.client = client
+        self.max_concurrency = max(1, max_concurrency)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="babelnet"
+        )
+
+    async def _call(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        # Carry context variables (e.g. the tool being served, for metrics) into the worker
+        call = functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+        return await loop.run_in_executor(self._executor, call)
+
+    async def _shared_call(
+        self, endpoint: str, params: Dict[str, Any], fn: Callable[..., T], *args: Any
+    ) -> T:
+        key = cache_key(endpoint, params)
+        result: T = await self.client.flights.do_async(key, lambda: self._call(fn, *args))
+        return result
+
+    async def get_version(self) -> Dict[str, Any]:
+        return await self._shared_call("getVersion", {}, self.client.get_version)
+
+    async def get_synset_ids(
+        self,
+        lemma: str,
+        search_langs: List[str],
+        target_langs: Optional[List[str]] = None,
+        poses: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        params = self.client.lemma_query(lemma, search_langs, target_langs, poses)
+        return await self._shared_call(
+            "getSynsetIds", params, self.client.get_synset_ids,
+            lemma, search_langs, target_langs, poses,
+        )
+
+    async def get_synset(
+        self,
+        synset_id: str,
+        target_langs: Optional[List[str]] = None,
+        projection: Optional[SynsetProjection] = None,
+    ) -> Dict[str, Any]:
+        params: Dict[str, Any] = {"id": synset_id}
+        if target_langs:
+            params["targetLang"] = [lang.upper() for lang in target_langs]
+        if projection is not None:
+            params = projection.params(params)
+        return await self._shared_call(
+            "getSynset", params, self.client.get_synset, synset_id, target_langs, projection
+        )
+
+    async def get_senses(
+        self,
+        lemma: str,
+        search_langs: List[str],
+        target_langs: Optional[List[str]] = None,
+        poses: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        params = self.client.lemma_query(lemma, search_langs, target_langs, poses)
+        return await self._shared_call(
+            "getSenses", params, self.client.get_senses,
+            lemma, search_langs, target_langs, poses,
+        )
+
+    async def get_outgoing_edges(
+        self, synset_id: str, pointer: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        params = {"id": synset_id, "pointer": pointer or ""}
+        return await self._shared_call(
+            "getOutgoingEdges", params, self.client.get_outgoing_edges, synset_id, pointer
+        )
+
+    async def get_view(
+        self,
+        path: str,
+        params: Dict[str, Any],
+        view: Dict[str, Any],
+        shape: Callable[[Any], Any],
+    ) -> Any:
+        view_params = {**params, **{f"view.{name}": value for name, value in view.items()}}
+        return await self._shared_call(
+            path, view_params, self.client.get_view, path, params, view, shape
+        )
+
+    async def get_synsets(
+        self, synset_ids: Sequence[str], projection: Optional[SynsetProjection] = None
+    ) -> List[Union[Dict[str, Any], BaseException]]:
+        """
+        Fetch several synsets concurrently.
+
+        Args:
+            synset_ids: Synset IDs to fetch
+            projection: Parts of each synset to decode (default: all)
+
+        Returns:
+            One entry per ID, in input order: the synset, or the exception raised
+            while fetching it
+        """
+        return await asyncio.gather(
+            *(self.get_synset(sid, projection=projection) for sid in synset_ids),
+            return_exceptions=True,
+        )
+
+    def close(self) -> None:
+        """Shut down the worker pool."""
+        self._executor.shutdown(wait=False)
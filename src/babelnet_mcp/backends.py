@@ -0,0 +1,337 @@
+"""
+Backends answering BabelNet requests, and a router choosing between them.
+
+A backend answers raw API requests (endpoint path + query parameters) with the
+JSON the REST API would return. Available backends:
+
+- RestBackend: the public REST API (costs Babelcoins) or a self-hosted mirror
+- LocalStoreBackend: synsets imported into a LocalSynsetStore, or responses in
+  a cache snapshot (may miss)
+
+TieredRouter tries free backends before coin-costing ones and, within each
+tier, the fastest first according to an exponentially weighted moving average
+of observed latency. Misses, transport errors and 5xx (or 429) responses fall
+through to the next backend, and a failing backend is tried last until its
+cool-down expires. Other 4xx responses are raised at once.
+
+Requests may carry a projection (see decode.SynsetProjection). Backends that
+can project decode only the selected parts of the response; the others are
+asked for the full response, which the router then projects.
+"""
+
+import functools
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .budget import BudgetExhaustedError, BudgetManager
+from .decode import ChunkReader, can_stream, decode_projected, split_projection
+from .metrics import Metrics
+from .model import loads
+
+if TYPE_CHECKING:
+    import requests
+
+    from .local_store import LocalSynsetStore
+    from .snapshot import SnapshotReader
+
+logger = logging.getLogger(__name__)
+
+# Public BabelNet REST endpoint
+PUBLIC_URL = "https://babelnet.io/v9"
+
+# Hosts of the public API, whose requests cost Babelcoins
+PUBLIC_HOSTS = ("babelnet.io", "babelnet.org")
+
+
+def is_public_url(url: str) -> bool:
+    """Return True if the URL points at the public (coin-costing) BabelNet API."""
+    host = urlsplit(url).hostname or ""
+    return any(host == public or host.endswith("." + public) for public in PUBLIC_HOSTS)
+
+
+def is_client_error(error: BaseException) -> bool:
+    """
+    Return True for HTTP 4xx errors other than 429 (Too Many Requests).
+
+    Those are answers about the request itself (a bad ID, an invalid key), so
+    another backend would answer the same and the backend is not failing.
+    """
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    return isinstance(status, int) and 400 <= status < 500 and status != 429
+
+
+class Backend:
+    """Interface of a source of BabelNet responses."""
+
+    name = "backend"
+    # Whether each request spends a Babelcoin
+    costs_coins = False
+    # Whether responses should be stored in the response cache
+    cache_results = True
+    # Whether fetch understands projected requests (see decode.split_projection)
+    projects = False
+
+    def fetch(self, path: str, params: Dict[str, Any]) -> Tuple[bool, Any]:
+        """
+        Answer a raw API request.
+
+        Args:
+            path: Endpoint path (e.g. 'getSynset')
+            params: Query parameters, without the API key
+
+        Returns:
+            Tuple (hit, value); hit is False if this backend cannot answer
+
+        Raises:
+            BudgetExhaustedError: If the request cannot be afforded
+            Exception: On transport or server errors
+        """
+        raise NotImplementedError
+
+
+class RestBackend(Backend):
+    """The BabelNet REST API, public or self-hosted."""
+
+    projects = True
+
+    def __init__(
+        self,
+        name: str,
+        base_url: str,
+        request: Callable[..., "requests.Response"],
+        api_key: str,
+        costs_coins: Optional[bool] = None,
+        budget: Optional[BudgetManager] = None,
+        metrics: Optional[Metrics] = None,
+        stream: bool = False,
+    ) -> None:
+        """
+        Initialize the backend.
+
+        Args:
+            name: Name used in logs and statistics
+            base_url: URL the endpoint paths are appended to
+            request: GET function with retries (BabelNetHTTPClient._request); called
+                with stream=True for projected requests when streaming is enabled, and
+                with on_response, called once per attempt answered, when requests cost coins
+            api_key: API key sent with every request
+            costs_coins: Whether requests spend Babelcoins (default: only on the public API)
+            budget: Budget charged for coin-costing requests
+            metrics: Metrics recording sizes, decode time and coins
+            stream: Parse projected responses as they download (see decode.decode_projected)
+        """
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self.request = request
+        self.api_key = api_key
+        self.costs_coins = is_public_url(base_url) if costs_coins is None else costs_coins
+        self.budget = budget
+        self.metrics = metrics or Metrics()
+        self.stream = stream
+
+    def _charge(self, path: str) -> None:
+        """Spend a Babelcoin for an attempt that BabelNet answered."""
+        if self.budget is not None:
+            self.budget.charge()
+        self.metrics.record_coin(path)
+
+    def fetch(self, path: str, params: Dict[str, Any]) -> Tuple[bool, Any]:
+        options: Dict[str, Any] = {}
+        if self.costs_coins:
+            if self.budget is not None:
+                self.budget.admit(path)
+            # Charged per answered attempt: failed connections cost nothing, retries do
+            options["on_response"] = functools.partial(self._charge, path)
+        projection, params = split_projection(params)
+        query = dict(params)
+        query["key"] = self.api_key
+        start = time.perf_counter()
+        if projection is not None and self.stream and can_stream():
+            # Decoded while it downloads; only the projected parts are ever built
+            resp = self.request(f"{self.base_url}/{path}", query, stream=True, **options)
+            received = time.perf_counter()
+            try:
+                reader = ChunkReader(resp.iter_content(chunk_size=None))
+                data = decode_projected(reader, projection, stream=True)
+            finally:
+                resp.close()
+            size = reader.size
+        else:
+            resp = self.request(f"{self.base_url}/{path}", query, **options)
+            received = time.perf_counter()
+            body = resp.content
+            data = loads(body) if projection is None else decode_projected(body, projection)
+            size = len(body)
+        self.metrics.observe_upstream(path, received - start, size, time.perf_counter() - received)
+        # BabelNet answers over-quota requests with a plain message instead of data
+        if isinstance(data, dict) and "limit" in str(data.get("message", "")).lower():
+            if self.budget is not None and self.costs_coins:
+                self.budget.mark_exhausted()
+                status = self.budget.status()
+                raise BudgetExhaustedError(
+                    data["message"], 0, status["daily_limit"], status["resets_at"]
+                )
+            raise BudgetExhaustedError(data["message"], 0, 0, "")
+        return True, data
+
+
+class LocalStoreBackend(Backend):
+    """Synsets imported from dumps, or a snapshot; what the store cannot answer is a miss."""
+
+    name = "local"
+    costs_coins = False
+    # The store is already persistent; caching its answers would only duplicate them
+    cache_results = False
+
+    def __init__(self, store: "LocalSynsetStore | SnapshotReader", name: str = "local") -> None:
+        self.store = store
+        self.name = name
+
+    def fetch(self, path: str, params: Dict[str, Any]) -> Tuple[bool, Any]:
+        return self.store.lookup(path, params)
+
+
+class _BackendState:
+    """Routing statistics of one backend."""
+
+    __slots__ = ("latency", "calls", "misses", "errors", "failures_in_row", "down_until")
+
+    def __init__(self) -> None:
+        self.latency: Optional[float] = None
+        self.calls = 0
+        self.misses = 0
+        self.errors = 0
+        self.failures_in_row = 0
+        self.down_until = 0.0
+
+
+class TieredRouter:
+    """Routes each request to the cheapest, then fastest, backend that answers it."""
+
+    def __init__(
+        self,
+        backends: List[Backend],
+        alpha: float = 0.2,
+        cooldown: float = 5.0,
+        max_cooldown: float = 120.0,
+        metrics: Optional[Metrics] = None,
+    ) -> None:
+        """
+        Initialize the router.
+
+        Args:
+            backends: Backends to route between
+            alpha: Weight of the newest sample in the latency moving average
+            cooldown: Seconds a backend is tried last after an error (doubles per failure)
+            max_cooldown: Upper bound of the cool-down
+            metrics: Metrics recording per-backend latency
+        """
+        if not backends:
+            raise ValueError("TieredRouter needs at least one backend")
+        self.backends = list(backends)
+        self.alpha = alpha
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.metrics = metrics
+        self._state = {id(b): _BackendState() for b in self.backends}
+        self._lock = threading.Lock()
+
+    def remove(self, backend: Backend) -> None:
+        """Stop routing requests to a backend (the last one is always kept)."""
+        with self._lock:
+            if backend in self.backends and len(self.backends) > 1:
+                self.backends.remove(backend)
+
+    def order(self) -> List[Backend]:
+        """Backends in the order the next request will try them."""
+        now = time.monotonic()
+        with self._lock:
+            def rank(indexed: Tuple[int, Backend]) -> Tuple[bool, bool, float, int]:
+                index, backend = indexed
+                state = self._state[id(backend)]
+                # Unmeasured backends rank as fastest so that each gets a sample
+                latency = state.latency if state.latency is not None else 0.0
+                return (state.down_until > now, backend.costs_coins, latency, index)
+            return [backend for _, backend in sorted(enumerate(self.backends), key=rank)]
+
+    def _record(self, backend: Backend, path: str, seconds: float, outcome: str) -> None:
+        with self._lock:
+            state = self._state[id(backend)]
+            state.calls += 1
+            if outcome == "error":
+                state.errors += 1
+                state.failures_in_row += 1
+                pause = min(self.max_cooldown, self.cooldown * 2 ** (state.failures_in_row - 1))
+                state.down_until = time.monotonic() + pause
+            else:
+                state.failures_in_row = 0
+                state.down_until = 0.0
+                if outcome == "miss":
+                    state.misses += 1
+                state.latency = seconds if state.latency is None else (
+                    self.alpha * seconds + (1 - self.alpha) * state.latency
+                )
+        if self.metrics is not None:
+            self.metrics.observe_backend(backend.name, path, outcome, seconds)
+
+    def fetch(self, path: str, params: Dict[str, Any]) -> Tuple[Backend, Any]:
+        """
+        Answer a request from the first backend that can.
+
+        Returns:
+            Tuple (backend that answered, value)
+
+        Raises:
+            BudgetExhaustedError: If a coin-costing backend was needed but is unaffordable
+            Exception: A 4xx error other than 429, or the last error if no backend answered
+        """
+        projection, full_params = split_projection(params)
+        last_error: Optional[BaseException] = None
+        for backend in self.order():
+            start = time.perf_counter()
+            try:
+                if projection is None or backend.projects:
+                    hit, value = backend.fetch(path, params)
+                else:
+                    hit, value = backend.fetch(path, full_params)
+                    value = projection.apply(value) if hit else value
+            except BudgetExhaustedError:
+                raise
+            except Exception as e:
+                if is_client_error(e):
+                    self._record(backend, path, time.perf_counter() - start, "rejected")
+                    raise
+                self._record(backend, path, time.perf_counter() - start, "error")
+                logger.warning(f"Backend {backend.name} failed on {path}: {e}")
+                last_error = e
+                continue
+            self._record(backend, path, time.perf_counter() - start, "hit" if hit else "miss")
+            if hit:
+                return backend, value
+        if last_error is not None:
+            raise last_error
+        raise LookupError(f"No backend could answer {path}")
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Return per-backend routing statistics, in the current routing order."""
+        order = self.order()
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "name": backend.name,
+                    "costs_coins": backend.costs_coins,
+                    "latency_ms": (
+                        round(state.latency * 1000, 2) if state.latency is not None else None
+                    ),
+                    "calls": state.calls,
+                    "misses": state.misses,
+                    "errors": state.errors,
+                    "cooling_down": state.down_until > now,
+                }
+                for backend in order
+                for state in (self._state[id(backend)],)
+            ]
@@ -0,0 +1,306 @@
+"""
+Babelcoin budget management for the BabelNet HTTP client.
+
+Every upstream request costs one Babelcoin and keys are limited to a daily
+allowance (1000 on the free tier) that resets at midnight UTC. The budget
+manager persists the day's consumption, rate-limits requests with a token
+bucket and keeps a reserve for cheap lookups once the allowance runs low.
+
+The consumption file is shared by every server process on the host: each
+spend re-reads it and writes it back under a cross-process lock, so
+concurrent sessions draw on one allowance instead of each assuming a full one.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import nullcontext
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, ContextManager, Dict, Optional
+
+from .locking import ProcessLock
+
+logger = logging.getLogger(__name__)
+
+# Default daily Babelcoin allowance of a free key
+DEFAULT_DAILY_LIMIT = 1000
+
+# Default location of the persisted consumption counter
+DEFAULT_BUDGET_PATH = Path.home() / '.babelnet' / 'budget.json'
+
+# Endpoints allowed to spend the reserve: one lookup returns many IDs that
+# can then be served from cache, so these are the cheapest calls per answer
+PRIORITY_ENDPOINTS = frozenset({"getVersion", "getSynsetIds", "getSenses"})
+
+
+class BudgetExhaustedError(Exception):
+    """Raised when a request would exceed the Babelcoin budget."""
+
+    def __init__(self, message: str, remaining: int, daily_limit: int, resets_at: str) -> None:
+        super().__init__(message)
+        self.remaining = remaining
+        self.daily_limit = daily_limit
+        self.resets_at = resets_at
+
+    def to_result(self) -> Dict[str, Any]:
+        """
+        Build the structured tool result returned instead of raising.
+
+        Returns:
+            Dictionary describing the exhausted budget
+        """
+        return {
+            "error": "budget_exhausted",
+            "message": str(self),
+            "remaining": self.remaining,
+            "daily_limit": self.daily_limit,
+            "resets_at": self.resets_at,
+        }
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter.
+
+    Priority callers are served before regular ones when both are waiting.
+    """
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        """
+        Initialize the bucket.
+
+        Args:
+            rate: Tokens added per second (0 disables rate limiting)
+            capacity: Maximum burst size
+        """
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._priority_waiting = 0
+        self._cond = threading.Condition()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, priority: bool = False) -> None:
+        """Block until a token is available and take it."""
+        if self.rate <= 0:
+            return
+        with self._cond:
+            if priority:
+                self._priority_waiting += 1
+            try:
+                while True:
+                    self._refill()
+                    if self._tokens >= 1 and (priority or self._priority_waiting == 0):
+                        self._tokens -= 1
+                        return
+                    wait = max((1 - self._tokens) / self.rate, 0.001)
+                    self._cond.wait(wait)
+            finally:
+                if priority:
+                    self._priority_waiting -= 1
+                    self._cond.notify_all()
+
+
+class BudgetManager:
+    """Tracks and enforces the daily Babelcoin budget."""
+
+    def __init__(
+        self,
+        daily_limit: int = DEFAULT_DAILY_LIMIT,
+        path: Optional[Path] = DEFAULT_BUDGET_PATH,
+        rate: float = 5.0,
+        burst: int = 10,
+        reserve: int = 50,
+        low_threshold: int = 200,
+        low_budget_max_definitions: int = 5,
+    ) -> None:
+        """
+        Initialize the budget manager.
+
+        Args:
+            daily_limit: Babelcoins available per UTC day
+            path: JSON file used to persist the day's consumption (None keeps it in memory)
+            rate: Maximum sustained requests per second (0 disables rate limiting)
+            burst: Maximum burst of requests
+            reserve: Coins kept for priority endpoints only
+            low_threshold: Remaining coins below which tools degrade
+            low_budget_max_definitions: Cap on get_definition synsets while the budget is low
+        """
+        self.daily_limit = daily_limit
+        self.path = path
+        self.reserve = reserve
+        self.low_threshold = low_threshold
+        self.low_budget_max_definitions = low_budget_max_definitions
+        self.bucket = TokenBucket(rate, burst)
+        self._lock = threading.Lock()
+        self._day = self._today()
+        self._spent = 0
+        self.rejected = 0
+        self._file_lock: Optional[ProcessLock] = None
+        if path is not None:
+            self._file_lock = ProcessLock(path.with_name(path.name + ".lock"), timeout=5.0)
+        self._load()
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now(timezone.utc).date().isoformat()
+
+    @staticmethod
+    def _resets_at() -> str:
+        tomorrow = datetime.now(timezone.utc).date() + timedelta(days=1)
+        midnight = datetime(tomorrow.year, tomorrow.month, tomorrow.day, tzinfo=timezone.utc)
+        return midnight.isoformat()
+
+    def _load(self) -> None:
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r') as f:
+                state = json.load(f)
+            if state.get("day") == self._day:
+                self._spent = int(state.get("spent", 0))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read budget state from {self.path}: {e}")
+
+    def _shared(self) -> ContextManager[Any]:
+        """Lock the consumption file against other processes for a read-modify-write."""
+        return self._file_lock.hold() if self._file_lock is not None else nullcontext()
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            with open(tmp, 'w') as f:
+                json.dump({"day": self._day, "spent": self._spent}, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning(f"Could not persist budget state to {self.path}: {e}")
+
+    def _rollover(self) -> None:
+        today = self._today()
+        if today != self._day:
+            self._day = today
+            self._spent = 0
+
+    def _exhausted(self, message: str) -> BudgetExhaustedError:
+        self.rejected += 1
+        return BudgetExhaustedError(
+            message, max(0, self.daily_limit - self._spent), self.daily_limit, self._resets_at()
+        )
+
+    def _check(self, endpoint: str, spend: bool) -> bool:
+        """Raise if a request is unaffordable, optionally spend its coin; return its priority."""
+        priority = endpoint in PRIORITY_ENDPOINTS
+        with self._lock, self._shared():
+            self._rollover()
+            # Pick up what other processes spent since our last look
+            self._load()
+            remaining = self.daily_limit - self._spent
+            if remaining <= 0:
+                raise self._exhausted(
+                    "Daily Babelcoin budget exhausted; serving cached results only"
+                )
+            if remaining <= self.reserve and not priority:
+                raise self._exhausted(
+                    f"Only {remaining} Babelcoins left, reserved for lookups; "
+                    f"{endpoint} is served from cache only"
+                )
+            if spend:
+                self._spent += 1
+                self._save()
+        return priority
+
+    def acquire(self, endpoint: str) -> None:
+        """
+        Reserve one Babelcoin for a request, waiting on the rate limiter.
+
+        Args:
+            endpoint: Endpoint path of the request
+
+        Raises:
+            BudgetExhaustedError: If the budget does not allow the request
+        """
+        self.bucket.acquire(self._check(endpoint, spend=True))
+
+    def admit(self, endpoint: str) -> None:
+        """
+        Check that a request is affordable and wait on the rate limiter, spending nothing.
+
+        The request is then charged for each attempt BabelNet answers (see charge).
+
+        Args:
+            endpoint: Endpoint path of the request
+
+        Raises:
+            BudgetExhaustedError: If the budget does not allow the request
+        """
+        self.bucket.acquire(self._check(endpoint, spend=False))
+
+    def charge(self) -> None:
+        """Spend one Babelcoin for a request BabelNet answered."""
+        with self._lock, self._shared():
+            self._rollover()
+            self._load()
+            self._spent += 1
+            self._save()
+
+    def mark_exhausted(self) -> None:
+        """Record that BabelNet itself rejected a request for quota reasons."""
+        with self._lock, self._shared():
+            self._rollover()
+            self._load()
+            self._spent = max(self._spent, self.daily_limit)
+            self._save()
+
+    def remaining(self) -> int:
+        """Return the number of Babelcoins left today."""
+        with self._lock:
+            self._rollover()
+            self._load()
+            return max(0, self.daily_limit - self._spent)
+
+    def is_low(self) -> bool:
+        """Return True once the remaining budget falls below the low threshold."""
+        return self.remaining() < self.low_threshold
+
+    def cap_definitions(self, requested: int) -> int:
+        """
+        Limit how many synsets get_definition may fetch.
+
+        Args:
+            requested: Number of synsets requested by the caller
+
+        Returns:
+            The requested number, capped while the budget is low
+        """
+        if self.is_low():
+            return min(requested, self.low_budget_max_definitions)
+        return requested
+
+    def status(self) -> Dict[str, Any]:
+        """Return the current budget state."""
+        with self._lock:
+            self._rollover()
+            self._load()
+            spent = self._spent
+        remaining = max(0, self.daily_limit - spent)
+        return {
+            "day": self._day,
+            "daily_limit": self.daily_limit,
+            "spent": spent,
+            "remaining": remaining,
+            "reserve": self.reserve,
+            "low": remaining < self.low_threshold,
+            "rejected": self.rejected,
+            "resets_at": self._resets_at(),
+        }
@@ -0,0 +1,626 @@
+"""
+Two-tier response cache for the BabelNet HTTP client.
+
+Responses are keyed on the endpoint path plus the canonicalized query
+parameters (the API key is never part of the key). A small in-memory LRU
+tier sits in front of a persistent SQLite tier that survives restarts.
+
+The SQLite tier runs in WAL mode so that several server processes on one host
+(MCP clients start one per session) can read and write it concurrently, and
+fetch_lock() lets them agree on which process fetches a missing entry.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .locking import ProcessLock
+
+logger = logging.getLogger(__name__)
+
+# Default location of the persistent cache
+DEFAULT_CACHE_PATH = Path.home() / '.babelnet' / 'cache.sqlite'
+
+# Per-endpoint time-to-live in seconds (None means "until the BabelNet version changes")
+DEFAULT_TTLS: Dict[str, Optional[float]] = {
+    "getVersion": 24 * 3600,
+    "getSynset": None,
+    "getOutgoingEdges": None,
+    "getSynsetIds": 7 * 24 * 3600,
+    "getSenses": 7 * 24 * 3600,
+}
+
+# Time-to-live of empty lemma lookups (misspellings, unknown words) in seconds
+DEFAULT_NEGATIVE_TTL = 24 * 3600
+
+# Endpoints whose empty answers are cached with the negative TTL
+_NEGATIVE_ENDPOINTS = frozenset({"getSynsetIds", "getSenses"})
+
+# Seconds a writer waits for another process's transaction before failing
+DEFAULT_BUSY_TIMEOUT = 5.0
+
+# Access statistics (hits, last access) are batched in memory and written at most
+# this many entries or seconds apart, or with the next write, so reads stay reads
+TOUCH_FLUSH_ENTRIES = 256
+TOUCH_FLUSH_SECONDS = 30.0
+
+# Parameters that never take part in the cache key
+_IGNORED_PARAMS = frozenset({"key"})
+
+
+def cache_key(path: str, params: Dict[str, Any]) -> str:
+    """
+    Build a canonical cache key for a request.
+
+    Parameter order and the order of multi-valued parameters do not matter,
+    and the API key is dropped.
+
+    Args:
+        path: Endpoint path (e.g. 'getSynset')
+        params: Query parameters
+
+    Returns:
+        Canonical string key
+    """
+    canonical = []
+    for name in sorted(params):
+        if name in _IGNORED_PARAMS:
+            continue
+        value = params[name]
+        if isinstance(value, (list, tuple)):
+            value = sorted(str(v) for v in value)
+        else:
+            value = str(value)
+        canonical.append([name, value])
+    return path + "?" + json.dumps(canonical, separators=(",", ":"), ensure_ascii=False)
+
+
+class _MemoryTier:
+    """Byte-bounded LRU of decoded responses."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[Any, int, Optional[float]]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            value, size, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                self._size -= size
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def put(self, key: str, value: Any, size: int, expires_at: Optional[float]) -> None:
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= old[1]
+            self._entries[key] = (value, size, expires_at)
+            self._size += size
+            while self._size > self.max_bytes and self._entries:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class _SQLiteTier:
+    """Persistent, byte-bounded store of JSON-encoded responses."""
+
+    def __init__(
+        self, path: Path, max_bytes: int, busy_timeout: float = DEFAULT_BUSY_TIMEOUT
+    ) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.busy_timeout = busy_timeout
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # Pending access statistics: key -> (last access, hits)
+        self._touched: Dict[str, Tuple[float, int]] = {}
+        self._touched_since = time.monotonic()
+        self._conn = sqlite3.connect(
+            str(path), timeout=busy_timeout, check_same_thread=False, isolation_level=None
+        )
+        # WAL lets readers in other processes proceed while one process writes
+        mode = self._conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+        if str(mode).lower() != "wal":
+            logger.warning(f"SQLite cache {path} is not in WAL mode ({mode}); sharing it may block")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                path TEXT NOT NULL,
+                params TEXT NOT NULL,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL,
+                last_access REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS entries_last_access ON entries(last_access);
+            CREATE TABLE IF NOT EXISTS meta (
+                name TEXT PRIMARY KEY,
+                value TEXT
+            );
+            """
+        )
+        row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        self._size = int(row[0])
+
+    def get(self, key: str) -> Tuple[bool, Optional[bytes], Optional[float]]:
+        """Read an entry; returns (hit, value, expires_at)."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return False, None, None
+            value, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._delete(key)
+                return False, None, None
+            hits = self._touched.get(key, (now, 0))[1]
+            self._touched[key] = (now, hits + 1)
+            if (
+                len(self._touched) >= TOUCH_FLUSH_ENTRIES
+                or time.monotonic() - self._touched_since >= TOUCH_FLUSH_SECONDS
+            ):
+                self._write_touched()
+            return True, value, expires_at
+
+    def _write_touched(self) -> None:
+        """Write the pending access statistics in a transaction of their own (lock held)."""
+        if not self._touched:
+            return
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError as e:
+            # Statistics only order eviction; losing a batch beats stalling a read
+            logger.debug(f"Dropping {len(self._touched)} cache access records: {e}")
+            self._touched = {}
+            self._touched_since = time.monotonic()
+            return
+        try:
+            self._flush_touched()
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def _flush_touched(self) -> None:
+        """Write the pending access statistics (the caller holds the lock)."""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE entries SET last_access = MAX(last_access, ?), hits = hits + ? "
+                "WHERE key = ?",
+                [(at, hits, key) for key, (at, hits) in self._touched.items()],
+            )
+            self._touched = {}
+        self._touched_since = time.monotonic()
+
+    def contains(self, key: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM entries WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (key, time.time()),
+            ).fetchone()
+        return row is not None
+
+    def put(
+        self,
+        key: str,
+        path: str,
+        params: Dict[str, Any],
+        value: bytes,
+        expires_at: Optional[float],
+    ) -> None:
+        if len(value) > self.max_bytes:
+            return
+        params_json = json.dumps(
+            {k: v for k, v in params.items() if k not in _IGNORED_PARAMS}, ensure_ascii=False
+        )
+        with self._lock:
+            # One transaction, so that another process storing the same key cannot interleave
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._flush_touched()
+                self._delete(key)
+                self._conn.execute(
+                    "INSERT INTO entries (key, path, params, value, size, expires_at, last_access) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, path, params_json, value, len(value), expires_at, time.time()),
+                )
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            self._size += len(value)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def get_fresh(self, key: str) -> Tuple[bool, Optional[bytes], Optional[float]]:
+        """Read an entry without counting an access; returns (hit, value, expires_at)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM entries "
+                "WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (key, time.time()),
+            ).fetchone()
+        return (True, row[0], row[1]) if row is not None else (False, None, None)
+
+    def _delete(self, key: str) -> None:
+        row = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._size -= row[0]
+
+    def _evict(self) -> None:
+        """Drop expired entries, then least recently used ones down to 90% of the cap."""
+        self._conn.execute(
+            "DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),)
+        )
+        target = int(self.max_bytes * 0.9)
+        row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        self._size = int(row[0])
+        if self._size <= target:
+            return
+        evicted = 0
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM entries ORDER BY last_access ASC"
+        ).fetchall():
+            if self._size <= target:
+                break
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._size -= size
+            evicted += 1
+        logger.debug(f"Evicted {evicted} cache entries (size now {self._size} bytes)")
+
+    def get_meta(self, name: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, name: str, value: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)", (name, value)
+            )
+
+    def _reader(self) -> sqlite3.Connection:
+        """Open a connection of its own for a long read, which then holds no lock."""
+        return sqlite3.connect(str(self.path), timeout=self.busy_timeout)
+
+    def iter_entries(
+        self, path: Optional[str] = None
+    ) -> Iterator[Tuple[str, Dict[str, Any], bytes, int]]:
+        """Yield (path, params, value, hits) for every live entry, most used first."""
+        query = (
+            "SELECT path, params, value, hits FROM entries "
+            "WHERE (expires_at IS NULL OR expires_at > ?)"
+        )
+        args: List[Any] = [time.time()]
+        if path is not None:
+            query += " AND path = ?"
+            args.append(path)
+        with self._lock:
+            self._write_touched()
+        conn = self._reader()
+        try:
+            # Rows stream from the cursor instead of being loaded all at once
+            for path, params, value, hits in conn.execute(query + " ORDER BY hits DESC", args):
+                yield path, json.loads(params), value, hits
+        finally:
+            conn.close()
+
+    def iter_by_key(
+        self, paths: Iterable[str]
+    ) -> Iterator[Tuple[str, Dict[str, Any], bytes]]:
+        """
+        Yield (path, params, value) for the live entries of some endpoints, in key order.
+
+        Rows stream from the primary key index through a connection of their
+        own, so they are neither sorted nor held in memory, and the tier stays
+        usable while the caller consumes them.
+        """
+        paths = list(paths)
+        if not paths:
+            return
+        conn = self._reader()
+        try:
+            cursor = conn.execute(
+                "SELECT path, params, value FROM entries "
+                f"WHERE path IN ({', '.join('?' * len(paths))}) "
+                "AND (expires_at IS NULL OR expires_at > ?) ORDER BY key",
+                [*paths, time.time()],
+            )
+            for path, params, value in cursor:
+                yield path, json.loads(params), value
+        finally:
+            conn.close()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._touched = {}
+            self._conn.execute("DELETE FROM entries")
+            self._size = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0])
+
+
+class ResponseCache:
+    """
+    In-memory LRU tier in front of a persistent SQLite tier.
+
+    Cached values are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        max_bytes: int = 256 * 1024 * 1024,
+        memory_max_bytes: int = 32 * 1024 * 1024,
+        ttls: Optional[Dict[str, Optional[float]]] = None,
+        persistent: bool = True,
+        negative_ttl: Optional[float] = DEFAULT_NEGATIVE_TTL,
+        lock_timeout: float = 30.0,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            path: SQLite file for the persistent tier (default: ~/.babelnet/cache.sqlite)
+            max_bytes: Size cap of the persistent tier
+            memory_max_bytes: Size cap of the in-memory tier
+            ttls: Per-endpoint TTL overrides in seconds (None disables expiry)
+            persistent: Set to False to keep only the in-memory tier
+            negative_ttl: TTL of empty lemma lookups in seconds (None: same as other lookups)
+            lock_timeout: Seconds to wait for another process fetching the same entry
+        """
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.negative_ttl = negative_ttl
+        self.negative_hits = 0
+        self._memory = _MemoryTier(memory_max_bytes)
+        self._disk: Optional[_SQLiteTier] = None
+        self._fetch_lock: Optional[ProcessLock] = None
+        if persistent:
+            path = path or DEFAULT_CACHE_PATH
+            try:
+                self._disk = _SQLiteTier(path, max_bytes)
+                self._fetch_lock = ProcessLock(
+                    path.with_name(path.name + ".lock"), timeout=lock_timeout
+                )
+            except (sqlite3.Error, OSError) as e:
+                logger.warning(f"Persistent cache unavailable, using memory only: {e}")
+        self._version: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+        self.shared_hits = 0
+
+    def get(self, path: str, params: Dict[str, Any]) -> Tuple[bool, Any]:
+        """
+        Look up a cached response.
+
+        Args:
+            path: Endpoint path
+            params: Query parameters
+
+        Returns:
+            Tuple (hit, value); value is None on a miss
+        """
+        key = cache_key(path, params)
+        hit, value = self._memory.get(key)
+        if hit:
+            self._count_hit(path, value)
+            return True, value
+        if self._disk is not None:
+            hit, raw, expires_at = self._disk.get(key)
+            if hit and raw is not None:
+                value = json.loads(raw)
+                # Promoted with the stored expiry: the TTL runs from when it was fetched
+                self._memory.put(key, value, len(raw), expires_at)
+                self._count_hit(path, value)
+                return True, value
+        self.misses += 1
+        return False, None
+
+    @contextmanager
+    def fetch_lock(self, path: str, params: Dict[str, Any]) -> Iterator[bool]:
+        """
+        Serialize fetches of one entry across the processes sharing the cache.
+
+        The process holding the lock fetches and stores the entry; the others
+        wait, then find it with get_shared() instead of fetching it again.
+
+        Yields:
+            True if the lock is held (False without a persistent tier or fcntl)
+        """
+        if self._fetch_lock is None:
+            yield False
+            return
+        with self._fetch_lock.hold(cache_key(path, params)) as held:
+            yield held
+
+    def get_shared(self, path: str, params: Dict[str, Any]) -> Tuple[bool, Any]:
+        """
+        Look up an entry another process may have stored since the last get().
+
+        Reads the persistent tier only and does not count a second miss.
+
+        Returns:
+            Tuple (hit, value)
+        """
+        if self._disk is None:
+            return False, None
+        key = cache_key(path, params)
+        hit, raw, expires_at = self._disk.get_fresh(key)
+        if not hit or raw is None:
+            return False, None
+        value = json.loads(raw)
+        self._memory.put(key, value, len(raw), expires_at)
+        self.shared_hits += 1
+        return True, value
+
+    def contains(self, path: str, params: Dict[str, Any]) -> bool:
+        """Check whether a live response is cached, without counting a hit or miss."""
+        key = cache_key(path, params)
+        if self._memory.get(key)[0]:
+            return True
+        return self._disk is not None and self._disk.contains(key)
+
+    def put(self, path: str, params: Dict[str, Any], value: Any) -> None:
+        """
+        Store a response.
+
+        Args:
+            path: Endpoint path
+            params: Query parameters
+            value: Decoded JSON response
+        """
+        key = cache_key(path, params)
+        raw = json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        expires_at = self._expiry(path, value)
+        self._memory.put(key, value, len(raw), expires_at)
+        if self._disk is not None:
+            self._disk.put(key, path, params, raw, expires_at)
+
+    def _is_negative(self, path: str, value: Any) -> bool:
+        return path in _NEGATIVE_ENDPOINTS and value == []
+
+    def _count_hit(self, path: str, value: Any) -> None:
+        self.hits += 1
+        if self._is_negative(path, value):
+            self.negative_hits += 1
+
+    def _expiry(self, path: str, value: Any = None) -> Optional[float]:
+        ttl = self.ttls.get(path)
+        # Unknown words get their own (usually shorter) TTL, in case BabelNet adds them
+        if self.negative_ttl is not None and self._is_negative(path, value):
+            ttl = self.negative_ttl
+        return None if ttl is None else time.time() + ttl
+
+    def babelnet_version(self) -> Optional[str]:
+        """Return the BabelNet release the cached responses come from, if known."""
+        version = self._disk.get_meta("babelnet_version") if self._disk else self._version
+        return version or None
+
+    def sync_version(self, version: str) -> bool:
+        """
+        Invalidate everything if the BabelNet release changed.
+
+        Args:
+            version: Version string reported by getVersion
+
+        Returns:
+            True if the cache was invalidated
+        """
+        previous = self._disk.get_meta("babelnet_version") if self._disk else self._version
+        self._version = version
+        if self._disk is not None:
+            self._disk.set_meta("babelnet_version", version)
+        if previous and previous != version:
+            logger.info(f"BabelNet version changed ({previous} -> {version}), clearing cache")
+            self.clear(keep_version=True)
+            return True
+        return False
+
+    def clear(self, keep_version: bool = False) -> None:
+        """Remove all cached responses."""
+        self._memory.clear()
+        if self._disk is not None:
+            self._disk.clear()
+            if not keep_version:
+                self._disk.set_meta("babelnet_version", "")
+
+    def entries(self) -> List[Tuple[str, Dict[str, Any], int]]:
+        """
+        List persisted entries, most frequently hit first.
+
+        Returns:
+            List of (path, params, hits) tuples
+        """
+        if self._disk is None:
+            return []
+        return [(path, params, hits) for path, params, _, hits in self._disk.iter_entries()]
+
+    def responses(self, path: str) -> Iterator[Tuple[Dict[str, Any], Any]]:
+        """
+        Iterate over the persisted responses of one endpoint, most frequently hit first.
+
+        Args:
+            path: Endpoint path
+
+        Yields:
+            (params, decoded response) tuples
+        """
+        if self._disk is None:
+            return
+        for _, params, raw, _ in self._disk.iter_entries(path):
+            yield params, json.loads(raw)
+
+    def responses_by_key(
+        self, paths: Iterable[str]
+    ) -> Iterator[Tuple[str, Dict[str, Any], Any]]:
+        """
+        Iterate over the persisted responses of some endpoints, sorted by cache key.
+
+        Args:
+            paths: Endpoint paths
+
+        Yields:
+            (path, params, decoded response) tuples
+        """
+        if self._disk is None:
+            return
+        for path, params, raw in self._disk.iter_by_key(paths):
+            yield path, params, json.loads(raw)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and tier sizes."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "negative_hits": self.negative_hits,
+            "shared_hits": self.shared_hits,
+            "lock_waits": self._fetch_lock.waits if self._fetch_lock else 0,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory.size,
+            "disk_entries": len(self._disk) if self._disk else 0,
+            "disk_bytes": self._disk.size if self._disk else 0,
+        }
@@ -3,7 +3,6 @@ Configuration management for BabelNet MCP server.
 """
 
 import os
-import yaml
 import logging
 from pathlib import Path
 from typing import Optional
@@ -19,6 +18,35 @@ class BabelNetConfig:
         self.api_key: Optional[str] = None
         self.rest_url: Optional[str] = None
         self.rpc_url: Optional[str] = None
+        self.cache_enabled: bool = True
+        self.cache_path: Optional[Path] = None
+        self.cache_max_mb: int = 256
+        self.cache_memory_max_mb: int = 32
+        self.negative_cache_ttl: float = 24 * 3600
+        self.lemma_table: Optional[Path] = None
+        self.max_concurrency: int = 8
+        self.pool_size: int = 10
+        self.connect_timeout: float = 5.0
+        self.read_timeout: float = 30.0
+        self.max_retries: int = 3
+        self.retry_backoff: float = 0.5
+        self.metrics_port: Optional[int] = None
+        self.metrics_dump_path: Optional[Path] = None
+        self.metrics_dump_interval: float = 60.0
+        self.local_store_path: Optional[Path] = None
+        self.gloss_index_enabled: bool = True
+        self.gloss_index_path: Optional[Path] = None
+        self.snapshot_path: Optional[Path] = None
+        self.selective_decode: bool = True
+        self.stream_decode: bool = False
+        self.warmup_seeds: Optional[Path] = None
+        self.warmup_coins: int = 100
+        self.daily_coin_limit: int = 1000
+        self.rate_limit_per_second: float = 5.0
+        self.rate_limit_burst: int = 10
+        self.coin_reserve: int = 50
+        self.low_budget_threshold: int = 200
+        self.low_budget_max_definitions: int = 5
         self._load_config()
         # Also allow API key via environment variable for HTTP client usage
         if not self.api_key:
@@ -36,12 +64,65 @@ class BabelNetConfig:
             return
         
         try:
+            import yaml  # only needed when a config file exists
+
             with open(config_path, 'r') as f:
                 config = yaml.safe_load(f)
             
             self.api_key = config.get('RESTFUL_KEY')
             self.rest_url = config.get('RESTFUL_URL')
             self.rpc_url = config.get('RPC_URL')
+            self.cache_enabled = bool(config.get('CACHE_ENABLED', self.cache_enabled))
+            if config.get('CACHE_PATH'):
+                self.cache_path = Path(config['CACHE_PATH']).expanduser()
+            self.cache_max_mb = int(config.get('CACHE_MAX_MB', self.cache_max_mb))
+            self.cache_memory_max_mb = int(
+                config.get('CACHE_MEMORY_MAX_MB', self.cache_memory_max_mb)
+            )
+            self.negative_cache_ttl = float(
+                config.get('NEGATIVE_CACHE_TTL', self.negative_cache_ttl)
+            )
+            if config.get('LEMMA_TABLE'):
+                self.lemma_table = Path(config['LEMMA_TABLE']).expanduser()
+            self.max_concurrency = int(config.get('MAX_CONCURRENCY', self.max_concurrency))
+            self.pool_size = int(config.get('HTTP_POOL_SIZE', self.pool_size))
+            self.connect_timeout = float(config.get('CONNECT_TIMEOUT', self.connect_timeout))
+            self.read_timeout = float(config.get('READ_TIMEOUT', self.read_timeout))
+            self.max_retries = int(config.get('MAX_RETRIES', self.max_retries))
+            self.retry_backoff = float(config.get('RETRY_BACKOFF', self.retry_backoff))
+            if config.get('METRICS_PORT'):
+                self.metrics_port = int(config['METRICS_PORT'])
+            if config.get('METRICS_DUMP_PATH'):
+                self.metrics_dump_path = Path(config['METRICS_DUMP_PATH']).expanduser()
+            self.metrics_dump_interval = float(
+                config.get('METRICS_DUMP_INTERVAL', self.metrics_dump_interval)
+            )
+            if config.get('LOCAL_STORE'):
+                self.local_store_path = Path(config['LOCAL_STORE']).expanduser()
+            self.gloss_index_enabled = bool(
+                config.get('GLOSS_INDEX_ENABLED', self.gloss_index_enabled)
+            )
+            if config.get('GLOSS_INDEX_PATH'):
+                self.gloss_index_path = Path(config['GLOSS_INDEX_PATH']).expanduser()
+            if config.get('SNAPSHOT_PATH'):
+                self.snapshot_path = Path(config['SNAPSHOT_PATH']).expanduser()
+            self.selective_decode = bool(config.get('SELECTIVE_DECODE', self.selective_decode))
+            self.stream_decode = bool(config.get('STREAM_DECODE', self.stream_decode))
+            if config.get('WARMUP_SEEDS'):
+                self.warmup_seeds = Path(config['WARMUP_SEEDS']).expanduser()
+            self.warmup_coins = int(config.get('WARMUP_COINS', self.warmup_coins))
+            self.daily_coin_limit = int(config.get('DAILY_COIN_LIMIT', self.daily_coin_limit))
+            self.rate_limit_per_second = float(
+                config.get('RATE_LIMIT_PER_SECOND', self.rate_limit_per_second)
+            )
+            self.rate_limit_burst = int(config.get('RATE_LIMIT_BURST', self.rate_limit_burst))
+            self.coin_reserve = int(config.get('COIN_RESERVE', self.coin_reserve))
+            self.low_budget_threshold = int(
+                config.get('LOW_BUDGET_THRESHOLD', self.low_budget_threshold)
+            )
+            self.low_budget_max_definitions = int(
+                config.get('LOW_BUDGET_MAX_DEFINITIONS', self.low_budget_max_definitions)
+            )
             
             if self.api_key:
                 logger.info("BabelNet configuration loaded successfully")
@@ -0,0 +1,311 @@
+"""
+Selective decoding of getSynset responses.
+
+A getSynset body for a popular concept is megabytes of senses in every
+language, while most tools read only the glosses and a few sense properties.
+A SynsetProjection names what to keep, and decode_projected keeps only that,
+so the rest is neither cached, indexed nor held in memory.
+
+By default the body is decoded whole (with orjson when installed, which is
+far faster than any incremental parser driven from Python) and projected in
+place, releasing each dropped part as it goes. With stream=True and ijson
+installed (`pip install babelnet-mcp[decode]`) the body is instead parsed
+incrementally as it arrives: unwanted top-level fields are skipped event by
+event and senses are built and filtered one at a time, so peak memory follows
+the kept data rather than the body, at several times the decode time (see
+benchmarks/decode.py).
+
+A projection travels with the request as the `view.decode` parameter, so
+projected responses get their own cache entries, and backends that cannot
+project (local stores, snapshots) are asked for the full response instead.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Protocol, Tuple, runtime_checkable
+
+from .model import loads
+from .shaping import LANGUAGE_LISTS, filter_entries
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional dependency
+    ijson = None
+
+# Request parameter carrying the projection key (see SynsetProjection.key)
+VIEW_PARAM = "view.decode"
+
+# Top-level fields every projection keeps: over-quota answers only carry a message
+_ALWAYS_KEPT = ("message",)
+
+# Bytes read from the response per parser refill
+STREAM_CHUNK_BYTES = 64 * 1024
+
+
+class SynsetProjection:
+    """The top-level fields, sense properties and languages to keep from a synset."""
+
+    __slots__ = ("keys", "sense_fields", "langs", "key")
+
+    def __init__(
+        self,
+        keys: Iterable[str] = ("glosses", "senses"),
+        sense_fields: Optional[Iterable[str]] = None,
+        langs: Optional[Iterable[str]] = None,
+    ) -> None:
+        """
+        Initialize a projection.
+
+        Args:
+            keys: Top-level fields to keep
+            sense_fields: Keys of senses[].properties to keep (None keeps all)
+            langs: Languages to keep in senses, glosses, examples and categories
+                (None keeps all)
+        """
+        self.keys = frozenset(keys) | frozenset(_ALWAYS_KEPT)
+        self.sense_fields = tuple(sorted(set(sense_fields))) if sense_fields is not None else None
+        self.langs = frozenset(lang.upper() for lang in langs) if langs else None
+        self.key = "|".join([
+            ",".join(sorted(set(keys))),
+            ",".join(self.sense_fields) if self.sense_fields is not None else "*",
+            ",".join(sorted(self.langs)) if self.langs else "*",
+        ])
+
+    @classmethod
+    def parse(cls, key: str) -> "SynsetProjection":
+        """Rebuild a projection from its key."""
+        keys, fields, langs = (key.split("|") + ["*", "*"])[:3]
+        return cls(
+            [k for k in keys.split(",") if k],
+            None if fields == "*" else [f for f in fields.split(",") if f],
+            None if langs == "*" else langs.split(","),
+        )
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, SynsetProjection) and other.key == self.key
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+    def __repr__(self) -> str:
+        return f"SynsetProjection({self.key!r})"
+
+    def sense(self, sense: Any) -> Optional[Any]:
+        """Project one sense, or return None if its language is not kept."""
+        if not isinstance(sense, dict):
+            return sense
+        props = sense.get("properties", sense)
+        if self.langs is not None and str(props.get("language", "")).upper() not in self.langs:
+            return None
+        if self.sense_fields is None:
+            return sense
+        projected: Dict[str, Any] = {"type": sense["type"]} if "type" in sense else {}
+        projected["properties"] = {name: props[name] for name in self.sense_fields if name in props}
+        return projected
+
+    def field(self, name: str, value: Any, in_place: bool = False) -> Any:
+        """Project the value of one kept top-level field."""
+        if name == "senses" and isinstance(value, list):
+            if not in_place:
+                return [s for s in map(self.sense, value) if s is not None]
+            # Overwrite senses as they are projected, so each original is freed in turn
+            kept = 0
+            for sense in value:
+                projected = self.sense(sense)
+                if projected is not None:
+                    value[kept] = projected
+                    kept += 1
+            del value[kept:]
+            return value
+        if self.langs is not None and name in LANGUAGE_LISTS and isinstance(value, list):
+            return filter_entries(name, value, self.langs)
+        return value
+
+    def apply(self, payload: Any, in_place: bool = False) -> Any:
+        """
+        Project an already decoded response (non-object responses are returned as is).
+
+        Args:
+            payload: Decoded response
+            in_place: Modify the payload instead of building a new one; only for
+                payloads nothing else holds (cached or stored ones are shared)
+        """
+        if not isinstance(payload, dict):
+            return payload
+        if not in_place:
+            return {
+                name: self.field(name, value)
+                for name, value in payload.items()
+                if name in self.keys
+            }
+        for name in [name for name in payload if name not in self.keys]:
+            del payload[name]
+        for name, value in payload.items():
+            payload[name] = self.field(name, value, in_place=True)
+        return payload
+
+    def params(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Request parameters asking for this projection."""
+        return {**params, VIEW_PARAM: self.key}
+
+
+# Projection of get_definition: glosses, plus what the main sense and the gloss
+# index read from each sense
+DEFINITION_PROJECTION = SynsetProjection(
+    ("glosses", "senses"), ("language", "lemma", "pos", "source", "synsetID")
+)
+
+
+def split_projection(
+    params: Dict[str, Any]
+) -> Tuple[Optional[SynsetProjection], Dict[str, Any]]:
+    """Separate the projection from the parameters sent upstream."""
+    key = params.get(VIEW_PARAM)
+    if key is None:
+        return None, params
+    return (
+        SynsetProjection.parse(str(key)),
+        {name: value for name, value in params.items() if name != VIEW_PARAM},
+    )
+
+
+def can_stream() -> bool:
+    """Whether bodies are parsed incrementally (ijson is installed)."""
+    return ijson is not None
+
+
+@runtime_checkable
+class _Readable(Protocol):
+    """Binary file-like object (a response stream, ChunkReader or open file)."""
+
+    def read(self, size: int = -1) -> bytes: ...
+
+
+class ChunkReader:
+    """File-like reader over an iterable of byte chunks, counting the bytes read."""
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._chunks = iter(chunks)
+        self.size = 0
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0:
+            rest = b"".join(self._chunks)
+            self.size += len(rest)
+            return rest
+        if size == 0:
+            # Probe used by parsers to tell bytes from text streams
+            return b""
+        # A short read is fine for the parser; only b"" ends the stream
+        for chunk in self._chunks:
+            if chunk:
+                self.size += len(chunk)
+                return chunk
+        return b""
+
+
+_Events = Iterator[Tuple[str, Any]]
+
+
+def _build(events: _Events, event: str, value: Any) -> Any:
+    """Build the value starting with the given event from the following ones."""
+    if event == "start_map":
+        root: Any = {}
+    elif event == "start_array":
+        root = []
+    else:
+        return value
+    # Containers being filled, and the key each was stored under in its parent
+    stack = [root]
+    keys: List[Any] = []
+    key = None
+    for event, value in events:
+        top = stack[-1]
+        if event == "map_key":
+            key = value
+        elif event == "start_map" or event == "start_array":
+            child: Any = {} if event == "start_map" else []
+            if type(top) is list:
+                top.append(child)
+            else:
+                top[key] = child
+            stack.append(child)
+            keys.append(key)
+        elif event == "end_map" or event == "end_array":
+            stack.pop()
+            if not stack:
+                break
+            key = keys.pop()
+        elif type(top) is list:
+            top.append(value)
+        else:
+            top[key] = value
+    return root
+
+
+def _skip(events: _Events, event: str) -> None:
+    """Consume the events of a value without building it."""
+    if event != "start_map" and event != "start_array":
+        return
+    depth = 1
+    for event, _ in events:
+        if event == "start_map" or event == "start_array":
+            depth += 1
+        elif event == "end_map" or event == "end_array":
+            depth -= 1
+            if not depth:
+                return
+
+
+def _stream(source: _Readable, projection: SynsetProjection) -> Any:
+    events = ijson.basic_parse(source, use_float=True, buf_size=STREAM_CHUNK_BYTES)
+    event, value = next(events)
+    if event != "start_map":
+        return _build(events, event, value)
+    result: Dict[str, Any] = {}
+    name = ""
+    # Nested values are consumed whole by _build/_skip, so every event seen here is top-level
+    for event, value in events:
+        if event == "map_key":
+            name = value
+        elif event == "end_map":
+            break
+        elif name not in projection.keys:
+            _skip(events, event)
+        elif name == "senses" and event == "start_array":
+            senses = []
+            for event, value in events:
+                if event == "end_array":
+                    break
+                sense = projection.sense(_build(events, event, value))
+                if sense is not None:
+                    senses.append(sense)
+            result[name] = senses
+        else:
+            result[name] = projection.field(name, _build(events, event, value))
+    return result
+
+
+def decode_projected(
+    source: "bytes | _Readable | Iterable[bytes]",
+    projection: SynsetProjection,
+    stream: bool = False,
+) -> Any:
+    """
+    Decode a getSynset body, keeping only what a projection selects.
+
+    Args:
+        source: The body, a binary file-like object or an iterable of byte chunks
+        projection: What to keep
+        stream: Parse incrementally, building only the kept parts (needs ijson;
+            otherwise the body is read whole)
+
+    Returns:
+        The projected response
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        if stream and ijson is not None:
+            return _stream(ChunkReader([bytes(source)]), projection)
+        return projection.apply(loads(source), in_place=True)
+    reader = source if isinstance(source, _Readable) else ChunkReader(source)
+    if stream and ijson is not None:
+        return _stream(reader, projection)
+    return projection.apply(loads(reader.read()), in_place=True)
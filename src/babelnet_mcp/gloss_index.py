@@ -0,0 +1,255 @@
+"""
+Local full-text index of the glosses and lemmas of fetched synsets.
+
+Every synset the client fetches (from the REST API, a mirror or the local
+store) is added to an SQLite FTS5 index, one row per gloss with the synset's
+lemmas in the same language. search() then answers "concepts whose definition
+mentions X" locally, ranked with BM25, without any Babelcoins. Existing caches
+and dumps can be indexed with `babelnet-mcp rebuild-index`.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .model import Synset, tag_text
+
+logger = logging.getLogger(__name__)
+
+# Default location of the index
+DEFAULT_INDEX_PATH = Path.home() / '.babelnet' / 'glosses.sqlite'
+
+# BM25 column weights: synset_id, language, source, pos (unindexed), gloss, lemmas
+_BM25_WEIGHTS = (0.0, 0.0, 0.0, 0.0, 1.0, 2.0)
+
+
+def fts_query(text: str, match_any: bool = False) -> str:
+    """
+    Turn free text into an FTS5 query.
+
+    Each word is quoted so that punctuation and FTS5 keywords are taken
+    literally; a trailing '*' keeps its prefix-match meaning.
+
+    Args:
+        text: Words to search for
+        match_any: Match rows containing any word instead of all of them
+
+    Returns:
+        FTS5 MATCH expression ('' if the text has no words)
+    """
+    terms = []
+    for word in text.split():
+        prefix = word.endswith("*") and len(word) > 1
+        word = word.rstrip("*")
+        if word:
+            terms.append('"' + word.replace('"', '""') + '"' + ("*" if prefix else ""))
+    return (" OR " if match_any else " ").join(terms)
+
+
+class GlossIndex:
+    """Incremental FTS5 index of synset glosses and lemmas."""
+
+    def __init__(self, path: Path = DEFAULT_INDEX_PATH) -> None:
+        """
+        Open (or create) the index.
+
+        Args:
+            path: SQLite database file
+
+        Raises:
+            sqlite3.Error: If the SQLite build lacks FTS5
+        """
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), timeout=5.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS glosses USING fts5(
+                synset_id UNINDEXED,
+                language UNINDEXED,
+                source UNINDEXED,
+                pos UNINDEXED,
+                gloss,
+                lemmas,
+                tokenize = 'unicode61 remove_diacritics 2'
+            );
+            CREATE TABLE IF NOT EXISTS synsets (
+                id TEXT PRIMARY KEY,
+                indexed_at REAL NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _rows(synset: Synset) -> List[Tuple[str, str, str, str, str, str]]:
+        lemmas: Dict[str, Dict[str, None]] = {}
+        for sense in synset.senses:
+            names = lemmas.setdefault(tag_text(sense.language), {})
+            names.setdefault(sense.lemma.replace("_", " "))
+        pos = tag_text(synset.pos)
+        rows = []
+        with_gloss = set()
+        for gloss in synset.glosses:
+            language = tag_text(gloss.language)
+            with_gloss.add(language)
+            rows.append((
+                synset.id, language, tag_text(gloss.source), pos, gloss.text,
+                " | ".join(lemmas.get(language, {})),
+            ))
+        # Languages with lemmas but no gloss are still found by lemma
+        for language, names in lemmas.items():
+            if language not in with_gloss:
+                rows.append((synset.id, language, "", pos, "", " | ".join(names)))
+        return rows
+
+    def add(self, synset_id: str, payload: Dict[str, Any], commit: bool = True) -> int:
+        """
+        Index (or re-index) the languages present in a getSynset payload.
+
+        Rows of other languages are kept, so payloads fetched with different
+        targetLang sets add up.
+
+        Args:
+            synset_id: Synset ID
+            payload: getSynset response
+            commit: Commit immediately (False when adding in bulk)
+
+        Returns:
+            Number of rows indexed
+        """
+        rows = self._rows(Synset.from_json(payload, synset_id))
+        if not rows:
+            return 0
+        languages = sorted({row[1] for row in rows})
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM glosses WHERE synset_id = ? "
+                f"AND language IN ({','.join('?' * len(languages))})",
+                (synset_id, *languages),
+            )
+            self._conn.executemany(
+                "INSERT INTO glosses (synset_id, language, source, pos, gloss, lemmas) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO synsets (id, indexed_at) VALUES (?, ?)",
+                (synset_id, time.time()),
+            )
+            if commit:
+                self._conn.commit()
+        return len(rows)
+
+    def add_many(
+        self, records: Iterable[Tuple[str, Dict[str, Any]]], batch_size: int = 1000
+    ) -> int:
+        """
+        Index (synset ID, getSynset payload) pairs, committing in batches.
+
+        Returns:
+            Number of synsets indexed
+        """
+        count = 0
+        for synset_id, payload in records:
+            if self.add(synset_id, payload, commit=False):
+                count += 1
+                if count % batch_size == 0:
+                    self.commit()
+                    logger.info(f"Indexed {count} synsets...")
+        self.commit()
+        return count
+
+    def commit(self) -> None:
+        with self._lock:
+            self._conn.commit()
+
+    def search(
+        self,
+        query: str,
+        langs: Optional[List[str]] = None,
+        pos: Optional[str] = None,
+        sources: Optional[List[str]] = None,
+        limit: int = 10,
+        match_any: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Find synsets whose glosses or lemmas match a query, best first.
+
+        Args:
+            query: Words to search for ('word*' matches a prefix)
+            langs: Only rows in these language tags
+            pos: Only synsets with this POS tag
+            sources: Only glosses from these sources
+            limit: Maximum number of synsets
+            match_any: Match any word instead of all of them
+
+        Returns:
+            One result per synset: ID, POS, language, source, gloss, lemmas,
+            highlighted snippet and BM25 score (lower is better)
+        """
+        expression = fts_query(query, match_any)
+        if not expression:
+            return []
+        sql = (
+            "SELECT synset_id, language, source, pos, gloss, lemmas, "
+            "snippet(glosses, 4, '[', ']', '…', 16), "
+            f"bm25(glosses, {', '.join(str(w) for w in _BM25_WEIGHTS)}) AS score "
+            "FROM glosses WHERE glosses MATCH ?"
+        )
+        args: List[Any] = [expression]
+        if langs:
+            sql += f" AND language IN ({','.join('?' * len(langs))})"
+            args.extend(lang.upper() for lang in langs)
+        if pos:
+            sql += " AND pos = ?"
+            args.append(pos.upper())
+        if sources:
+            sql += f" AND source IN ({','.join('?' * len(sources))})"
+            args.extend(source.upper() for source in sources)
+        # Several glosses of one synset may match; over-fetch, then keep the best per synset
+        sql += " ORDER BY score LIMIT ?"
+        args.append(limit * 4)
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        results: Dict[str, Dict[str, Any]] = {}
+        for synset_id, language, source, synset_pos, gloss, lemmas, snippet, score in rows:
+            if synset_id in results:
+                continue
+            results[synset_id] = {
+                "synset_id": synset_id,
+                "pos": synset_pos,
+                "language": language,
+                "source": source,
+                "gloss": gloss,
+                "lemmas": lemmas.split(" | ") if lemmas else [],
+                "snippet": snippet if gloss else "",
+                "score": round(score, 4),
+            }
+            if len(results) >= limit:
+                break
+        return list(results.values())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM glosses")
+            self._conn.execute("DELETE FROM synsets")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of indexed synsets and rows."""
+        with self._lock:
+            return {
+                "synsets": int(self._conn.execute("SELECT COUNT(*) FROM synsets").fetchone()[0]),
+                "rows": int(self._conn.execute("SELECT COUNT(*) FROM glosses").fetchone()[0]),
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,171 @@
+"""
+Client-side traversal of BabelNet semantic relations.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from .async_client import AsyncBabelNetClient
+from .budget import BudgetExhaustedError
+from .constants import RELATION_GROUPS
+
+logger = logging.getLogger(__name__)
+
+
+def edge_matches(edge: Dict[str, Any], relation: str) -> bool:
+    """
+    Check whether an outgoing edge belongs to a relation type.
+
+    Args:
+        edge: Edge as returned by getOutgoingEdges
+        relation: One of SUPPORTED_RELATIONS
+
+    Returns:
+        True if the edge matches
+    """
+    if relation == "all":
+        return True
+    pointer = edge.get("pointer", {})
+    name = str(pointer.get("name", "")).upper()
+    if relation == "antonym":
+        return "ANTONYM" in name
+    group = RELATION_GROUPS.get(relation)
+    if group is None:
+        return False
+    return str(pointer.get("relationGroup", "")).upper() == group or group in name
+
+
+def filter_edges(edges: List[Dict[str, Any]], relation: str) -> List[Dict[str, Any]]:
+    """Keep the edges of one relation type."""
+    return [edge for edge in edges if edge_matches(edge, relation)]
+
+
+def edge_rank(edge: Dict[str, Any]) -> tuple:
+    """Sort key preferring manually curated, then heavier edges."""
+    pointer = edge.get("pointer", {})
+    return (bool(pointer.get("isAutomatic", False)), -float(edge.get("normalizedWeight") or 0))
+
+
+async def walk_relations(
+    aclient: AsyncBabelNetClient,
+    start: str,
+    relation: str,
+    depth: int,
+    max_nodes: int,
+) -> Dict[str, Any]:
+    """
+    Breadth-first walk over one relation type.
+
+    Each frontier is fetched concurrently and every synset is expanded at most
+    once. Expanding a synset costs one getOutgoingEdges call, so max_nodes also
+    bounds the Babelcoins spent.
+
+    Args:
+        aclient: Async BabelNet client
+        start: Synset ID to start from
+        relation: Relation type to follow (see SUPPORTED_RELATIONS)
+        depth: Maximum number of hops
+        max_nodes: Maximum number of synsets to expand
+
+    Returns:
+        Dictionary with the reached nodes (ID, depth, parent, relation name),
+        the traversed edges and whether the walk was truncated
+    """
+    nodes: Dict[str, Dict[str, Any]] = {
+        start: {"synset_id": start, "depth": 0, "parent": None, "relation": None}
+    }
+    edges: List[Dict[str, Any]] = []
+    frontier = [start]
+    expanded = 0
+    truncated = False
+    errors: Dict[str, str] = {}
+
+    for level in range(1, depth + 1):
+        if not frontier:
+            break
+        if expanded + len(frontier) > max_nodes:
+            frontier = frontier[:max(0, max_nodes - expanded)]
+            truncated = True
+        if not frontier:
+            break
+        expanded += len(frontier)
+        responses = await asyncio.gather(
+            *(aclient.get_outgoing_edges(sid) for sid in frontier), return_exceptions=True
+        )
+        next_frontier: List[str] = []
+        for source, response in zip(frontier, responses):
+            if isinstance(response, BaseException):
+                if isinstance(response, BudgetExhaustedError):
+                    truncated = True
+                errors[source] = str(response)
+                logger.warning(f"Failed to load edges of {source}: {response}")
+                continue
+            for edge in sorted(filter_edges(response, relation), key=edge_rank):
+                target = edge.get("target")
+                if not target:
+                    continue
+                name = edge.get("pointer", {}).get("name", "")
+                edges.append({"source": source, "target": target, "relation": name})
+                if target not in nodes:
+                    nodes[target] = {
+                        "synset_id": target, "depth": level, "parent": source, "relation": name
+                    }
+                    next_frontier.append(target)
+        frontier = next_frontier
+
+    result: Dict[str, Any] = {
+        "nodes": list(nodes.values()),
+        "edges": edges,
+        "expanded": expanded,
+        "truncated": truncated,
+    }
+    if errors:
+        result["errors"] = errors
+    return result
+
+
+async def hypernym_path(
+    aclient: AsyncBabelNetClient, start: str, max_depth: int
+) -> Dict[str, Any]:
+    """
+    Follow the preferred hypernym of each synset up to the root.
+
+    Args:
+        aclient: Async BabelNet client
+        start: Synset ID to start from
+        max_depth: Maximum length of the chain
+
+    Returns:
+        Dictionary with the chain of synset IDs (start first) and why it stopped;
+        if loading edges failed, the chain walked so far and the error
+    """
+    path: List[Dict[str, Any]] = [{"synset_id": start, "relation": None}]
+    seen = {start}
+    current = start
+    stopped = "max_depth"
+    error: Optional[str] = None
+    for _ in range(max_depth):
+        try:
+            response = await aclient.get_outgoing_edges(current)
+        except BudgetExhaustedError as e:
+            stopped = "budget_exhausted"
+            error = str(e)
+            break
+        except Exception as e:
+            stopped = "error"
+            error = str(e)
+            logger.warning(f"Failed to load edges of {current}: {e}")
+            break
+        candidates = sorted(filter_edges(response, "hypernym"), key=edge_rank)
+        target = next((e for e in candidates if e.get("target") not in seen), None)
+        if target is None:
+            stopped = "root" if not candidates else "cycle"
+            break
+        current = target["target"]
+        seen.add(current)
+        path.append({"synset_id": current, "relation": target.get("pointer", {}).get("name", "")})
+    result: Dict[str, Any] = {"path": path, "length": len(path) - 1, "stopped": stopped}
+    if error is not None:
+        result["error"] = error
+    return result
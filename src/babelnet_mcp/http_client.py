@@ -2,29 +2,429 @@
 Minimal HTTP client for BabelNet REST API.
 """
 
-from typing import Any, Dict, List, Optional
-import requests
+import logging
+import random
+import sqlite3
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, List, Optional
 
-BASE_URL = "https://babelnet.io/v9"
+from .backends import PUBLIC_URL, Backend, LocalStoreBackend, RestBackend, TieredRouter
+from .budget import BudgetManager
+from .cache import ResponseCache, cache_key
+from .decode import SynsetProjection, split_projection
+from .metrics import Metrics
+from .normalize import LemmaNormalizer
+from .singleflight import SingleFlight
 
+if TYPE_CHECKING:
+    import requests
+
+    from .gloss_index import GlossIndex
+    from .local_store import LocalSynsetStore
+    from .snapshot import SnapshotReader
+
+BASE_URL = PUBLIC_URL
+
+logger = logging.getLogger(__name__)
+
+# Responses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def _retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def lemma_params(
+    lemma: str,
+    search_langs: List[str],
+    target_langs: Optional[List[str]] = None,
+    poses: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Build the query parameters of a getSynsetIds/getSenses request."""
+    params: Dict[str, Any] = {"lemma": lemma}
+    for lang in search_langs:
+        params.setdefault("searchLang", [])
+        params["searchLang"].append(lang.upper())
+    if target_langs:
+        for lang in target_langs:
+            params.setdefault("targetLang", [])
+            params["targetLang"].append(lang.upper())
+    if poses:
+        for pos in poses:
+            params.setdefault("pos", [])
+            params["pos"].append(pos.upper())
+    return params
+
+
+class RequestStats:
+    """Upstream request counters and a window of recent latencies."""
+
+    def __init__(self, window: int = 1000) -> None:
+        self._lock = threading.Lock()
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.status_counts: Dict[int, int] = {}
+
+    def record(self, latency: float, status: Optional[int]) -> None:
+        with self._lock:
+            self.requests += 1
+            self._latencies.append(latency)
+            if status is not None:
+                self.status_counts[status] = self.status_counts.get(status, 0) + 1
+
+    def record_retry(self) -> None:
+        with self._lock:
+            self.retries += 1
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            result: Dict[str, Any] = {
+                "requests": self.requests,
+                "retries": self.retries,
+                "failures": self.failures,
+                "status_counts": dict(self.status_counts),
+            }
+        if latencies:
+            def pct(q: float) -> float:
+                return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000, 1)
+            result["latency_ms"] = {
+                "avg": round(sum(latencies) / len(latencies) * 1000, 1),
+                "p50": pct(0.50),
+                "p95": pct(0.95),
+                "p99": pct(0.99),
+                "max": round(latencies[-1] * 1000, 1),
+            }
+        return result
 
 
 class BabelNetHTTPClient:
-    def __init__(self, api_key: str) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        cache: Optional[ResponseCache] = None,
+        budget: Optional[BudgetManager] = None,
+        local_store: Optional["LocalSynsetStore"] = None,
+        pool_size: int = 10,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 30.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        metrics: Optional[Metrics] = None,
+        base_url: str = BASE_URL,
+        mirror_urls: Optional[List[str]] = None,
+        backends: Optional[List[Backend]] = None,
+        normalizer: Optional[LemmaNormalizer] = None,
+        gloss_index: Optional["GlossIndex"] = None,
+        snapshot: Optional["SnapshotReader"] = None,
+        selective_decode: bool = True,
+        stream_decode: bool = False,
+    ) -> None:
         self.api_key = api_key
-        self.session = requests.Session()
-        self.session.headers.update({"Accept-Encoding": "gzip"})
+        self.base_url = base_url.rstrip("/")
+        self.cache = cache
+        self.budget = budget
+        self.local_store = local_store
+        self.pool_size = pool_size
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.flights = SingleFlight()
+        self.request_stats = RequestStats()
+        self.metrics = metrics or Metrics()
+        self.validated = False
+        # Whether the cache and snapshot were checked against the live BabelNet release
+        self.version_checked = cache is None and snapshot is None
+        self._version_lock = threading.Lock()
+        self.normalizer = normalizer or LemmaNormalizer()
+        self.gloss_index = gloss_index
+        # Whether tools request only the parts of synsets they read (see decode)
+        self.selective_decode = selective_decode
+        # Whether projected responses are parsed incrementally (less memory, slower)
+        self.stream_decode = stream_decode
+        self._session: Optional["requests.Session"] = None
+        self._session_lock = threading.Lock()
+        self.snapshot = snapshot
+        self._snapshot_backend: Optional[LocalStoreBackend] = None
+        if backends is None:
+            # Imported synsets, snapshots and self-hosted mirrors are free; the public API
+            # is the fallback
+            backends = [LocalStoreBackend(local_store)] if local_store is not None else []
+            if snapshot is not None:
+                self._snapshot_backend = LocalStoreBackend(snapshot, "snapshot")
+                backends.append(self._snapshot_backend)
+            for index, url in enumerate(mirror_urls or []):
+                backends.append(self.rest_backend(f"mirror{index or ''}", url))
+            backends.append(self.rest_backend("rest", self.base_url))
+        self.router = TieredRouter(backends, metrics=self.metrics)
+
+    def rest_backend(
+        self, name: str, base_url: str, costs_coins: Optional[bool] = None
+    ) -> RestBackend:
+        """Create a REST backend sharing this client's session, retries, budget and metrics."""
+        return RestBackend(
+            name, base_url, self._request, self.api_key,
+            costs_coins=costs_coins, budget=self.budget, metrics=self.metrics,
+            stream=self.stream_decode,
+        )
+
+    @property
+    def session(self) -> "requests.Session":
+        # requests is imported on first use so that startup stays fast
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+
+                    session = requests.Session()
+                    session.headers.update({"Accept-Encoding": "gzip"})
+                    # Keep enough pooled keep-alive connections for the worker pool;
+                    # retries are handled in _request so they can honor Retry-After
+                    adapter = HTTPAdapter(
+                        pool_connections=self.pool_size, pool_maxsize=self.pool_size, max_retries=0
+                    )
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+        return self._session
 
     def _get(self, path: str, params: Dict[str, Any]) -> Any:
-        params = dict(params)
-        params["key"] = self.api_key
-        url = f"{BASE_URL}/{path}"
-        resp = self.session.get(url, params=params, timeout=30)
-        resp.raise_for_status()
-        return resp.json()
+        start = time.perf_counter()
+        outcome = "miss"
+        error: Optional[BaseException] = None
+        try:
+            if self.cache is not None:
+                hit, cached = self.cache.get(path, params)
+                if not hit:
+                    # A cached full response answers any projection of it
+                    projection, full_params = split_projection(params)
+                    if projection is not None:
+                        hit, cached = self.cache.get(path, full_params)
+                        cached = projection.apply(cached) if hit else cached
+                if hit:
+                    outcome = "hit"
+                    return cached
+            # Identical concurrent requests share a single backend call
+            return self.flights.do(
+                cache_key(path, params), lambda: self._fetch_shared(path, params)
+            )
+        except Exception as e:
+            outcome, error = "error", e
+            raise
+        finally:
+            self.metrics.observe_request(path, outcome, time.perf_counter() - start, error)
+
+    def _fetch_shared(self, path: str, params: Dict[str, Any]) -> Any:
+        """Fetch once across the processes sharing the persistent cache."""
+        if not self.version_checked and path != "getVersion":
+            self._check_version()
+        if self.cache is None:
+            data = self._fetch(path, params)
+        else:
+            with self.cache.fetch_lock(path, params) as held:
+                if held:
+                    # Another process may have fetched (and indexed) it while we waited
+                    hit, value = self.cache.get_shared(path, params)
+                    if hit:
+                        return value
+                data = self._fetch(path, params)
+        self._index_glosses(path, params, data)
+        return data
+
+    def _fetch(self, path: str, params: Dict[str, Any]) -> Any:
+        backend, data = self.router.fetch(path, params)
+        if backend.costs_coins and not self.validated:
+            self.validated = True
+            logger.info("BabelNet API key accepted on first request")
+        if self.cache is not None and backend.cache_results:
+            self.cache.put(path, params, data)
+        return data
+
+    def _check_version(self) -> None:
+        """
+        Sync the cache and snapshot with the live BabelNet release before the first fetch.
+
+        Runs once per client, so responses from a previous release are dropped
+        even when the API key is validated lazily. The version comes from the
+        cache while its getVersion entry is fresh (one day), so processes sharing
+        a cache pay for at most one check a day. A failed check is logged and
+        not retried.
+        """
+        with self._version_lock:
+            if self.version_checked:
+                return
+            try:
+                self.get_version()
+            except Exception as e:
+                self.version_checked = True
+                logger.warning(f"Could not check the BabelNet version: {e}")
+
+    def _index_glosses(self, path: str, params: Dict[str, Any], data: Any) -> None:
+        """Add a freshly fetched synset to the gloss search index."""
+        if path != "getSynset" or self.gloss_index is None or not isinstance(data, dict):
+            return
+        try:
+            self.gloss_index.add(params["id"], data)
+        except sqlite3.Error as e:
+            logger.warning(f"Could not index glosses of {params['id']}: {e}")
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _request(
+        self,
+        url: str,
+        query: Dict[str, Any],
+        stream: bool = False,
+        on_response: Optional[Callable[[], None]] = None,
+    ) -> "requests.Response":
+        """
+        GET with retries on connection errors, timeouts, 429 and 5xx responses.
+
+        With stream=True the body is left unread for the caller, who must close
+        the response. on_response is called for every attempt the server
+        answered, whatever its status (it charges coin-costing requests).
+        """
+        import requests
+
+        session = self.session
+        options: Dict[str, Any] = {"stream": True} if stream else {}
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                resp = session.get(url, params=query, timeout=self.timeout, **options)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self.request_stats.record(time.perf_counter() - start, None)
+                if attempt >= self.max_retries:
+                    self.request_stats.record_failure()
+                    raise
+                delay = self._backoff(attempt)
+                logger.debug(f"Retrying {url} in {delay:.2f}s after {type(e).__name__}")
+            else:
+                self.request_stats.record(time.perf_counter() - start, resp.status_code)
+                if on_response is not None:
+                    on_response()
+                if resp.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    if resp.status_code >= 400:
+                        self.request_stats.record_failure()
+                        if stream:
+                            # Nobody reads the body of an error; release its connection
+                            resp.close()
+                    resp.raise_for_status()
+                    return resp
+                if stream:
+                    # Release the connection of the unread body
+                    resp.close()
+                retry_after = _retry_after(resp.headers.get("Retry-After"))
+                delay = self._backoff(attempt) if retry_after is None else retry_after
+                delay = min(delay, self.backoff_max)
+                logger.debug(f"Retrying {url} in {delay:.2f}s after HTTP {resp.status_code}")
+            self.request_stats.record_retry()
+            attempt += 1
+            time.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return request, retry, latency, coalescing and cache statistics."""
+        result: Dict[str, Any] = {
+            "http": self.request_stats.snapshot(),
+            "coalescing": self.flights.stats(),
+            "backends": self.router.stats(),
+        }
+        if self.cache is not None:
+            result["cache"] = self.cache.stats()
+        if self.gloss_index is not None:
+            result["gloss_index"] = self.gloss_index.stats()
+        return result
+
+    def lemma_query(
+        self,
+        lemma: str,
+        search_langs: List[str],
+        target_langs: Optional[List[str]] = None,
+        poses: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """Build getSynsetIds/getSenses parameters with the lemma normalized, so that
+        spelling variants of one query share a cache entry and an upstream call."""
+        return lemma_params(self.normalizer(lemma, search_langs), search_langs, target_langs, poses)
+
+    def get_view(
+        self,
+        path: str,
+        params: Dict[str, Any],
+        view: Dict[str, Any],
+        shape: Callable[[Any], Any],
+    ) -> Any:
+        """
+        Fetch a response and reshape it, caching the shaped form under its own key.
+
+        The raw response stays cached as well: every other shape of it, and the
+        unshaped tool call, is then derived from it without spending a Babelcoin.
+        Shaped forms are small next to it (they exist to drop most of it).
+
+        Args:
+            path: Endpoint path
+            params: Query parameters
+            view: Parameters identifying the shape (part of the cache key)
+            shape: Function turning the raw response into the shaped one
+
+        Returns:
+            The shaped response
+        """
+        view_params = {**params, **{f"view.{name}": value for name, value in view.items()}}
+        if self.cache is not None:
+            hit, cached = self.cache.get(path, view_params)
+            if hit:
+                return cached
+        value = shape(self._get(path, params))
+        if self.cache is not None:
+            self.cache.put(path, view_params, value)
+        return value
 
     def get_version(self) -> Dict[str, Any]:
-        return self._get("getVersion", {})
+        """Fetch the BabelNet version and sync the cache and snapshot with it."""
+        version = self._get("getVersion", {})
+        if not isinstance(version, dict) or not version.get("version"):
+            return version
+        self.version_checked = True
+        # A new BabelNet release invalidates every cached response
+        if self.cache is not None:
+            self.cache.sync_version(str(version["version"]))
+        backend = self._snapshot_backend
+        if backend is not None and self.snapshot is not None and (
+            self.snapshot.babelnet_version != version["version"]
+        ):
+            logger.warning(
+                f"Snapshot is from BabelNet {self.snapshot.babelnet_version} but the API "
+                f"serves {version['version']}; no longer answering from it"
+            )
+            self.router.remove(backend)
+            self._snapshot_backend = None
+        return version
 
     def get_synset_ids(
         self,
@@ -33,24 +433,23 @@ class BabelNetHTTPClient:
         target_langs: Optional[List[str]] = None,
         poses: Optional[List[str]] = None,
     ) -> List[Dict[str, Any]]:
-        params: Dict[str, Any] = {"lemma": lemma}
-        for lang in search_langs:
-            params.setdefault("searchLang", [])
-            params["searchLang"].append(lang.upper())
-        if target_langs:
-            for lang in target_langs:
-                params.setdefault("targetLang", [])
-                params["targetLang"].append(lang.upper())
-        if poses:
-            for pos in poses:
-                params.setdefault("pos", [])
-                params["pos"].append(pos.upper())
-        return self._get("getSynsetIds", params)
-
-    def get_synset(self, synset_id: str) -> Dict[str, Any]:
-        # API returns a single synset JSON object
-        return self._get("getSynset", {"id": synset_id})
+        return self._get("getSynsetIds", self.lemma_query(lemma, search_langs, target_langs, poses))
 
+    def get_synset(
+        self,
+        synset_id: str,
+        target_langs: Optional[List[str]] = None,
+        projection: Optional[SynsetProjection] = None,
+    ) -> Dict[str, Any]:
+        # API returns a single synset JSON object
+        params: Dict[str, Any] = {"id": synset_id}
+        if target_langs:
+            # Senses and glosses in these languages (BabelNet accepts up to 3 per request)
+            params["targetLang"] = [lang.upper() for lang in target_langs]
+        if projection is not None:
+            # Decode (and cache) only the selected parts of the synset
+            params = projection.params(params)
+        return self._get("getSynset", params)
 
     def get_senses(
         self,
@@ -59,19 +458,7 @@ class BabelNetHTTPClient:
         target_langs: Optional[List[str]] = None,
         poses: Optional[List[str]] = None,
     ) -> List[Dict[str, Any]]:
-        params: Dict[str, Any] = {"lemma": lemma}
-        for lang in search_langs:
-            params.setdefault("searchLang", [])
-            params["searchLang"].append(lang.upper())
-        if target_langs:
-            for lang in target_langs:
-                params.setdefault("targetLang", [])
-                params["targetLang"].append(lang.upper())
-        if poses:
-            for pos in poses:
-                params.setdefault("pos", [])
-                params["pos"].append(pos.upper())
-        return self._get("getSenses", params)
+        return self._get("getSenses", self.lemma_query(lemma, search_langs, target_langs, poses))
 
 
     def get_outgoing_edges(self, synset_id: str, pointer: Optional[str] = None) -> List[Dict[str, Any]]:
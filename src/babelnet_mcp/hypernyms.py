@@ -0,0 +1,280 @@
+"""
+Locally materialized hypernym DAG for similarity computations.
+
+Synset IDs are mapped to small integers and each expanded node keeps a tuple
+of parent IDs, taken from its hypernym edges. Ancestor sets (with distances)
+and depths are memoized once a node's closure is fully expanded, so scoring
+many pairs only costs dictionary intersections. Edges come from
+getOutgoingEdges through the client and its cache, so a rebuilt graph costs
+no Babelcoins and only ancestors never seen before are fetched upstream.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .async_client import AsyncBabelNetClient
+from .budget import BudgetExhaustedError
+from .graph import edge_rank, filter_edges
+
+logger = logging.getLogger(__name__)
+
+# Hypernyms kept per synset; BabelNet lists many automatic ones of little value
+DEFAULT_MAX_PARENTS = 3
+
+
+class HypernymGraph:
+    """Integer-ID hypernym DAG with memoized ancestor and depth tables."""
+
+    def __init__(self, max_parents: int = DEFAULT_MAX_PARENTS) -> None:
+        """
+        Initialize an empty graph.
+
+        Args:
+            max_parents: Hypernyms kept per synset, best ranked first (see graph.edge_rank)
+        """
+        self.max_parents = max_parents
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        # None until the node's hypernyms are known
+        self._parents: List[Optional[Tuple[int, ...]]] = []
+        self._ancestors: Dict[int, Dict[int, int]] = {}
+        self._depths: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def node(self, synset_id: str) -> int:
+        """Return the integer ID of a synset, adding it if new."""
+        with self._lock:
+            return self._node(synset_id)
+
+    def _node(self, synset_id: str) -> int:
+        index = self._ids.get(synset_id)
+        if index is None:
+            index = self._ids[synset_id] = len(self._names)
+            self._names.append(sys.intern(synset_id))
+            self._parents.append(None)
+        return index
+
+    def name(self, node: int) -> str:
+        return self._names[node]
+
+    def expanded(self, synset_id: str) -> bool:
+        index = self._ids.get(synset_id)
+        return index is not None and self._parents[index] is not None
+
+    def add_edges(self, synset_id: str, edges: List[Dict[str, Any]]) -> Tuple[str, ...]:
+        """
+        Record the hypernyms of a synset from its getOutgoingEdges response.
+
+        Returns:
+            The synset IDs kept as parents
+        """
+        candidates = sorted(filter_edges(edges, "hypernym"), key=edge_rank)
+        targets: Dict[str, None] = {}
+        for edge in candidates:
+            target = edge.get("target")
+            if target and target != synset_id:
+                targets.setdefault(target)
+                if len(targets) >= self.max_parents:
+                    break
+        with self._lock:
+            node = self._node(synset_id)
+            self._parents[node] = tuple(self._node(target) for target in targets)
+        return tuple(targets)
+
+    def missing(self, synset_ids: Iterable[str]) -> List[str]:
+        """Synsets in the hypernym closure of the given ones whose edges are not yet known."""
+        with self._lock:
+            seen = set()
+            stack = [self._node(sid) for sid in synset_ids]
+            missing = []
+            while stack:
+                node = stack.pop()
+                if node in seen:
+                    continue
+                seen.add(node)
+                parents = self._parents[node]
+                if parents is None:
+                    missing.append(self._names[node])
+                else:
+                    stack.extend(parents)
+            return missing
+
+    def ancestors(self, synset_id: str) -> Dict[int, int]:
+        """
+        Ancestors of a synset (itself included) with their shortest distance.
+
+        Results are memoized for nodes whose closure is fully expanded; partial
+        closures are recomputed after more edges arrive.
+        """
+        with self._lock:
+            return self._closure(self._node(synset_id))[0]
+
+    def _closure(self, node: int) -> Tuple[Dict[int, int], bool]:
+        memo = self._ancestors.get(node)
+        if memo is not None:
+            return memo, True
+        distances = {node: 0}
+        frontier = [node]
+        complete = True
+        distance = 0
+        # Breadth-first, so the first time a node is reached is its shortest distance
+        while frontier:
+            distance += 1
+            next_frontier = []
+            for current in frontier:
+                parents = self._parents[current]
+                if parents is None:
+                    complete = False
+                    continue
+                for parent in parents:
+                    if distances.get(parent, sys.maxsize) <= distance:
+                        continue
+                    known = self._ancestors.get(parent)
+                    if known is not None:
+                        # Reuse a memoized closure instead of walking it again
+                        for ancestor, offset in known.items():
+                            if distance + offset < distances.get(ancestor, sys.maxsize):
+                                distances[ancestor] = distance + offset
+                        continue
+                    distances[parent] = distance
+                    next_frontier.append(parent)
+            frontier = next_frontier
+        if complete:
+            self._ancestors[node] = distances
+        return distances, complete
+
+    def depth(self, synset_id: str) -> int:
+        """Shortest distance from a synset to a root of its hypernym closure."""
+        with self._lock:
+            return self._depth(self._node(synset_id))
+
+    def _depth(self, node: int) -> int:
+        memo = self._depths.get(node)
+        if memo is not None:
+            return memo
+        distances, complete = self._closure(node)
+        depth = min(
+            (d for ancestor, d in distances.items() if self._parents[ancestor] == ()),
+            default=max(distances.values()),
+        )
+        if complete:
+            self._depths[node] = depth
+        return depth
+
+    def lowest_common_hypernym(self, synset_ids: Sequence[str]) -> Optional[Dict[str, Any]]:
+        """
+        Deepest hypernym shared by all the given synsets.
+
+        Ties are broken by the total distance from the synsets.
+
+        Returns:
+            Dictionary with the hypernym ID, its depth and the distance from each
+            synset, or None if they share no hypernym
+        """
+        with self._lock:
+            closures = [self._closure(self._node(sid))[0] for sid in synset_ids]
+            if not closures:
+                return None
+            common = set(closures[0]).intersection(*closures[1:])
+            if not common:
+                return None
+            best = max(
+                common,
+                key=lambda a: (self._depth(a), -sum(c[a] for c in closures), -a),
+            )
+            return {
+                "synset_id": self._names[best],
+                "depth": self._depth(best),
+                "distances": {sid: c[best] for sid, c in zip(synset_ids, closures)},
+            }
+
+    def similarity(self, a: str, b: str) -> Dict[str, Any]:
+        """
+        Path and Wu-Palmer similarity of two synsets.
+
+        path = 1 / (1 + shortest path through a common hypernym)
+        wup = 2 * depth(lcs) / (depth_a + depth_b), with depths counted through
+        the lowest common hypernym and roots at depth 1
+
+        Returns:
+            Dictionary with both scores, the common hypernym and the path length
+            (scores are None when the synsets share no hypernym)
+        """
+        lcs = self.lowest_common_hypernym([a, b])
+        if lcs is None:
+            return {"a": a, "b": b, "lcs": None, "distance": None, "path": None, "wup": None}
+        dist_a, dist_b = lcs["distances"][a], lcs["distances"][b]
+        depth = lcs["depth"] + 1
+        return {
+            "a": a,
+            "b": b,
+            "lcs": lcs["synset_id"],
+            "distance": dist_a + dist_b,
+            "path": round(1 / (1 + dist_a + dist_b), 4),
+            "wup": round(2 * depth / (dist_a + dist_b + 2 * depth), 4),
+        }
+
+    def stats(self) -> Dict[str, int]:
+        """Return node and memo table sizes."""
+        with self._lock:
+            return {
+                "nodes": len(self._names),
+                "expanded": sum(1 for parents in self._parents if parents is not None),
+                "memoized_ancestors": len(self._ancestors),
+                "memoized_depths": len(self._depths),
+            }
+
+
+async def expand_hypernyms(
+    graph: HypernymGraph,
+    aclient: AsyncBabelNetClient,
+    synset_ids: Sequence[str],
+    max_fetches: int,
+) -> Dict[str, Any]:
+    """
+    Fetch the edges of the missing ancestors of some synsets, level by level.
+
+    Args:
+        graph: Graph to extend
+        aclient: Async BabelNet client
+        synset_ids: Synsets whose hypernym closure is needed
+        max_fetches: Maximum number of getOutgoingEdges calls (cached ones included)
+
+    Returns:
+        Dictionary with the number of fetches, whether the closure is complete,
+        and errors per synset
+    """
+    fetches = 0
+    errors: Dict[str, str] = {}
+    budget_exhausted = False
+    while True:
+        missing = [sid for sid in graph.missing(synset_ids) if sid not in errors]
+        if not missing or fetches >= max_fetches or budget_exhausted:
+            break
+        missing = missing[:max_fetches - fetches]
+        fetches += len(missing)
+        responses = await asyncio.gather(
+            *(aclient.get_outgoing_edges(sid) for sid in missing), return_exceptions=True
+        )
+        for sid, response in zip(missing, responses):
+            if isinstance(response, BaseException):
+                budget_exhausted = budget_exhausted or isinstance(response, BudgetExhaustedError)
+                errors[sid] = str(response)
+                logger.warning(f"Failed to load hypernyms of {sid}: {response}")
+            else:
+                graph.add_edges(sid, response)
+    result: Dict[str, Any] = {
+        "fetches": fetches,
+        "complete": not graph.missing(synset_ids),
+    }
+    if budget_exhausted:
+        result["budget_exhausted"] = True
+    if errors:
+        result["errors"] = errors
+    return result
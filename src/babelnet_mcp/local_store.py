@@ -0,0 +1,370 @@
+"""
+Local offline synset store backed by SQLite.
+
+Synsets imported from BabelNet JSON dumps are indexed by synset ID and by
+lemma + language + POS, and served through the same interface as
+BabelNetHTTPClient without network access or Babelcoins.
+
+A dump usually holds only part of BabelNet, so a lemma matching some local
+synsets may have others upstream. Lemma lookups are therefore only answered
+locally in languages the dump was imported as complete for.
+"""
+
+import gzip
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional, Tuple
+
+from .shaping import project_synset
+
+logger = logging.getLogger(__name__)
+
+# Default location of the local store
+DEFAULT_STORE_PATH = Path.home() / '.babelnet' / 'synsets.sqlite'
+
+
+def lemma_key(lemma: str) -> str:
+    """Normalize a lemma for index lookups (BabelNet joins multiword lemmas with '_')."""
+    return "_".join(lemma.split()).lower()
+
+
+def synset_id_of(synset: Dict[str, Any]) -> Optional[str]:
+    """Return the ID of a getSynset payload, read from its senses."""
+    if synset.get("id"):
+        return str(synset["id"])
+    for sense in synset.get("senses", []):
+        sid = sense.get("properties", {}).get("synsetID", {}).get("id")
+        if sid:
+            return str(sid)
+    return None
+
+
+def _open_dump(path: Path) -> IO[str]:
+    if path.suffix == ".gz":
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+
+def iter_dump(paths: Iterable[Path]) -> Iterator[Dict[str, Any]]:
+    """
+    Stream synset records from dump files.
+
+    Supported files (optionally gzip-compressed):
+    - *.jsonl: one record per line
+    - *.json: a single record, or a list of records
+
+    A record is either a getSynset payload, or an object with "synset" (the
+    payload) and optional "id" and "edges" (a getOutgoingEdges payload).
+
+    Args:
+        paths: Dump files or directories containing them
+
+    Yields:
+        Records as {"id", "synset", "edges"} dictionaries
+    """
+    for path in paths:
+        if path.is_dir():
+            yield from iter_dump(sorted(p for p in path.rglob("*") if p.is_file()))
+            continue
+        name = path.name[:-3] if path.name.endswith(".gz") else path.name
+        with _open_dump(path) as f:
+            if name.endswith(".jsonl"):
+                raw_records: Iterable[Any] = (json.loads(line) for line in f if line.strip())
+            elif name.endswith(".json"):
+                data = json.load(f)
+                raw_records = data if isinstance(data, list) else [data]
+            else:
+                logger.debug(f"Skipping {path}: not a JSON dump")
+                continue
+            for raw in raw_records:
+                synset = raw.get("synset", raw)
+                sid = raw.get("id") or synset_id_of(synset)
+                if not sid:
+                    logger.warning(f"Skipping record without synset ID in {path}")
+                    continue
+                yield {"id": sid, "synset": synset, "edges": raw.get("edges")}
+
+
+class LocalSynsetStore:
+    """Embedded synset store with the lookup interface of BabelNetHTTPClient."""
+
+    def __init__(self, path: Path = DEFAULT_STORE_PATH) -> None:
+        """
+        Open (or create) the store.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS synsets (
+                id TEXT PRIMARY KEY,
+                pos TEXT,
+                source TEXT,
+                data TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS lemmas (
+                lemma TEXT NOT NULL,
+                lang TEXT NOT NULL,
+                pos TEXT NOT NULL,
+                synset_id TEXT NOT NULL,
+                rank INTEGER NOT NULL,
+                PRIMARY KEY (lemma, lang, pos, synset_id)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS edges (
+                synset_id TEXT PRIMARY KEY,
+                data TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS complete_langs (
+                lang TEXT PRIMARY KEY
+            );
+            """
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(synsets)")}
+        if "source" not in columns:
+            # Stores imported before the ID source was kept
+            self._conn.execute("ALTER TABLE synsets ADD COLUMN source TEXT")
+        self._complete = {
+            row[0] for row in self._conn.execute("SELECT lang FROM complete_langs")
+        }
+
+    # -- Import -----------------------------------------------------------
+
+    def add_synset(
+        self,
+        synset_id: str,
+        synset: Dict[str, Any],
+        edges: Optional[List[Dict[str, Any]]] = None,
+    ) -> None:
+        """Insert or replace one synset (and its edges) without committing."""
+        senses = synset.get("senses", [])
+        pos = ""
+        source = None
+        lemma_rows = []
+        for rank, sense in enumerate(senses):
+            props = sense.get("properties", {})
+            pos = pos or props.get("pos", "")
+            source = source or props.get("synsetID", {}).get("source")
+            lemma = props.get("lemma", {}).get("lemma") or props.get("fullLemma")
+            if not lemma:
+                continue
+            lemma_rows.append(
+                (lemma_key(lemma), props.get("language", ""), props.get("pos", ""), synset_id, rank)
+            )
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO synsets (id, pos, source, data) VALUES (?, ?, ?, ?)",
+                (
+                    synset_id, pos, source,
+                    json.dumps(synset, separators=(",", ":"), ensure_ascii=False),
+                ),
+            )
+            self._conn.execute("DELETE FROM lemmas WHERE synset_id = ?", (synset_id,))
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO lemmas (lemma, lang, pos, synset_id, rank) "
+                "VALUES (?, ?, ?, ?, ?)",
+                lemma_rows,
+            )
+            if edges is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO edges (synset_id, data) VALUES (?, ?)",
+                    (synset_id, json.dumps(edges, separators=(",", ":"), ensure_ascii=False)),
+                )
+
+    def import_dump(
+        self,
+        paths: Iterable[Path],
+        batch_size: int = 1000,
+        complete_langs: Optional[Iterable[str]] = None,
+    ) -> int:
+        """
+        Bulk-import synset dumps, committing in batches.
+
+        Args:
+            paths: Dump files or directories (see iter_dump)
+            batch_size: Number of synsets per transaction
+            complete_langs: Languages the dumps hold every synset of, whose
+                lemma lookups the store may then answer (see mark_complete)
+
+        Returns:
+            Number of synsets imported
+        """
+        count = 0
+        for record in iter_dump(paths):
+            self.add_synset(record["id"], record["synset"], record["edges"])
+            count += 1
+            if count % batch_size == 0:
+                self.commit()
+                logger.info(f"Imported {count} synsets...")
+        if complete_langs:
+            self.mark_complete(complete_langs)
+        self.commit()
+        return count
+
+    def mark_complete(self, langs: Iterable[str]) -> None:
+        """
+        Record that the store holds every synset of some languages, without committing.
+
+        Lemma lookups are answered locally only when all their search languages
+        are complete; otherwise a local match may miss synsets held upstream.
+        """
+        complete = {lang.upper() for lang in langs}
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO complete_langs (lang) VALUES (?)",
+                [(lang,) for lang in sorted(complete)],
+            )
+            self._complete |= complete
+
+    def is_complete(self, langs: Iterable[str]) -> bool:
+        """Whether the store holds every synset of all the given languages."""
+        wanted = {lang.upper() for lang in langs}
+        return bool(wanted) and wanted <= self._complete
+
+    def commit(self) -> None:
+        with self._lock:
+            self._conn.commit()
+
+    # -- Lookups (same interface as BabelNetHTTPClient) -------------------
+
+    def _lemma_rows(
+        self, lemma: str, search_langs: List[str], poses: Optional[List[str]]
+    ) -> List[Tuple[str, str, Optional[str], str]]:
+        langs = [lang.upper() for lang in search_langs]
+        query = (
+            "SELECT l.synset_id, s.pos, s.source, s.data "
+            "FROM lemmas l JOIN synsets s ON s.id = l.synset_id "
+            f"WHERE l.lemma = ? AND l.lang IN ({','.join('?' * len(langs))})"
+        )
+        args: List[Any] = [lemma_key(lemma), *langs]
+        if poses:
+            query += f" AND l.pos IN ({','.join('?' * len(poses))})"
+            args.extend(pos.upper() for pos in poses)
+        query += " ORDER BY l.rank, l.synset_id"
+        with self._lock:
+            return self._conn.execute(query, args).fetchall()
+
+    def get_synset_ids(
+        self,
+        lemma: str,
+        search_langs: List[str],
+        target_langs: Optional[List[str]] = None,
+        poses: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        seen: Dict[str, Dict[str, Any]] = {}
+        for sid, pos, source, _ in self._lemma_rows(lemma, search_langs, poses):
+            if sid in seen:
+                continue
+            entry: Dict[str, Any] = {"id": sid, "pos": pos}
+            if source:
+                # Left out for synsets imported before the ID source was kept
+                entry["source"] = source
+            seen[sid] = entry
+        return list(seen.values())
+
+    def get_synset(self, synset_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM synsets WHERE id = ?", (synset_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_senses(
+        self,
+        lemma: str,
+        search_langs: List[str],
+        target_langs: Optional[List[str]] = None,
+        poses: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        key = lemma_key(lemma)
+        langs = {lang.upper() for lang in search_langs}
+        senses: List[Dict[str, Any]] = []
+        done = set()
+        for sid, _, _, data in self._lemma_rows(lemma, search_langs, poses):
+            if sid in done:
+                continue
+            done.add(sid)
+            for sense in json.loads(data).get("senses", []):
+                props = sense.get("properties", {})
+                sense_lemma = props.get("lemma", {}).get("lemma") or props.get("fullLemma", "")
+                if props.get("language") in langs and lemma_key(sense_lemma) == key:
+                    senses.append(sense)
+        return senses
+
+    def get_outgoing_edges(
+        self, synset_id: str, pointer: Optional[str] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM edges WHERE synset_id = ?", (synset_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        edges: List[Dict[str, Any]] = json.loads(row[0])
+        if pointer:
+            edges = [
+                e for e in edges
+                if pointer in (
+                    e.get("pointer", {}).get("shortName"), e.get("pointer", {}).get("name")
+                )
+            ]
+        return edges
+
+    def lookup(self, path: str, params: Dict[str, Any]) -> Tuple[bool, Any]:
+        """
+        Answer a raw API request from the store.
+
+        Lemma lookups count as misses unless every search language is
+        complete (see mark_complete): a store holding part of a language
+        cannot tell whether a lemma has more synsets upstream. In complete
+        languages a lemma with no local match is answered with an empty list.
+        Synsets fetched with targetLang keep only those languages; getSenses
+        with targetLang is a miss, as translations are not indexed locally.
+
+        Args:
+            path: Endpoint path
+            params: Query parameters as sent by BabelNetHTTPClient
+
+        Returns:
+            Tuple (hit, value)
+        """
+        if path == "getSynset":
+            value: Any = self.get_synset(params["id"])
+            if value is not None and params.get("targetLang"):
+                # Keep only the requested languages, as the REST API does
+                value = project_synset(value, langs=params["targetLang"])
+        elif path == "getOutgoingEdges":
+            value = self.get_outgoing_edges(params["id"], params.get("pointer"))
+        elif path in ("getSynsetIds", "getSenses"):
+            search_langs = params.get("searchLang", [])
+            if not self.is_complete(search_langs):
+                return False, None
+            if path == "getSenses" and params.get("targetLang"):
+                # Translations into the target languages are not indexed locally
+                return False, None
+            lookup = self.get_synset_ids if path == "getSynsetIds" else self.get_senses
+            value = lookup(
+                params["lemma"], search_langs, params.get("targetLang"), params.get("pos")
+            )
+        else:
+            value = None
+        return value is not None, value
+
+    def stats(self) -> Dict[str, int]:
+        """Return row counts of the store."""
+        with self._lock:
+            return {
+                table: int(self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0])
+                for table in ("synsets", "lemmas", "edges", "complete_langs")
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,119 @@
+"""
+Advisory locks shared by all server processes on one host.
+
+MCP clients start one server process per session, and these processes share
+the persistent cache and the Babelcoin counter. A ProcessLock maps keys to
+byte ranges of a single lock file and locks them with fcntl, so a process
+fetching a synset holds only that synset's range and unrelated requests
+proceed in parallel. Locks are released by the OS if a process dies.
+
+On platforms without fcntl (Windows) locking is a no-op and each process
+behaves as before.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# Number of distinct byte ranges keys are hashed into
+DEFAULT_SLOTS = 1 << 16
+
+
+class ProcessLock:
+    """Per-key exclusive locks across processes, backed by one lock file."""
+
+    def __init__(self, path: Path, slots: int = DEFAULT_SLOTS, timeout: float = 30.0) -> None:
+        """
+        Initialize the lock.
+
+        Args:
+            path: Lock file (created if missing; its content is never written)
+            slots: Number of byte ranges keys are hashed into
+            timeout: Seconds to wait for a lock before going ahead without it
+        """
+        self.path = path
+        self.slots = slots
+        self.timeout = timeout
+        self.waits = 0
+        self.timeouts = 0
+        self._fd: Optional[int] = None
+        self._lock = threading.Lock()
+        if fcntl is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._fd = os.open(str(path), os.O_RDWR | os.O_CREAT, 0o644)
+        except OSError as e:
+            logger.warning(f"Cross-process locking unavailable ({path}): {e}")
+
+    @property
+    def enabled(self) -> bool:
+        return self._fd is not None
+
+    def _slot(self, key: str) -> int:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "big") % self.slots
+
+    @contextmanager
+    def hold(self, key: str = "", timeout: Optional[float] = None) -> Iterator[bool]:
+        """
+        Hold the lock of a key for the duration of the block.
+
+        fcntl locks belong to the process, so threads of one process do not
+        exclude each other here; callers deduplicate within the process first
+        (SingleFlight, threading locks).
+
+        Args:
+            key: Key to lock; the empty key locks the file as a whole
+            timeout: Override of the default wait
+
+        Yields:
+            True if the lock is held, False if locking is unavailable or timed out
+        """
+        if self._fd is None:
+            yield False
+            return
+        start, length = (self._slot(key), 1) if key else (0, 0)
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        delay = 0.005
+        acquired = False
+        waited = False
+        while True:
+            try:
+                fcntl.lockf(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB, length, start)
+                acquired = True
+                break
+            except OSError:
+                waited = True
+                if time.monotonic() >= deadline:
+                    break
+                time.sleep(delay)
+                delay = min(delay * 2, 0.1)
+        with self._lock:
+            self.waits += waited
+            if not acquired:
+                self.timeouts += 1
+        if not acquired:
+            logger.warning(f"Timed out waiting for the lock of {key or self.path}; proceeding")
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, length, start)
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
@@ -0,0 +1,338 @@
+"""
+Lightweight metrics for tools and BabelNet requests.
+
+Records per-tool and per-endpoint latency histograms, response sizes, JSON
+decode time, error classes, Babelcoins spent and cache hit/miss counts. Each
+observation is a bisect and a few additions under a lock, so instrumentation
+costs a couple of microseconds per call. Metrics are exposed as a snapshot
+dictionary (the babelnet://metrics resource), in the Prometheus text format
+and as a periodically written JSON file.
+"""
+
+import bisect
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+SIZE_BUCKETS = tuple(float(256 * 4 ** i) for i in range(9))  # 256 B .. 16 MB
+
+# Name of the tool being served, so upstream calls can be attributed to it
+current_tool: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "babelnet_current_tool", default="none"
+)
+
+
+class Histogram:
+    """Fixed-bucket histogram with Prometheus semantics."""
+
+    __slots__ = ("buckets", "counts", "count", "sum", "max", "_lock")
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+            if value > self.max:
+                self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile as the upper bound of the bucket containing it."""
+        with self._lock:
+            if self.count == 0:
+                return 0.0
+            rank = q * self.count
+            cumulative = 0
+            for bound, count in zip(self.buckets, self.counts):
+                cumulative += count
+                if cumulative >= rank:
+                    return min(bound, self.max)
+            return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        count = self.count
+        return {
+            "count": count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / count, 6) if count else 0.0,
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "max": round(self.max, 6),
+        }
+
+
+class _Family:
+    """Histograms or counters of one metric, keyed by label values."""
+
+    def __init__(self, labels: Tuple[str, ...], buckets: Optional[Sequence[float]] = None) -> None:
+        self.labels = labels
+        self.buckets = buckets
+        self.values: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, key: Tuple[str, ...], value: float) -> None:
+        histogram = self.values.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self.values.setdefault(key, Histogram(self.buckets or LATENCY_BUCKETS))
+        histogram.observe(value)
+
+    def inc(self, key: Tuple[str, ...], amount: int = 1) -> None:
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def items(self) -> List[Tuple[Tuple[str, ...], Any]]:
+        with self._lock:
+            return sorted(self.values.items())
+
+
+class Metrics:
+    """Registry of the server's metrics."""
+
+    def __init__(self) -> None:
+        self.started = time.time()
+        self._histograms: Dict[str, _Family] = {
+            "tool_seconds": _Family(("tool",)),
+            "request_seconds": _Family(("endpoint", "outcome")),
+            "upstream_seconds": _Family(("endpoint",)),
+            "response_bytes": _Family(("endpoint",), SIZE_BUCKETS),
+            "decode_seconds": _Family(("endpoint",)),
+            "backend_seconds": _Family(("backend", "outcome")),
+        }
+        self._counters: Dict[str, _Family] = {
+            "tool_errors": _Family(("tool", "error")),
+            "request_errors": _Family(("endpoint", "error")),
+            "cache_requests": _Family(("endpoint", "outcome")),
+            "coins_spent": _Family(("endpoint", "tool")),
+        }
+
+    # -- Recording --------------------------------------------------------
+
+    def observe_tool(
+        self, tool: str, seconds: float, error: Optional[BaseException] = None
+    ) -> None:
+        self._histograms["tool_seconds"].observe((tool,), seconds)
+        if error is not None:
+            self._counters["tool_errors"].inc((tool, type(error).__name__))
+
+    def observe_request(
+        self, endpoint: str, outcome: str, seconds: float, error: Optional[BaseException] = None
+    ) -> None:
+        """
+        Record one client request.
+
+        Args:
+            endpoint: Endpoint path
+            outcome: 'hit' (response cache), 'miss' (answered by a backend) or 'error'
+            seconds: Time spent in the client, including waits on coalesced calls
+            error: Exception raised, if any
+        """
+        self._histograms["request_seconds"].observe((endpoint, outcome), seconds)
+        self._counters["cache_requests"].inc((endpoint, outcome))
+        if error is not None:
+            self._counters["request_errors"].inc((endpoint, type(error).__name__))
+
+    def observe_upstream(
+        self, endpoint: str, seconds: float, size: int, decode_seconds: float
+    ) -> None:
+        self._histograms["upstream_seconds"].observe((endpoint,), seconds)
+        self._histograms["response_bytes"].observe((endpoint,), size)
+        self._histograms["decode_seconds"].observe((endpoint,), decode_seconds)
+
+    def observe_backend(self, backend: str, endpoint: str, outcome: str, seconds: float) -> None:
+        """Record one backend call; outcome is 'hit', 'miss', 'rejected' (4xx) or 'error'."""
+        self._histograms["backend_seconds"].observe((backend, outcome), seconds)
+
+    def record_coin(self, endpoint: str) -> None:
+        self._counters["coins_spent"].inc((endpoint, current_tool.get()))
+
+    # -- Export -----------------------------------------------------------
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return every metric as nested dictionaries keyed by label values."""
+        result: Dict[str, Any] = {"uptime_seconds": round(time.time() - self.started, 1)}
+        for name, family in self._histograms.items():
+            result[name] = {"/".join(key): h.snapshot() for key, h in family.items()}
+        for name, family in self._counters.items():
+            result[name] = {"/".join(key): value for key, value in family.items()}
+        outcomes = self._counters["cache_requests"].items()
+        served = sum(v for (_, outcome), v in outcomes if outcome == "hit")
+        total = sum(v for (_, outcome), v in outcomes if outcome != "error")
+        result["cache_hit_rate"] = round(served / total, 4) if total else 0.0
+        return result
+
+    def prometheus(self) -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for name, family in self._histograms.items():
+            metric = f"babelnet_{name}"
+            lines.append(f"# TYPE {metric} histogram")
+            for key, histogram in family.items():
+                labels = _labels(family.labels, key)
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+                lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                lines.append(f"{metric}_sum{{{labels}}} {histogram.sum:.6f}")
+                lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+        for name, family in self._counters.items():
+            metric = f"babelnet_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            for key, value in family.items():
+                lines.append(f"{metric}{{{_labels(family.labels, key)}}} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    return ",".join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values)
+    )
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def instrument_tool(metrics: Metrics, name: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Wrap a tool function to record its latency and errors.
+
+    The wrapper keeps the signature (functools.wraps), so FastMCP derives the
+    same input schema, and it stays a coroutine function for async tools.
+    """
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            token = current_tool.set(name)
+            start = time.perf_counter()
+            error: Optional[BaseException] = None
+            try:
+                return await fn(*args, **kwargs)
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                metrics.observe_tool(name, time.perf_counter() - start, error)
+                current_tool.reset(token)
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        token = current_tool.set(name)
+        start = time.perf_counter()
+        error: Optional[BaseException] = None
+        try:
+            return fn(*args, **kwargs)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            metrics.observe_tool(name, time.perf_counter() - start, error)
+            current_tool.reset(token)
+    return wrapper
+
+
+class InstrumentedMCP:
+    """
+    Proxy around a FastMCP server that instruments every tool registered through it.
+
+    Everything other than tool() is forwarded to the wrapped server.
+    """
+
+    def __init__(self, mcp: Any, metrics: Metrics) -> None:
+        self._mcp = mcp
+        self._metrics = metrics
+
+    def tool(self, *args: Any, **kwargs: Any) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        register = self._mcp.tool(*args, **kwargs)
+
+        def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+            name = kwargs.get("name") or fn.__name__
+            register(instrument_tool(self._metrics, name, fn))
+            return fn
+        return decorator
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._mcp, name)
+
+
+def serve_prometheus(metrics: Metrics, host: str, port: int) -> ThreadingHTTPServer:
+    """
+    Serve the metrics at http://host:port/metrics from a daemon thread.
+
+    Returns:
+        The running server
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 (http.server API)
+            if self.path.split("?")[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = metrics.prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            logger.debug(format % args)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="babelnet-metrics", daemon=True).start()
+    return server
+
+
+def dump_json(metrics: Metrics, path: Path) -> None:
+    """Write a metrics snapshot to a JSON file atomically."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, 'w') as f:
+        json.dump(metrics.snapshot(), f, indent=2)
+    os.replace(tmp, path)
+
+
+def start_json_dump(metrics: Metrics, path: Path, interval: float) -> threading.Event:
+    """
+    Write a metrics snapshot to a JSON file every interval seconds.
+
+    Returns:
+        An event that stops the dump thread when set
+    """
+    stop = threading.Event()
+
+    def run() -> None:
+        while not stop.wait(interval):
+            try:
+                dump_json(metrics, path)
+            except OSError as e:
+                logger.warning(f"Could not write metrics to {path}: {e}")
+
+    threading.Thread(target=run, name="babelnet-metrics-dump", daemon=True).start()
+    return stop
@@ -0,0 +1,372 @@
+"""
+Compact in-memory representation of BabelNet synsets.
+
+Raw getSynset payloads are nested dictionaries that repeat the same language
+tags, source names, POS tags and pointer descriptions in every entry, costing
+several KB per synset. The classes here use __slots__, keep only the fields the
+tools read, and share every repeated value: known tags are enum members, other
+tags are interned strings, and pointers are interned objects.
+
+The response cache keeps raw payloads, since most tools return them as they
+are. Synsets are built from them where many are read at once and only some
+fields matter: translate_word merges per-language payloads into one, and the
+gloss index reads its rows from one.
+"""
+
+import json
+import sys
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore[assignment]
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """Decode a JSON response body, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+class Language(str, Enum):
+    """Language tags of the supported languages (see LANGUAGE_MAP)."""
+
+    EN = "EN"
+    IT = "IT"
+    ES = "ES"
+    FR = "FR"
+    DE = "DE"
+    PT = "PT"
+    ZH = "ZH"
+    JA = "JA"
+    RU = "RU"
+    AR = "AR"
+    NL = "NL"
+    PL = "PL"
+    SV = "SV"
+    TR = "TR"
+    KO = "KO"
+
+
+class POS(str, Enum):
+    """Part-of-speech tags (see POS_MAP)."""
+
+    NOUN = "NOUN"
+    VERB = "VERB"
+    ADJECTIVE = "ADJECTIVE"
+    ADVERB = "ADVERB"
+
+
+class RelationGroup(str, Enum):
+    """Relation groups of edge pointers (RELATION_GROUPS, plus ANTONYM and OTHER)."""
+
+    HYPERNYM = "HYPERNYM"
+    HYPONYM = "HYPONYM"
+    MERONYM = "MERONYM"
+    HOLONYM = "HOLONYM"
+    ANTONYM = "ANTONYM"
+    OTHER = "OTHER"
+
+
+class Source(str, Enum):
+    """Sources of senses and glosses found in BabelNet 5+ responses."""
+
+    BABELNET = "BABELNET"
+    WN = "WN"
+    WN2020 = "WN2020"
+    OEWN = "OEWN"
+    OMWN = "OMWN"
+    IWN = "IWN"
+    WONEF = "WONEF"
+    WIKI = "WIKI"
+    WIKIDIS = "WIKIDIS"
+    WIKIRED = "WIKIRED"
+    WIKIDATA = "WIKIDATA"
+    WIKIDATA_ALIAS = "WIKIDATA_ALIAS"
+    WIKT = "WIKT"
+    WIKTLB = "WIKTLB"
+    WIKIQU = "WIKIQU"
+    WIKIQUREDI = "WIKIQUREDI"
+    OMWIKI = "OMWIKI"
+    MSTERM = "MSTERM"
+    GEONM = "GEONM"
+    VERBNET = "VERBNET"
+    FRAMENET = "FRAMENET"
+    SILVER = "SILVER"
+    MCR_EU = "MCR_EU"
+    MCR_GL = "MCR_GL"
+    MCR_CA = "MCR_CA"
+    MCR_ES = "MCR_ES"
+
+
+# Tags outside the enums, shared through sys.intern
+Tag = Union[str, Enum]
+
+
+def intern_tag(enum: Type[Enum], value: Any) -> Tag:
+    """
+    Return the shared object for a tag.
+
+    Args:
+        enum: Enum of known tags
+        value: Tag as found in the response
+
+    Returns:
+        The enum member, or the interned string for unknown tags
+    """
+    text = str(value or "").upper()
+    try:
+        return enum(text)
+    except ValueError:
+        return sys.intern(text)
+
+
+class Pointer:
+    """Relation type of an edge. Instances are interned, see Pointer.get."""
+
+    __slots__ = ("name", "short_name", "symbol", "group", "automatic")
+
+    _interned: Dict[Tuple[Any, ...], "Pointer"] = {}
+
+    def __init__(
+        self, name: str, short_name: str, symbol: str, group: Tag, automatic: bool
+    ) -> None:
+        self.name = name
+        self.short_name = short_name
+        self.symbol = symbol
+        self.group = group
+        self.automatic = automatic
+
+    @classmethod
+    def get(cls, data: Dict[str, Any]) -> "Pointer":
+        """Return the shared Pointer for a getOutgoingEdges pointer object."""
+        key = (
+            data.get("name", ""), data.get("shortName", ""), data.get("fSymbol", ""),
+            str(data.get("relationGroup", "")).upper(), bool(data.get("isAutomatic", False)),
+        )
+        pointer = cls._interned.get(key)
+        if pointer is None:
+            name, short_name, symbol, group, automatic = key
+            pointer = cls._interned.setdefault(key, cls(
+                sys.intern(name), sys.intern(short_name), sys.intern(symbol),
+                intern_tag(RelationGroup, group or "OTHER"), automatic,
+            ))
+        return pointer
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "shortName": self.short_name,
+            "fSymbol": self.symbol,
+            "relationGroup": str(self.group.value if isinstance(self.group, Enum) else self.group),
+            "isAutomatic": self.automatic,
+        }
+
+    def __repr__(self) -> str:
+        return f"Pointer({self.name!r})"
+
+
+class Edge:
+    """Outgoing edge of a synset."""
+
+    __slots__ = ("target", "pointer", "language", "weight")
+
+    def __init__(self, target: str, pointer: Pointer, language: Tag, weight: float) -> None:
+        self.target = target
+        self.pointer = pointer
+        self.language = language
+        self.weight = weight
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "Edge":
+        return cls(
+            sys.intern(str(data.get("target", ""))),
+            Pointer.get(data.get("pointer", {})),
+            intern_tag(Language, data.get("language")),
+            float(data.get("normalizedWeight") or data.get("weight") or 0),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "target": self.target,
+            "pointer": self.pointer.to_dict(),
+            "language": tag_text(self.language),
+            "normalizedWeight": self.weight,
+        }
+
+
+class Sense:
+    """Lexicalization of a synset in one language."""
+
+    __slots__ = ("lemma", "language", "source", "lemma_type")
+
+    def __init__(self, lemma: str, language: Tag, source: Tag, lemma_type: str) -> None:
+        self.lemma = lemma
+        self.language = language
+        self.source = source
+        self.lemma_type = lemma_type
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "Sense":
+        props = data.get("properties", data)
+        lemma = props.get("lemma", {})
+        return cls(
+            lemma.get("lemma") or props.get("fullLemma", ""),
+            intern_tag(Language, props.get("language")),
+            intern_tag(Source, props.get("source")),
+            sys.intern(str(lemma.get("type", ""))),
+        )
+
+
+class Gloss:
+    """Definition of a synset in one language."""
+
+    __slots__ = ("text", "language", "source")
+
+    def __init__(self, text: str, language: Tag, source: Tag) -> None:
+        self.text = text
+        self.language = language
+        self.source = source
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "Gloss":
+        return cls(
+            data.get("gloss", ""),
+            intern_tag(Language, data.get("language")),
+            intern_tag(Source, data.get("source")),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "language": tag_text(self.language),
+            "gloss": self.text,
+            "source": tag_text(self.source),
+        }
+
+
+class Synset:
+    """A BabelNet synset with its senses, glosses and (optionally) edges."""
+
+    __slots__ = ("id", "pos", "synset_type", "senses", "glosses", "edges")
+
+    def __init__(
+        self,
+        synset_id: str,
+        pos: Tag,
+        synset_type: str,
+        senses: Tuple[Sense, ...],
+        glosses: Tuple[Gloss, ...],
+        edges: Optional[Tuple[Edge, ...]] = None,
+    ) -> None:
+        self.id = synset_id
+        self.pos = pos
+        self.synset_type = synset_type
+        self.senses = senses
+        self.glosses = glosses
+        self.edges = edges
+
+    @classmethod
+    def from_json(
+        cls,
+        data: Dict[str, Any],
+        synset_id: Optional[str] = None,
+        edges: Optional[List[Dict[str, Any]]] = None,
+    ) -> "Synset":
+        """
+        Build a synset from a decoded getSynset payload.
+
+        Args:
+            data: getSynset response
+            synset_id: Synset ID (read from the senses when omitted)
+            edges: Optional getOutgoingEdges response for the synset
+
+        Returns:
+            The compact synset
+        """
+        raw_senses = data.get("senses", [])
+        first = raw_senses[0].get("properties", {}) if raw_senses else {}
+        sid = synset_id or data.get("id") or first.get("synsetID", {}).get("id", "")
+        return cls(
+            sys.intern(str(sid)),
+            intern_tag(POS, first.get("pos") or first.get("synsetID", {}).get("pos")),
+            sys.intern(str(data.get("synsetType", ""))),
+            tuple(Sense.from_json(sense) for sense in raw_senses),
+            tuple(Gloss.from_json(gloss) for gloss in data.get("glosses", [])),
+            parse_edges(edges) if edges is not None else None,
+        )
+
+    def lemmas(self, language: Optional[str] = None) -> List[str]:
+        """Distinct lemmas of the synset, optionally in one language."""
+        tag = language.upper() if language else None
+        seen: Dict[str, None] = {}
+        for sense in self.senses:
+            if tag is None or sense.language == tag:
+                seen.setdefault(sense.lemma)
+        return list(seen)
+
+    def glosses_in(self, language: str) -> List[str]:
+        """Gloss texts in one language."""
+        tag = language.upper()
+        return [gloss.text for gloss in self.glosses if gloss.language == tag]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize in the compact shape used by the tools (see shaping.compact_sense)."""
+        pos = tag_text(self.pos)
+        result: Dict[str, Any] = {
+            "id": self.id,
+            "pos": pos,
+            "synsetType": self.synset_type,
+            "senses": [
+                {
+                    "lemma": sense.lemma,
+                    "language": tag_text(sense.language),
+                    "pos": pos,
+                    "source": tag_text(sense.source),
+                    "synset_id": self.id,
+                }
+                for sense in self.senses
+            ],
+            "glosses": [gloss.to_dict() for gloss in self.glosses],
+        }
+        if self.edges is not None:
+            result["edges"] = [edge.to_dict() for edge in self.edges]
+        return result
+
+    def __repr__(self) -> str:
+        return f"Synset({self.id!r}, senses={len(self.senses)}, glosses={len(self.glosses)})"
+
+
+def tag_text(tag: Tag) -> str:
+    """Plain string of a tag, whether an enum member or an interned string."""
+    return str(tag.value) if isinstance(tag, Enum) else tag
+
+
+def parse_edges(data: Union[bytes, str, List[Dict[str, Any]]]) -> Tuple[Edge, ...]:
+    """Build edges from a getOutgoingEdges response body or decoded list."""
+    edges = loads(data) if isinstance(data, (bytes, bytearray, memoryview, str)) else data
+    return tuple(Edge.from_json(edge) for edge in edges or [])
+
+
+def parse_synset(
+    data: Union[bytes, str, Dict[str, Any]], synset_id: Optional[str] = None
+) -> Synset:
+    """
+    Build a synset from a getSynset response body.
+
+    The body is decoded into a dictionary first, so building a synset briefly
+    needs the memory of both.
+
+    Args:
+        data: Response bytes (or an already decoded payload)
+        synset_id: Synset ID (read from the senses when omitted)
+
+    Returns:
+        The compact synset
+    """
+    payload = loads(data) if isinstance(data, (bytes, bytearray, memoryview, str)) else data
+    return Synset.from_json(payload, synset_id)
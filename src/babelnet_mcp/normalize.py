@@ -0,0 +1,97 @@
+"""
+Lemma normalization ahead of BabelNet lookups.
+
+"Bank", "bank " and "bánk"-style decomposed spellings are the same query
+to BabelNet but different cache keys. Normalizing the lemma before it reaches
+the client makes them share one cache entry and one Babelcoin. An optional
+per-language table maps inflected forms to lemmas ("banks" -> "bank").
+"""
+
+import json
+import logging
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_lemma(lemma: str) -> str:
+    """
+    Normalize a lemma for lookups: Unicode NFC, trimmed and collapsed whitespace, lowercase.
+
+    str.lower() is used rather than str.casefold(): casefolding maps e.g. 'ß' to
+    'ss', which BabelNet does not treat as the same lemma.
+    """
+    return " ".join(unicodedata.normalize("NFC", lemma).split()).lower()
+
+
+class LemmaNormalizer:
+    """Normalizes lemmas and optionally lemmatizes them with a per-language table."""
+
+    def __init__(self, table: Optional[Dict[str, Dict[str, str]]] = None) -> None:
+        """
+        Initialize the normalizer.
+
+        Args:
+            table: Language tag -> {inflected form: lemma}
+        """
+        self.table: Dict[str, Dict[str, str]] = {}
+        for lang, forms in (table or {}).items():
+            self.table[lang.upper()] = {
+                normalize_lemma(form): normalize_lemma(lemma) for form, lemma in forms.items()
+            }
+
+    @classmethod
+    def from_file(cls, path: Path) -> "LemmaNormalizer":
+        """
+        Load a lemmatization table.
+
+        Supported formats:
+        - *.json: {"EN": {"banks": "bank", ...}, ...}
+        - anything else: tab-separated lines "LANG<TAB>form<TAB>lemma" ('#' starts a comment)
+
+        Args:
+            path: Table file
+
+        Returns:
+            The normalizer
+        """
+        table: Dict[str, Dict[str, str]] = {}
+        with open(path, 'r', encoding='utf-8') as f:
+            if path.suffix == ".json":
+                table = json.load(f)
+            else:
+                for number, line in enumerate(f, 1):
+                    line = line.split("#", 1)[0].strip()
+                    if not line:
+                        continue
+                    fields = line.split("\t")
+                    if len(fields) != 3:
+                        logger.warning(f"{path}:{number}: expected LANG<TAB>form<TAB>lemma")
+                        continue
+                    lang, form, lemma = fields
+                    table.setdefault(lang.upper(), {})[form] = lemma
+        normalizer = cls(table)
+        count = sum(len(forms) for forms in normalizer.table.values())
+        logger.info(f"Loaded {count} lemma forms from {path}")
+        return normalizer
+
+    def __call__(self, lemma: str, search_langs: Optional[List[str]] = None) -> str:
+        """
+        Normalize a lemma for the given search languages.
+
+        Args:
+            lemma: Lemma as given by the caller
+            search_langs: Language tags of the lookup; the first one whose table
+                lists the lemma decides its base form
+
+        Returns:
+            The normalized lemma
+        """
+        key = normalize_lemma(lemma)
+        for lang in search_langs or []:
+            base = self.table.get(lang.upper(), {}).get(key)
+            if base is not None:
+                return base
+        return key
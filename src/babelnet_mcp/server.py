@@ -1,7 +1,11 @@
 import argparse
+import asyncio
+import json
 import logging
 import sys
-from typing import Optional
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 try:
     from mcp.server.fastmcp import FastMCP
@@ -9,15 +13,18 @@ except ImportError:
     print("Error: mcp package not installed. Run: pip install mcp")
     sys.exit(1)
 
+from .budget import BudgetManager
+from .cache import ResponseCache
 from .config import config
 from .http_client import BabelNetHTTPClient
-from .tools import (
-    register_definition_tool,
-    register_synset_tools,
-    register_sense_tools
-)
 from .constants import LANGUAGE_MAP, POS_MAP
 
+if TYPE_CHECKING:
+    from .gloss_index import GlossIndex
+    from .local_store import LocalSynsetStore
+    from .normalize import LemmaNormalizer
+    from .snapshot import SnapshotReader
+
 
 # Configure logging
 logging.basicConfig(
@@ -40,15 +47,369 @@ def check_configuration() -> bool:
     return config.is_configured()
 
 
-def register_all_tools(client: BabelNetHTTPClient) -> None:
-    """Register all MCP tools."""
+def build_cache(cache_path: Optional[str] = None, enabled: bool = True) -> Optional[ResponseCache]:
+    """Create the response cache from configuration and CLI overrides."""
+    if not enabled or not config.cache_enabled:
+        logger.info("Response cache disabled")
+        return None
+    path = Path(cache_path).expanduser() if cache_path else config.cache_path
+    cache = ResponseCache(
+        path=path,
+        max_bytes=config.cache_max_mb * 1024 * 1024,
+        memory_max_bytes=config.cache_memory_max_mb * 1024 * 1024,
+        negative_ttl=config.negative_cache_ttl,
+    )
+    logger.info(f"Response cache enabled ({path or 'default location'})")
+    return cache
+
+
+def build_budget(daily_limit: Optional[int] = None) -> BudgetManager:
+    """Create the Babelcoin budget manager from configuration and CLI overrides."""
+    return BudgetManager(
+        daily_limit=daily_limit or config.daily_coin_limit,
+        rate=config.rate_limit_per_second,
+        burst=config.rate_limit_burst,
+        reserve=config.coin_reserve,
+        low_threshold=config.low_budget_threshold,
+        low_budget_max_definitions=config.low_budget_max_definitions,
+    )
+
+
+def build_local_store(store_path: Optional[str] = None) -> Optional["LocalSynsetStore"]:
+    """Open the local synset store if one is configured."""
+    path = Path(store_path).expanduser() if store_path else config.local_store_path
+    if path is None:
+        return None
+    if not path.exists():
+        logger.warning(f"Local synset store {path} not found; using the REST API only")
+        return None
+    from .local_store import LocalSynsetStore
+
+    logger.info(f"Local synset store enabled ({path})")
+    return LocalSynsetStore(path)
+
+
+def run_import_dump(args: argparse.Namespace) -> None:
+    """Bulk-import BabelNet JSON dumps into the local synset store."""
+    from .local_store import DEFAULT_STORE_PATH, LocalSynsetStore
+
+    path = Path(args.store).expanduser() if args.store else (
+        config.local_store_path or DEFAULT_STORE_PATH
+    )
+    store = LocalSynsetStore(path)
+    logger.info(f"Importing synset dumps into {path}...")
+    count = store.import_dump([Path(p) for p in args.paths], complete_langs=args.complete_langs)
+    logger.info(f"✅ Imported {count} synsets ({store.stats()['lemmas']} lemma entries)")
+    if args.complete_langs:
+        logger.info(f"Lemma lookups in {', '.join(args.complete_langs)} are answered locally")
+    store.close()
+
+
+def build_snapshot(cache: Optional[ResponseCache] = None) -> Optional["SnapshotReader"]:
+    """
+    Open the configured cache snapshot, served lazily in front of the REST API.
+
+    A snapshot from another BabelNet release than the cache holds is not used
+    (the live release is checked again before the first fetch).
+    """
+    if config.snapshot_path is None:
+        return None
+    from .snapshot import SnapshotError, SnapshotReader
+
+    try:
+        reader = SnapshotReader(config.snapshot_path)
+    except (OSError, SnapshotError) as e:
+        logger.warning(f"Cache snapshot unavailable ({config.snapshot_path}): {e}")
+        return None
+    current = cache.babelnet_version() if cache is not None else None
+    if current and current != reader.babelnet_version:
+        logger.warning(
+            f"Cache snapshot {config.snapshot_path} is from BabelNet {reader.babelnet_version} "
+            f"but the cache holds {current}; not using it"
+        )
+        reader.close()
+        return None
+    logger.info(
+        f"Serving {len(reader)} responses from snapshot {config.snapshot_path} "
+        f"(BabelNet {reader.babelnet_version})"
+    )
+    return reader
+
+
+def run_snapshot(args: argparse.Namespace) -> None:
+    """Export the response cache to a snapshot file, or import one into it."""
+    from .snapshot import SnapshotError, SnapshotReader, export_cache, import_snapshot
+
+    cache = build_cache(args.cache_path)
+    if cache is None:
+        logger.error("Snapshots need the response cache; enable CACHE_ENABLED")
+        sys.exit(1)
+    path = Path(args.path).expanduser()
+
+    if args.snapshot_command == "export":
+        version = args.babelnet_version or cache.babelnet_version()
+        if not version:
+            logger.error(
+                "The cache does not record its BabelNet version; run one query through the "
+                "server, or pass --babelnet-version"
+            )
+            sys.exit(1)
+        header = export_cache(cache, path, version, chunk_bytes=args.chunk_kb * 1024)
+        logger.info(
+            f"✅ Exported {header['entries']} responses in {header['chunks']} chunks to {path} "
+            f"(BabelNet {version}, {header['compression']}/{header['encoding']}, "
+            f"{path.stat().st_size / 2 ** 20:.1f} MB)"
+        )
+        return
+
+    try:
+        reader = SnapshotReader(path)
+    except (OSError, SnapshotError) as e:
+        logger.error(f"Cannot read snapshot: {e}")
+        sys.exit(1)
+    if args.snapshot_command == "info":
+        print(json.dumps(reader.header, indent=2))
+        reader.close()
+        return
+    current = cache.babelnet_version()
+    if current and current != reader.babelnet_version and not args.force:
+        logger.error(
+            f"Snapshot is from BabelNet {reader.babelnet_version} but the cache holds "
+            f"{current}; pass --force to replace the cache contents"
+        )
+        sys.exit(1)
+    # Adopting the snapshot's version clears a cache holding another release
+    cache.sync_version(reader.babelnet_version)
+    counts = import_snapshot(cache, reader, overwrite=args.overwrite)
+    reader.close()
+    logger.info(
+        f"✅ Imported {counts['imported']} responses from {path} "
+        f"({counts['skipped']} already cached)"
+    )
+
+
+def build_gloss_index(index_path: Optional[str] = None) -> Optional["GlossIndex"]:
+    """Open the gloss search index unless it is disabled."""
+    if not config.gloss_index_enabled and not index_path:
+        return None
+    import sqlite3
+
+    from .gloss_index import DEFAULT_INDEX_PATH, GlossIndex
+
+    path = Path(index_path).expanduser() if index_path else (
+        config.gloss_index_path or DEFAULT_INDEX_PATH
+    )
+    try:
+        return GlossIndex(path)
+    except sqlite3.Error as e:
+        logger.warning(f"Gloss index unavailable ({path}): {e}")
+        return None
+
+
+def run_rebuild_index(args: argparse.Namespace) -> None:
+    """Index the glosses of cached synsets and/or dumps."""
+    from .local_store import iter_dump
+
+    index = build_gloss_index(args.index)
+    if index is None:
+        logger.error("Could not open the gloss index")
+        sys.exit(1)
+    if args.clear:
+        index.clear()
+    count = 0
+    if not args.no_cache:
+        cache = build_cache(args.cache_path)
+        if cache is not None:
+            logger.info("Indexing cached synsets...")
+            count += index.add_many(
+                (params["id"], value) for params, value in cache.responses("getSynset")
+                if isinstance(value, dict)
+            )
+    if args.paths:
+        logger.info("Indexing synset dumps...")
+        count += index.add_many(
+            (record["id"], record["synset"]) for record in iter_dump(Path(p) for p in args.paths)
+        )
+    stats = index.stats()
+    logger.info(
+        f"✅ Indexed {count} synsets (index: {stats['synsets']} synsets, {stats['rows']} rows)"
+    )
+    index.close()
+
+
+def build_normalizer() -> "LemmaNormalizer":
+    """Create the lemma normalizer, with the configured lemmatization table if any."""
+    from .normalize import LemmaNormalizer
+
+    if config.lemma_table is None:
+        return LemmaNormalizer()
+    try:
+        return LemmaNormalizer.from_file(config.lemma_table)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not load lemma table {config.lemma_table}: {e}")
+        return LemmaNormalizer()
+
+
+def mirror_urls(rest_url: Optional[str] = None) -> List[str]:
+    """
+    Collect the self-hosted BabelNet services to use before the public API.
+
+    RESTFUL_URL (or --rest-url) and RPC_URL are used when they are HTTP(S) URLs of
+    a REST-compatible mirror. The public endpoint is always the last fallback.
+    """
+    from urllib.parse import urlsplit
+
+    from .backends import is_public_url
+
+    urls = []
+    for name, url in (("RESTFUL_URL", rest_url or config.rest_url), ("RPC_URL", config.rpc_url)):
+        if not url:
+            continue
+        if urlsplit(url).scheme not in ("http", "https"):
+            logger.warning(
+                f"{name} {url}: only HTTP(S) REST services are supported, ignoring it"
+            )
+        elif is_public_url(url):
+            logger.debug(f"{name} points at the public API, which is already used as fallback")
+        elif url not in urls:
+            urls.append(url)
+    return urls
+
+
+def build_client(args: argparse.Namespace, budget: BudgetManager) -> BabelNetHTTPClient:
+    """Create the HTTP client with its cache, budget and local store."""
+    api_key = args.api_key or config.api_key
+    if not api_key:
+        logger.error(
+            "Missing BabelNet API key. Pass via --api-key or set RESTFUL_KEY in babelnet_conf.yml"
+        )
+        sys.exit(1)
+    concurrency = args.max_concurrency or config.max_concurrency
+    cache = build_cache(args.cache_path, not args.no_cache)
+    return BabelNetHTTPClient(
+        api_key,
+        cache=cache,
+        budget=budget,
+        local_store=build_local_store(args.local_store),
+        pool_size=max(config.pool_size, concurrency),
+        connect_timeout=config.connect_timeout,
+        read_timeout=config.read_timeout,
+        max_retries=config.max_retries,
+        backoff_base=config.retry_backoff,
+        mirror_urls=mirror_urls(args.rest_url),
+        normalizer=build_normalizer(),
+        gloss_index=build_gloss_index(),
+        snapshot=build_snapshot(cache),
+        selective_decode=config.selective_decode,
+        stream_decode=config.stream_decode,
+    )
+
+
+def warm_cache(
+    client: BabelNetHTTPClient,
+    seeds_path: Optional[str],
+    coins: int,
+    from_cache: int = 0,
+    langs: Optional[List[str]] = None,
+    neighbors: bool = True,
+) -> Dict[str, Any]:
+    """Prefetch seed concepts (from a file and/or the cache's hottest entries)."""
+    from .warmup import Prefetcher, read_seed_file, seeds_from_cache
+
+    seeds = read_seed_file(Path(seeds_path).expanduser()) if seeds_path else []
+    if from_cache:
+        seeds += [s for s in seeds_from_cache(client, from_cache) if s not in seeds]
+    logger.info(f"Warming cache for {len(seeds)} seeds (budget: {coins} Babelcoins)...")
+    prefetcher = Prefetcher(client, coins, search_langs=langs, neighbors=neighbors)
+    summary = asyncio.run(prefetcher.run(seeds))
+    logger.info(f"✅ Cache warm-up done: {summary}")
+    return summary
+
+
+def run_warm(args: argparse.Namespace) -> None:
+    """Warm the response cache and exit."""
+    if args.no_cache or not config.cache_enabled:
+        logger.error("Cache warm-up needs the response cache; remove --no-cache")
+        sys.exit(1)
+    client = build_client(args, build_budget(args.daily_limit))
+    if not args.seeds and not args.from_cache:
+        logger.error("Nothing to warm: pass --seeds and/or --from-cache")
+        sys.exit(1)
+    warm_cache(
+        client, args.seeds, args.coins, args.from_cache,
+        [LANGUAGE_MAP.get(lang.lower(), lang).upper() for lang in args.langs],
+        not args.no_neighbors,
+    )
+
+
+def validate_client(client: BabelNetHTTPClient, mode: str) -> None:
+    """
+    Check the API key according to the startup validation mode.
+
+    Args:
+        client: Client to validate
+        mode: 'lazy' (no request), 'version' (getVersion, cached) or 'probe' (test query)
+    """
+    if mode == "lazy":
+        logger.info("API key and BabelNet version will be checked on the first request")
+        return
+
+    if mode == "probe":
+        response = client.get_synset_ids("babelnet", [LANGUAGE_MAP.get("en", "en").upper()])
+        if isinstance(response, list):
+            logger.info(f"✅ BabelNet API key validated successfully")
+            logger.info(f"   Test query returned {len(response)} synset(s)")
+
+    # Also drops cached responses from a previous BabelNet release
+    version = client.get_version()
+    logger.info(f"✅ BabelNet version: {version.get('version', 'unknown')}")
+
+
+def register_all_tools(client: BabelNetHTTPClient, max_concurrency: Optional[int] = None) -> None:
+    """Register all MCP tools, instrumented with the client's metrics."""
+    from .async_client import AsyncBabelNetClient
+    from .metrics import InstrumentedMCP
+    from .tools import (
+        register_definition_tool,
+        register_synset_tools,
+        register_sense_tools,
+        register_budget_tools,
+        register_relation_tools,
+        register_stats_tools,
+        register_translate_tools,
+        register_search_tools
+    )
+
     logger.info("Registering BabelNet MCP tools...")
-    register_definition_tool(mcp, client)
-    register_synset_tools(mcp, client)
-    register_sense_tools(mcp, client)
+    async_client = AsyncBabelNetClient(client, max_concurrency or config.max_concurrency)
+    server = InstrumentedMCP(mcp, client.metrics)
+    register_definition_tool(server, client, async_client)
+    register_synset_tools(server, client, async_client)
+    register_sense_tools(server, client, async_client)
+    register_relation_tools(server, client, async_client)
+    register_translate_tools(server, client, async_client)
+    register_search_tools(server, client)
+    register_budget_tools(server, client)
+    register_stats_tools(server, client)
     logger.info("All tools registered successfully")
 
 
+def start_metrics_exporters(
+    client: BabelNetHTTPClient, host: str, port: Optional[int], dump_path: Optional[str]
+) -> None:
+    """Start the optional Prometheus endpoint and periodic JSON dump."""
+    from .metrics import serve_prometheus, start_json_dump
+
+    port = port or config.metrics_port
+    if port:
+        serve_prometheus(client.metrics, host, port)
+        logger.info(f"   Prometheus metrics on http://{host}:{port}/metrics")
+    path = Path(dump_path).expanduser() if dump_path else config.metrics_dump_path
+    if path:
+        start_json_dump(client.metrics, path, config.metrics_dump_interval)
+        logger.info(f"   Writing metrics to {path} every {config.metrics_dump_interval:g}s")
+
+
 def main() -> None:
     """Main entry point for the BabelNet MCP server."""
 
@@ -60,42 +421,217 @@ def main() -> None:
         help="BabelNet RESTful API key (used instead of config file)",
         required=False
     )
+    parser.add_argument(
+        "--cache-path",
+        type=str,
+        help="Path of the persistent response cache (default: ~/.babelnet/cache.sqlite)",
+        required=False
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the response cache"
+    )
+    parser.add_argument(
+        "--daily-limit",
+        type=int,
+        help="Daily Babelcoin allowance of the API key (default: 1000)",
+        required=False
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        help="Maximum number of parallel requests to BabelNet (default: 8)",
+        required=False
+    )
+    parser.add_argument(
+        "--validate",
+        choices=["lazy", "version", "probe"],
+        default="lazy",
+        help=(
+            "How to check the API key at startup: 'lazy' defers it to the first real "
+            "request (default), 'version' calls getVersion (free when cached), "
+            "'probe' runs a test query (costs 1 Babelcoin)"
+        )
+    )
+    parser.add_argument(
+        "--transport",
+        choices=["stdio", "sse", "streamable-http"],
+        default="stdio",
+        help=(
+            "MCP transport (default: stdio). With 'sse' or 'streamable-http' one "
+            "process serves many sessions sharing its cache, connections and budget"
+        )
+    )
+    parser.add_argument(
+        "--host",
+        type=str,
+        default="127.0.0.1",
+        help="Host to bind for HTTP transports (default: 127.0.0.1)"
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8000,
+        help="Port to bind for HTTP transports (default: 8000)"
+    )
+    parser.add_argument(
+        "--local-store",
+        type=str,
+        help="Path of the local synset store (overrides LOCAL_STORE)",
+        required=False
+    )
+    parser.add_argument(
+        "--rest-url",
+        type=str,
+        help="Self-hosted BabelNet REST mirror tried before the public API (overrides RESTFUL_URL)",
+        required=False
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        help="Serve Prometheus metrics on this port (overrides METRICS_PORT)",
+        required=False
+    )
+    parser.add_argument(
+        "--metrics-dump",
+        type=str,
+        help="Periodically write a JSON metrics snapshot to this file "
+             "(overrides METRICS_DUMP_PATH)",
+        required=False
+    )
+    subparsers = parser.add_subparsers(dest="command")
+    import_parser = subparsers.add_parser(
+        "import-dump", help="Import BabelNet JSON dumps into the local synset store"
+    )
+    import_parser.add_argument(
+        "paths", nargs="+", help="Dump files (.json/.jsonl, optionally .gz) or directories"
+    )
+    import_parser.add_argument(
+        "--store", type=str, help="Store to import into (default: LOCAL_STORE)", required=False
+    )
+    import_parser.add_argument(
+        "--complete-langs", nargs="+", metavar="LANG",
+        help="Languages the dumps hold every synset of; lemma lookups in them are "
+             "answered locally instead of by the REST API"
+    )
+    warm_parser = subparsers.add_parser(
+        "warm", help="Prefetch hot concepts and their neighbors into the response cache"
+    )
+    warm_parser.add_argument(
+        "--seeds", type=str, help="File with one lemma or synset ID per line", required=False
+    )
+    warm_parser.add_argument(
+        "--from-cache", type=int, default=0,
+        help="Also reuse the N most frequently hit cache entries as seeds"
+    )
+    warm_parser.add_argument(
+        "--coins", type=int, default=100, help="Maximum Babelcoins to spend (default: 100)"
+    )
+    warm_parser.add_argument(
+        "--langs", nargs="+", default=["en"], help="Languages used to resolve lemma seeds"
+    )
+    warm_parser.add_argument(
+        "--no-neighbors", action="store_true", help="Do not prefetch 1-hop neighbors"
+    )
+    index_parser = subparsers.add_parser(
+        "rebuild-index", help="Index the glosses of cached synsets and dumps for search_glosses"
+    )
+    index_parser.add_argument(
+        "paths", nargs="*", help="Dump files (.json/.jsonl, optionally .gz) or directories"
+    )
+    index_parser.add_argument(
+        "--index", type=str, help="Index to fill (default: GLOSS_INDEX_PATH)", required=False
+    )
+    index_parser.add_argument(
+        "--clear", action="store_true", help="Empty the index before rebuilding it"
+    )
+    snapshot_parser = subparsers.add_parser(
+        "snapshot", help="Export the response cache to a portable snapshot, or import one"
+    )
+    snapshot_commands = snapshot_parser.add_subparsers(dest="snapshot_command", required=True)
+    export_parser = snapshot_commands.add_parser("export", help="Write the cache to a snapshot")
+    export_parser.add_argument("path", help="Snapshot file to write")
+    export_parser.add_argument(
+        "--babelnet-version", type=str, required=False,
+        help="Version tag (default: the BabelNet version recorded by the cache)"
+    )
+    export_parser.add_argument(
+        "--chunk-kb", type=int, default=256, help="Uncompressed size of a chunk (default: 256)"
+    )
+    snapshot_import_parser = snapshot_commands.add_parser(
+        "import", help="Load a snapshot into the cache"
+    )
+    snapshot_import_parser.add_argument("path", help="Snapshot file to read")
+    snapshot_import_parser.add_argument(
+        "--force", action="store_true",
+        help="Import even if the cache holds another BabelNet version (clears it)"
+    )
+    snapshot_import_parser.add_argument(
+        "--overwrite", action="store_true", help="Replace responses the cache already holds"
+    )
+    info_parser = snapshot_commands.add_parser("info", help="Show a snapshot's header")
+    info_parser.add_argument("path", help="Snapshot file to read")
     args = parser.parse_args()
 
-    logger.info("🚀 Starting BabelNet MCP Server...")
-    logger.info("⚠️  NOTE: Each query consumes 1 Babelcoin (limit: 1000/day)")
+    if args.command == "import-dump":
+        run_import_dump(args)
+        return
+    if args.command == "warm":
+        run_warm(args)
+        return
+    if args.command == "rebuild-index":
+        run_rebuild_index(args)
+        return
+    if args.command == "snapshot":
+        run_snapshot(args)
+        return
 
-    # --- Determine which API key to use ---
-    api_key = args.api_key or config.api_key
-    if not api_key:
-        logger.error(
-            "Missing BabelNet API key. Pass via --api-key or set RESTFUL_KEY in babelnet_conf.yml"
-        )
-        sys.exit(1)
+    logger.info("🚀 Starting BabelNet MCP Server...")
+    budget = build_budget(args.daily_limit)
+    logger.info(
+        f"⚠️  NOTE: Each query consumes 1 Babelcoin "
+        f"(limit: {budget.daily_limit}/day, remaining today: {budget.remaining()})"
+    )
 
-    # --- Validate API key by calling getVersion ---
+    # --- Validate API key ---
+    client = build_client(args, budget)
     try:
-        client = BabelNetHTTPClient(api_key)
-
-        response = client.get_synset_ids("babelnet",[LANGUAGE_MAP.get("en", "en").upper()])
-        if isinstance(response, list):
-            logger.info(f"✅ BabelNet API key validated successfully")
-            logger.info(f"   Test query returned {len(response)} synset(s)")
-
+        validate_client(client, args.validate)
     except Exception as e:
         logger.error(f"❌ Failed to validate BabelNet API key or reach API: {e}")
         sys.exit(1)
 
     # --- Register MCP tools ---
     try:
-        register_all_tools(client)
+        register_all_tools(client, args.max_concurrency)
     except Exception as e:
         logger.error(f"Error registering tools: {e}")
         sys.exit(1)
 
+    # --- Export metrics ---
+    try:
+        start_metrics_exporters(client, args.host, args.metrics_port, args.metrics_dump)
+    except OSError as e:
+        logger.error(f"Could not start metrics exporter: {e}")
+        sys.exit(1)
+
+    # --- Warm the cache in the background ---
+    if config.warmup_seeds and client.cache is not None:
+        threading.Thread(
+            target=warm_cache,
+            args=(client, str(config.warmup_seeds), config.warmup_coins),
+            name="babelnet-warmup",
+            daemon=True,
+        ).start()
+
     # --- Run server ---
+    if args.transport != "stdio":
+        mcp.settings.host = args.host
+        mcp.settings.port = args.port
+        logger.info(f"   Serving {args.transport} on http://{args.host}:{args.port}")
     logger.info("✅ Server ready - waiting for connections...")
-    mcp.run()
+    mcp.run(transport=args.transport)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,169 @@
+"""
+Field projection and compact shaping of large BabelNet payloads.
+
+getSynset and getSenses responses carry senses, glosses and examples in every
+language plus images and categories. These helpers keep only what the caller
+asked for in a single pass. Kept entries are shared with the input, not copied.
+"""
+
+from typing import AbstractSet, Any, Dict, Iterable, List, Optional, Set
+
+# Top-level getSynset fields holding per-language entries
+LANGUAGE_LISTS = ("senses", "glosses", "examples", "categories")
+
+
+def _upper_set(values: Optional[Iterable[str]]) -> Optional[Set[str]]:
+    return {value.upper() for value in values} if values else None
+
+
+def _entry_language(field: str, entry: Dict[str, Any]) -> str:
+    if field == "senses":
+        return str(entry.get("properties", {}).get("language", ""))
+    return str(entry.get("language", ""))
+
+
+def _entry_source(field: str, entry: Dict[str, Any]) -> str:
+    if field == "senses":
+        return str(entry.get("properties", {}).get("source", ""))
+    return str(entry.get("source", ""))
+
+
+def compact_sense(sense: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a BabelSense to its lemma, language, POS, source and synset ID."""
+    props = sense.get("properties", sense)
+    return {
+        "lemma": props.get("lemma", {}).get("lemma") or props.get("fullLemma", ""),
+        "language": props.get("language", ""),
+        "pos": props.get("pos", ""),
+        "source": props.get("source", ""),
+        "synset_id": props.get("synsetID", {}).get("id", ""),
+    }
+
+
+def compact_gloss(gloss: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a gloss to its text, language and source."""
+    return {
+        "language": gloss.get("language", ""),
+        "gloss": gloss.get("gloss", ""),
+        "source": gloss.get("source", ""),
+    }
+
+
+def filter_entries(
+    field: str,
+    entries: List[Dict[str, Any]],
+    langs: Optional[AbstractSet[str]] = None,
+    sources: Optional[AbstractSet[str]] = None,
+    limit: Optional[int] = None,
+    compact: bool = False,
+) -> List[Any]:
+    """
+    Filter a list of per-language entries in one pass.
+
+    Args:
+        field: Name of the list ('senses', 'glosses', ...), selects how entries are read
+        entries: Entries to filter
+        langs: Uppercase language tags to keep (None keeps all)
+        sources: Uppercase source names to keep (None keeps all)
+        limit: Maximum number of entries to keep
+        compact: Reduce senses and glosses to their essential fields
+
+    Returns:
+        The kept entries, in input order
+    """
+    kept: List[Any] = []
+    for entry in entries:
+        if limit is not None and len(kept) >= limit:
+            break
+        if langs is not None and _entry_language(field, entry).upper() not in langs:
+            continue
+        if sources is not None and _entry_source(field, entry).upper() not in sources:
+            continue
+        if compact and field == "senses":
+            kept.append(compact_sense(entry))
+        elif compact and field == "glosses":
+            kept.append(compact_gloss(entry))
+        else:
+            kept.append(entry)
+    return kept
+
+
+def project_synset(
+    synset: Dict[str, Any],
+    fields: Optional[List[str]] = None,
+    langs: Optional[List[str]] = None,
+    sources: Optional[List[str]] = None,
+    max_senses: Optional[int] = None,
+    compact: bool = False,
+) -> Dict[str, Any]:
+    """
+    Project a getSynset payload.
+
+    Args:
+        synset: Raw getSynset response
+        fields: Top-level fields to keep (None keeps all, or the compact set if compact)
+        langs: Languages to keep in senses, glosses, examples and categories
+        sources: Sources to keep in senses and glosses (e.g. 'WN', 'WIKI')
+        max_senses: Maximum number of senses to keep
+        compact: Keep only senses, glosses and the synset type, in reduced form
+
+    Returns:
+        The projected synset
+    """
+    if fields is None and compact:
+        fields = ["senses", "glosses", "synsetType"]
+    lang_set = _upper_set(langs)
+    source_set = _upper_set(sources)
+    result: Dict[str, Any] = {}
+    for field in fields if fields is not None else list(synset):
+        if field not in synset:
+            continue
+        value = synset[field]
+        if field in LANGUAGE_LISTS and isinstance(value, list):
+            value = filter_entries(
+                field,
+                value,
+                langs=lang_set,
+                sources=source_set if field in ("senses", "glosses") else None,
+                limit=max_senses if field == "senses" else None,
+                compact=compact,
+            )
+        result[field] = value
+    return result
+
+
+def project_senses(
+    senses: List[Dict[str, Any]],
+    langs: Optional[List[str]] = None,
+    sources: Optional[List[str]] = None,
+    max_senses: Optional[int] = None,
+    compact: bool = False,
+) -> List[Any]:
+    """
+    Project a getSenses payload.
+
+    Args:
+        senses: Raw getSenses response
+        langs: Languages to keep
+        sources: Sources to keep (e.g. 'WN', 'WIKI')
+        max_senses: Maximum number of senses to keep
+        compact: Reduce each sense to its essential fields
+
+    Returns:
+        The kept senses
+    """
+    return filter_entries(
+        "senses", senses, _upper_set(langs), _upper_set(sources), max_senses, compact
+    )
+
+
+def view_key(**options: Any) -> Dict[str, Any]:
+    """Describe a projection as cache-key parameters, dropping unset options."""
+    view: Dict[str, Any] = {}
+    for name, value in options.items():
+        if value is None or value is False:
+            continue
+        if isinstance(value, (list, tuple)):
+            value = sorted(str(v).upper() if name != "fields" else str(v) for v in value)
+        view[name] = value
+    return view
@@ -0,0 +1,136 @@
+"""
+Single-flight deduplication of identical in-flight BabelNet calls.
+
+While a call for a given key is running, further callers with the same key
+wait for it and share its result (or its exception) instead of issuing their
+own upstream request.
+"""
+
+import asyncio
+import threading
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class _Call:
+    """A call in flight, shared by its leader and any waiters."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class _Flight:
+    """An async call in flight, and how many tasks are awaiting it."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Future[Any]") -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key, for threads and asyncio tasks."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._tasks: Dict[str, _Flight] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn once for all concurrent callers with the same key.
+
+        Args:
+            key: Deduplication key (endpoint plus normalized params)
+            fn: Zero-argument function performing the call
+
+        Returns:
+            The result of fn, shared by every caller
+        """
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def do_async(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await fn once for all concurrent tasks with the same key.
+
+        The call runs as its own task, so cancelling any caller (the first one
+        included) leaves it running for the others; it is cancelled only once
+        every caller has gone.
+
+        Args:
+            key: Deduplication key (endpoint plus normalized params)
+            fn: Zero-argument coroutine function performing the call
+
+        Returns:
+            The result of fn, shared by every awaiting task
+        """
+        with self._lock:
+            self.calls += 1
+            flight = self._tasks.get(key)
+            if flight is None:
+                flight = self._tasks[key] = _Flight(asyncio.ensure_future(fn()))
+                flight.task.add_done_callback(partial(self._land, key, flight))
+            else:
+                self.coalesced += 1
+            flight.waiters += 1
+
+        try:
+            # Shield so a cancelled caller does not cancel the shared call
+            return await asyncio.shield(flight.task)
+        finally:
+            with self._lock:
+                flight.waiters -= 1
+                abandoned = not flight.waiters and not flight.task.done()
+            if abandoned:
+                flight.task.cancel()
+
+    def _land(self, key: str, flight: _Flight, task: "asyncio.Future[Any]") -> None:
+        """Forget a finished async call so the next caller starts a new one."""
+        with self._lock:
+            if self._tasks.get(key) is flight:
+                del self._tasks[key]
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return coalescing counters.
+
+        Async calls pass through both layers, so each one counts once per layer
+        in "calls"; "coalesced" counts calls that did not reach upstream.
+        """
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls) + len(self._tasks),
+            }
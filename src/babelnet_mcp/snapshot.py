@@ -0,0 +1,348 @@
+"""
+Portable snapshots of cached BabelNet responses.
+
+A snapshot packs cached responses into one compressed file that can be shipped
+to a new node, so it starts warm instead of spending Babelcoins on the same
+lookups again. It is tagged with the BabelNet version it was taken from, and
+split into independently compressed chunks with a key index, so a reader
+memory-maps the file and decompresses only the chunks it needs.
+
+Layout (integers little-endian):
+
+    MAGIC (8 bytes) | format version (u32) | header length (u32) | header (JSON)
+    chunk 0 | chunk 1 | ...              each an encoded, compressed record list
+    index                                encoded, compressed chunk table and keys
+    index offset (u64) | index length (u64) | MAGIC (8 bytes)
+
+Records are [key, path, params, value]. Chunks and the index are encoded with
+msgpack and compressed with zstd when those packages are installed
+(`pip install babelnet-mcp[snapshot]`), and with JSON and zlib otherwise; the
+header records which, so any reader with the same codecs can open the file.
+"""
+
+import json
+import logging
+import mmap
+import shutil
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .cache import ResponseCache, cache_key
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"BNSNAP\x00\x01"
+FORMAT_VERSION = 1
+
+# Endpoints worth shipping (getVersion is node-specific and cheap)
+SNAPSHOT_ENDPOINTS = ("getSynsetIds", "getSenses", "getSynset", "getOutgoingEdges")
+
+# Uncompressed bytes per chunk: small enough to decompress per lookup, large
+# enough for the compressor to exploit the repetition between responses
+DEFAULT_CHUNK_BYTES = 256 * 1024
+
+_PREFIX = struct.Struct("<8sII")
+_TRAILER = struct.Struct("<QQ8s")
+
+
+class SnapshotError(Exception):
+    """Raised for unreadable or incompatible snapshot files."""
+
+
+def _compressor(name: str) -> Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]:
+    if name == "zstd":
+        if zstandard is None:
+            raise SnapshotError("Snapshot is zstd-compressed; install zstandard to read it")
+        return zstandard.ZstdCompressor(level=10).compress, zstandard.ZstdDecompressor().decompress
+    if name == "zlib":
+        return (lambda data: zlib.compress(data, 6)), zlib.decompress
+    raise SnapshotError(f"Unknown snapshot compression: {name}")
+
+
+def _encoder(name: str) -> Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]:
+    if name == "msgpack":
+        if msgpack is None:
+            raise SnapshotError("Snapshot is msgpack-encoded; install msgpack to read it")
+        return (
+            lambda obj: msgpack.packb(obj, use_bin_type=True),
+            lambda data: msgpack.unpackb(data, raw=False),
+        )
+    if name == "json":
+        return (
+            lambda obj: json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8"),
+            lambda data: json.loads(bytes(data)),
+        )
+    raise SnapshotError(f"Unknown snapshot encoding: {name}")
+
+
+def _array(name: str) -> Callable[[List[bytes]], bytes]:
+    """Join already encoded items into an encoded list, without encoding them again."""
+    if name == "msgpack":
+        packer = msgpack.Packer()
+        return lambda items: packer.pack_array_header(len(items)) + b"".join(items)
+    return lambda items: b"[" + b",".join(items) + b"]"
+
+
+def write_snapshot(
+    path: Path,
+    records: Iterable[Tuple[str, Dict[str, Any], Any]],
+    babelnet_version: str,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    compression: Optional[str] = None,
+    encoding: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Write responses to a snapshot file.
+
+    Records are streamed to disk chunk by chunk in the order given. Sorted by
+    cache key (as export_cache reads them), each endpoint's responses end up
+    together and compress better.
+
+    Args:
+        path: Output file (replaced atomically)
+        records: (endpoint path, params, response) tuples
+        babelnet_version: BabelNet release the responses come from
+        chunk_bytes: Target uncompressed size of a chunk
+        compression: 'zstd' or 'zlib' (default: zstd if installed)
+        encoding: 'msgpack' or 'json' (default: msgpack if installed)
+
+    Returns:
+        The snapshot header, with entry and chunk counts
+    """
+    compression = compression or ("zstd" if zstandard is not None else "zlib")
+    encoding = encoding or ("msgpack" if msgpack is not None else "json")
+    compress, _ = _compressor(compression)
+    encode, _ = _encoder(encoding)
+    array = _array(encoding)
+    endpoints = dict.fromkeys(SNAPSHOT_ENDPOINTS, 0)
+    chunks: List[List[int]] = []
+    keys: List[List[Any]] = []
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # The header (with the counts) comes first, so chunks are written to a
+    # scratch file at offsets relative to its end, then copied after it
+    with tempfile.TemporaryFile(dir=path.parent) as body:
+        pending: List[bytes] = []
+        size = 0
+
+        def flush() -> None:
+            nonlocal pending, size
+            if not pending:
+                return
+            blob = compress(array(pending))
+            chunks.append([body.tell(), len(blob)])
+            body.write(blob)
+            pending, size = [], 0
+
+        for endpoint, params, value in records:
+            key = cache_key(endpoint, params)
+            keys.append([key, len(chunks)])
+            endpoints[endpoint] = endpoints.get(endpoint, 0) + 1
+            item = encode([key, endpoint, params, value])
+            pending.append(item)
+            size += len(item)
+            if size >= chunk_bytes:
+                flush()
+        flush()
+
+        header = {
+            "babelnet_version": babelnet_version,
+            "created_at": time.time(),
+            "compression": compression,
+            "encoding": encoding,
+            "entries": len(keys),
+            "endpoints": endpoints,
+        }
+        header_bytes = json.dumps(header).encode("utf-8")
+        base = _PREFIX.size + len(header_bytes)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, 'wb') as f:
+            f.write(_PREFIX.pack(MAGIC, FORMAT_VERSION, len(header_bytes)))
+            f.write(header_bytes)
+            body.seek(0)
+            shutil.copyfileobj(body, f)
+            for chunk in chunks:
+                chunk[0] += base
+            index = compress(encode({"chunks": chunks, "keys": keys}))
+            index_offset = f.tell()
+            f.write(index)
+            f.write(_TRAILER.pack(index_offset, len(index), MAGIC))
+    tmp.replace(path)
+    header["chunks"] = len(chunks)
+    return header
+
+
+class SnapshotReader:
+    """
+    Memory-mapped snapshot with lazy, per-chunk decompression.
+
+    Also answers raw API requests (lookup), so it can sit in front of the REST
+    API like the local synset store.
+    """
+
+    def __init__(self, path: Path, cached_chunks: int = 8) -> None:
+        """
+        Open a snapshot.
+
+        Args:
+            path: Snapshot file
+            cached_chunks: Decoded chunks kept in memory
+
+        Raises:
+            SnapshotError: If the file is not a readable snapshot
+        """
+        self.path = path
+        self.cached_chunks = cached_chunks
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as e:
+            self._file.close()
+            raise SnapshotError(f"{path} is empty") from e
+        try:
+            self.header = self._read_header()
+            self._decompress = _compressor(self.header["compression"])[1]
+            self._decode = _encoder(self.header["encoding"])[1]
+            index = self._decode(self._decompress(self._trailer_slice()))
+        except SnapshotError:
+            self.close()
+            raise
+        except (struct.error, ValueError, KeyError, zlib.error) as e:
+            self.close()
+            raise SnapshotError(f"{path} is not a readable snapshot: {e}") from e
+        self._chunks: List[Tuple[int, int]] = [tuple(c) for c in index["chunks"]]
+        self._keys: Dict[str, int] = {key: chunk for key, chunk in index["keys"]}
+        self._decoded: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _read_header(self) -> Dict[str, Any]:
+        magic, version, length = _PREFIX.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise SnapshotError(f"{self.path} is not a BabelNet snapshot")
+        if version > FORMAT_VERSION:
+            raise SnapshotError(
+                f"{self.path} uses snapshot format {version}; "
+                f"this version reads up to {FORMAT_VERSION}"
+            )
+        header: Dict[str, Any] = json.loads(self._map[_PREFIX.size:_PREFIX.size + length])
+        return header
+
+    def _trailer_slice(self) -> bytes:
+        offset, length, magic = _TRAILER.unpack_from(self._map, len(self._map) - _TRAILER.size)
+        if magic != MAGIC:
+            raise SnapshotError(f"{self.path} is truncated")
+        return self._map[offset:offset + length]
+
+    @property
+    def babelnet_version(self) -> str:
+        return str(self.header.get("babelnet_version", ""))
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _chunk(self, number: int) -> Dict[str, Any]:
+        with self._lock:
+            chunk = self._decoded.get(number)
+            if chunk is not None:
+                self._decoded.move_to_end(number)
+                return chunk
+        offset, length = self._chunks[number]
+        records = self._decode(self._decompress(self._map[offset:offset + length]))
+        chunk = {record[0]: record for record in records}
+        with self._lock:
+            self._decoded[number] = chunk
+            while len(self._decoded) > self.cached_chunks:
+                self._decoded.popitem(last=False)
+        return chunk
+
+    def get(self, path: str, params: Dict[str, Any]) -> Tuple[bool, Any]:
+        """
+        Look up one response, decompressing only its chunk.
+
+        Returns:
+            Tuple (hit, value)
+        """
+        key = cache_key(path, params)
+        number = self._keys.get(key)
+        if number is None:
+            return False, None
+        return True, self._chunk(number)[key][3]
+
+    def lookup(self, path: str, params: Dict[str, Any]) -> Tuple[bool, Any]:
+        """Answer a raw API request (see backends.LocalStoreBackend)."""
+        return self.get(path, params)
+
+    def __iter__(self) -> Iterator[Tuple[str, Dict[str, Any], Any]]:
+        """Yield every (endpoint path, params, response), chunk by chunk."""
+        for number in range(len(self._chunks)):
+            offset, length = self._chunks[number]
+            for _, path, params, value in self._decode(
+                self._decompress(self._map[offset:offset + length])
+            ):
+                yield path, params, value
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+
+def export_cache(
+    cache: ResponseCache,
+    path: Path,
+    babelnet_version: str,
+    endpoints: Iterable[str] = SNAPSHOT_ENDPOINTS,
+    **options: Any,
+) -> Dict[str, Any]:
+    """
+    Write the live persisted responses of a cache to a snapshot.
+
+    Args:
+        cache: Cache to export
+        path: Output file
+        babelnet_version: Version tag of the snapshot
+        endpoints: Endpoints to include
+        **options: Passed to write_snapshot
+
+    Returns:
+        The snapshot header
+    """
+    return write_snapshot(path, cache.responses_by_key(endpoints), babelnet_version, **options)
+
+
+def import_snapshot(
+    cache: ResponseCache, reader: SnapshotReader, overwrite: bool = False
+) -> Dict[str, int]:
+    """
+    Load a snapshot's responses into a cache.
+
+    Args:
+        cache: Cache to fill
+        reader: Open snapshot
+        overwrite: Replace responses the cache already holds
+
+    Returns:
+        Counts of imported and skipped entries
+    """
+    imported = skipped = 0
+    for path, params, value in reader:
+        if not overwrite and cache.contains(path, params):
+            skipped += 1
+            continue
+        cache.put(path, params, value)
+        imported += 1
+    return {"imported": imported, "skipped": skipped}
@@ -7,9 +7,19 @@ This module contains all MCP tools for interacting with BabelNet.
 from .definition import register_definition_tool
 from .synset import register_synset_tools
 from .sense import register_sense_tools
+from .budget import register_budget_tools
+from .relations import register_relation_tools
+from .stats import register_stats_tools
+from .translate import register_translate_tools
+from .search import register_search_tools
 
 __all__ = [
     "register_definition_tool",
     "register_synset_tools",
-    "register_sense_tools"
+    "register_sense_tools",
+    "register_budget_tools",
+    "register_relation_tools",
+    "register_stats_tools",
+    "register_translate_tools",
+    "register_search_tools"
 ]
@@ -0,0 +1,97 @@
+"""
+Helpers shared by the batch lookup tools.
+"""
+
+from typing import Any, Dict, List, Optional, Union
+
+from ..budget import BudgetExhaustedError
+from ..constants import LANGUAGE_MAP, POS_MAP
+
+
+class BatchQuery:
+    """
+    A normalized lemma lookup; equal queries share one upstream call.
+
+    Queries compare on their normalized fields only, so items asking for the
+    same languages in another order or case share a lookup while each result
+    still echoes the languages its caller gave.
+    """
+
+    __slots__ = ("word", "from_langs", "to_langs", "pos", "from_languages", "to_languages", "key")
+
+    def __init__(
+        self,
+        word: str,
+        from_langs: List[str],
+        to_langs: Optional[List[str]] = None,
+        pos: Optional[str] = None,
+    ) -> None:
+        self.word = word
+        self.from_langs = tuple(sorted(lang.lower() for lang in from_langs))
+        self.to_langs = tuple(sorted(lang.lower() for lang in to_langs)) if to_langs else None
+        self.pos = pos.lower() if pos else None
+        # The languages as given, echoed in results
+        self.from_languages = list(from_langs)
+        self.to_languages = list(to_langs) if to_langs else None
+        self.key = (self.word, self.from_langs, self.to_langs, self.pos)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, BatchQuery) and other.key == self.key
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+    def __repr__(self) -> str:
+        return f"BatchQuery{self.key!r}"
+
+    @property
+    def search_langs(self) -> List[str]:
+        return [LANGUAGE_MAP.get(lang.lower(), lang).upper() for lang in self.from_langs]
+
+    @property
+    def target_langs(self) -> Optional[List[str]]:
+        if not self.to_langs:
+            return None
+        return [LANGUAGE_MAP.get(lang.lower(), lang).upper() for lang in self.to_langs]
+
+    @property
+    def poses(self) -> Optional[List[str]]:
+        tag = POS_MAP.get(self.pos.lower()) if self.pos else None
+        return [tag] if tag else None
+
+
+def parse_batch_items(
+    words: List[Union[str, Dict[str, Any]]],
+    from_langs: List[str],
+    to_langs: Optional[List[str]] = None,
+    pos: Optional[str] = None
+) -> List[BatchQuery]:
+    """
+    Normalize batch items into queries.
+
+    Args:
+        words: Words, or objects with "word" and optional "from_langs"/"to_langs"/"pos"
+        from_langs: Default source languages
+        to_langs: Default target languages
+        pos: Default part-of-speech
+
+    Returns:
+        One query per input item, in order
+    """
+    queries = []
+    for item in words:
+        spec: Dict[str, Any] = item if isinstance(item, dict) else {"word": item}
+        queries.append(BatchQuery(
+            str(spec.get("word", "")).strip(),
+            spec.get("from_langs", from_langs),
+            spec.get("to_langs", to_langs),
+            spec.get("pos", pos),
+        ))
+    return queries
+
+
+def error_result(word: str, error: BaseException) -> Dict[str, Any]:
+    """Build the per-item result of a failed lookup."""
+    if isinstance(error, BudgetExhaustedError):
+        return {"word": word, **error.to_result()}
+    return {"word": word, "error": type(error).__name__, "message": str(error)}
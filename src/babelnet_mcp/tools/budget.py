@@ -0,0 +1,34 @@
+"""
+Tools for inspecting the Babelcoin budget.
+"""
+
+from typing import Any, Dict
+
+from ..http_client import BabelNetHTTPClient
+
+
+def register_budget_tools(mcp: Any, client: BabelNetHTTPClient) -> None:
+    """Register the budget tool and resource."""
+
+    def budget_status() -> Dict[str, Any]:
+        if client.budget is None:
+            return {"enabled": False}
+        return {"enabled": True, **client.budget.status()}
+
+    @mcp.tool()
+    def get_budget() -> Dict[str, Any]:
+        """
+        Report the remaining Babelcoin budget for today.
+
+        This tool does not consume any Babelcoin.
+
+        Returns:
+            Dictionary with the daily limit, coins spent and remaining,
+            whether the budget is low, and when it resets (UTC)
+        """
+        return budget_status()
+
+    @mcp.resource("babelnet://budget")
+    def budget_resource() -> Dict[str, Any]:
+        """Remaining Babelcoin budget for today."""
+        return budget_status()
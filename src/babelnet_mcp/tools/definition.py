@@ -2,29 +2,128 @@
 Tool for getting word definitions/meanings from BabelNet.
 """
 
+import asyncio
 import logging
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Union
+from ..async_client import AsyncBabelNetClient
+from ..budget import BudgetExhaustedError
+from ..decode import DEFINITION_PROJECTION
 from ..http_client import BabelNetHTTPClient
 from ..constants import LANGUAGE_MAP, POS_MAP
+from .batch import error_result, parse_batch_items
+
+try:
+    from mcp.server.fastmcp import Context
+except ImportError:  # keeps the tools importable (e.g. in tests) without the mcp package
+    Context = Any  # type: ignore[misc,assignment]
 
 logger = logging.getLogger("babelnet-mcp")
 
 
-def register_definition_tool(mcp: Any, client: BabelNetHTTPClient) -> None:
-    """Register the definition/meaning tool."""
+def _format_definition(
+    word: str,
+    from_langs: List[str],
+    item: Dict[str, Any],
+    synset: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """
+    Build a definition entry from a getSynsetIds item and its synset.
+    
+    Returns:
+        The definition, or None if the synset has no glosses
+    """
+    sid = item["id"]
+    
+    # Extract glosses from synset
+    glosses = synset.get("glosses", [])
+    
+    if not glosses:
+        logger.debug(f"No glosses found for synset {sid}")
+        return None
+    
+    logger.debug(f"Found {len(glosses)} glosses for synset {sid}")
+    
+    # Get main sense for this synset
+    senses = synset.get("senses", [])
+    main_sense = word
+    if senses:
+        # Try to find a sense matching the search language
+        for sense in senses:
+            props = sense.get("properties", {})
+            if props.get("language", "").upper() in [lang.upper() for lang in from_langs]:
+                main_sense = props.get("lemma", {}).get("lemma", word)
+                break
+    
+    # Format glosses
+    formatted_glosses = []
+    for gloss in glosses:
+        formatted_glosses.append({
+            "language": gloss.get("language", ""),
+            "definition": gloss.get("gloss", ""),
+            "source": gloss.get("source", "")
+        })
+    
+    return {
+        "synset_id": sid,
+        "pos": item.get("pos", ""),
+        "main_sense": main_sense,
+        "glosses": formatted_glosses
+    }
+
+
+def _has_gloss_in(definition: Dict[str, Any], langs: List[str]) -> bool:
+    """Return True if the definition has a gloss in one of the given language tags."""
+    return any(g["language"].upper() in langs for g in definition["glosses"])
+
+
+async def _report(
+    ctx: Optional[Context],
+    done: int,
+    total: int,
+    definition: Optional[Dict[str, Any]] = None
+) -> None:
+    """Send a progress notification and, if any, the definition that just arrived."""
+    if ctx is None:
+        return
+    try:
+        await ctx.report_progress(done, total)
+        if definition is not None:
+            gloss = definition["glosses"][0]["definition"]
+            await ctx.info(
+                f"[{done}/{total}] {definition['synset_id']} ({definition['pos']}) "
+                f"{definition['main_sense']}: {gloss}"
+            )
+    except Exception as e:
+        # Notifications are best effort; the final result still carries everything
+        logger.debug(f"Could not send progress notification: {e}")
+
+
+def register_definition_tool(
+    mcp: Any,
+    client: BabelNetHTTPClient,
+    async_client: Optional[AsyncBabelNetClient] = None
+) -> None:
+    """Register the definition/meaning tools."""
+    aclient = async_client or AsyncBabelNetClient(client)
+    # Definitions read only the glosses and a few sense properties
+    projection = DEFINITION_PROJECTION if client.selective_decode else None
     
     @mcp.tool()
-    def get_definition(
+    async def get_definition(
         word: str,
         from_langs: List[str] = ["en"],
         pos: Optional[str] = None,
-        max_definitions: int = 20
+        max_definitions: int = 20,
+        stop_after: Optional[int] = None,
+        ctx: Context = None  # type: ignore[assignment]
     ) -> Dict[str, Any]:
         """
         Get definitions (glosses) for a word across all its meanings.
         
         This tool retrieves all synsets for a word and extracts their definitions,
-        providing a comprehensive view of the word's various meanings.
+        providing a comprehensive view of the word's various meanings. Each
+        definition is sent as a progress/log notification as soon as its synset
+        arrives, before the complete result is returned.
         
         NOTE: Each request consumes 1 Babelcoin per synset (daily limit: 1000).
         
@@ -33,12 +132,16 @@ def register_definition_tool(mcp: Any, client: BabelNetHTTPClient) -> None:
             from_langs: Source languages to search in (e.g., ['en', 'it']). Default: ['en']
             pos: Part-of-speech filter: 'noun', 'verb', 'adjective', 'adverb' (optional)
             max_definitions: Maximum number of synsets to retrieve (default: 20)
+            stop_after: Stop once this many definitions with a gloss in one of
+                from_langs have arrived; synsets not yet requested are skipped (optional)
+            ctx: MCP request context, injected by the server
         
         Returns:
             Dictionary containing:
             - word: the searched word
             - total_meanings: number of different meanings found
-            - definitions: list of meanings with their glosses
+            - definitions: list of meanings with their glosses, in BabelNet's order
+            - stopped_early: present and true if stop_after cut the fetch short
         
         Example:
             >>> get_definition("bank", from_langs=["en"])
@@ -69,83 +172,197 @@ def register_definition_tool(mcp: Any, client: BabelNetHTTPClient) -> None:
         poses = [POS_MAP.get(pos.lower())] if pos else None
         
         try:
-            synset_ids = client.get_synset_ids(
+            synset_ids = await aclient.get_synset_ids(
                 lemma=word,
                 search_langs=[LANGUAGE_MAP.get(lang.lower(), lang).upper() for lang in from_langs],
                 poses=[p for p in poses if p] if poses else None,
             )
             logger.info(f"Found {len(synset_ids)} synset IDs for '{word}'")
+        except BudgetExhaustedError as e:
+            logger.warning(f"Budget exhausted looking up '{word}': {e}")
+            return e.to_result()
         except Exception as e:
             logger.error(f"Error getting synset IDs for '{word}': {e}")
             raise
         
-        # Limit the number of synsets to retrieve
+        # Limit the number of synsets to retrieve (tighter while the budget is low)
+        if client.budget is not None:
+            max_definitions = client.budget.cap_definitions(max_definitions)
         synset_ids = synset_ids[:max_definitions]
         if len(synset_ids) < max_definitions:
             logger.debug(f"Using all {len(synset_ids)} synsets (requested max: {max_definitions})")
         else:
             logger.debug(f"Limited to {max_definitions} synsets out of {len(synset_ids)}")
         
-        definitions: List[Dict[str, Any]] = []
+        budget_exhausted = False
+        stopped_early = False
         
-        # For each synset, get full details and extract glosses
+        items: List[Dict[str, Any]] = []
         for idx, item in enumerate(synset_ids, 1):
-            sid = item.get("id")
-            if not sid:
+            if not item.get("id"):
                 logger.warning(f"Skipping synset without ID at position {idx}")
                 continue
-                
+            items.append(item)
+        logger.debug(f"Fetching {len(items)} synsets (concurrency: {aclient.max_concurrency})")
+        gloss_langs = [LANGUAGE_MAP.get(lang.lower(), lang).upper() for lang in from_langs]
+        
+        async def fetch(index: int, item: Dict[str, Any]) -> Any:
             try:
-                logger.debug(f"Fetching synset {idx}/{len(synset_ids)}: {sid}")
-                synset = client.get_synset(sid)
-                
-                # Extract glosses from synset
-                glosses = synset.get("glosses", [])
-                
-                if not glosses:
-                    logger.debug(f"No glosses found for synset {sid}")
-                    continue
-                
-                logger.debug(f"Found {len(glosses)} glosses for synset {sid}")
-                
-                # Get main sense for this synset
-                senses = synset.get("senses", [])
-                main_sense = word
-                if senses:
-                    # Try to find a sense matching the search language
-                    for sense in senses:
-                        props = sense.get("properties", {})
-                        if props.get("language", "").upper() in [lang.upper() for lang in from_langs]:
-                            main_sense = props.get("lemma", {}).get("lemma", word)
-                            break
-                
-                # Format glosses
-                formatted_glosses = []
-                for gloss in glosses:
-                    formatted_glosses.append({
-                        "language": gloss.get("language", ""),
-                        "definition": gloss.get("gloss", ""),
-                        "source": gloss.get("source", "")
-                    })
-                
-                definitions.append({
-                    "synset_id": sid,
-                    "pos": item.get("pos", ""),
-                    "main_sense": main_sense,
-                    "glosses": formatted_glosses
-                })
+                return index, item, await aclient.get_synset(item["id"], projection=projection)
+            except (Exception, asyncio.CancelledError) as e:
+                # A fetch is only cancelled once its result is no longer read
+                return index, item, e
+        
+        # Fetch all synsets concurrently and handle each one as soon as it arrives
+        found: List[Any] = []
+        matching = 0
+        total = len(items)
+        await _report(ctx, 0, total)
+        tasks = [asyncio.ensure_future(fetch(index, item)) for index, item in enumerate(items)]
+        try:
+            for done, next_result in enumerate(asyncio.as_completed(tasks), 1):
+                index, item, synset = await next_result
+                sid = item["id"]
+                definition = None
+                if isinstance(synset, BudgetExhaustedError):
+                    budget_exhausted = True
+                elif isinstance(synset, BaseException):
+                    # Skip synsets that fail to load
+                    logger.warning(f"Failed to load synset {sid}: {synset}")
+                else:
+                    try:
+                        definition = _format_definition(word, from_langs, item, synset)
+                    except Exception as e:
+                        # Skip synsets with an unexpected shape
+                        logger.warning(f"Failed to load synset {sid}: {e}")
+                if definition is not None:
+                    found.append((index, definition))
+                    matching += _has_gloss_in(definition, gloss_langs)
+                await _report(ctx, done, total, definition)
                 
-            except Exception as e:
-                # Skip synsets that fail to load
-                logger.warning(f"Failed to load synset {sid}: {e}")
-                continue
+                if stop_after is not None and matching >= stop_after and done < total:
+                    logger.info(f"Stopping after {len(found)} definitions for '{word}'")
+                    stopped_early = True
+                    break
+        finally:
+            # Stop waiting on the remaining fetches. Fetches shared with other callers
+            # keep running for them; requests not yet sent are dropped, and those already
+            # sent finish into the cache
+            for task in tasks:
+                task.cancel()
+        
+        definitions = [definition for _, definition in sorted(found, key=lambda f: f[0])]
         
         logger.info(f"Successfully retrieved {len(definitions)} definitions for '{word}'")
         
-        return {
+        result: Dict[str, Any] = {
             "word": word,
             "from_languages": from_langs,
             "pos": pos,
             "total_meanings": len(definitions),
             "definitions": definitions
+        }
+        if budget_exhausted:
+            # Some synsets were neither cached nor affordable
+            result["budget_exhausted"] = True
+        if stopped_early:
+            result["stopped_early"] = True
+        return result
+    
+    @mcp.tool()
+    async def get_definitions_batch(
+        words: List[Union[str, Dict[str, Any]]],
+        from_langs: List[str] = ["en"],
+        pos: Optional[str] = None,
+        max_definitions: int = 20
+    ) -> Dict[str, Any]:
+        """
+        Get definitions for many words in a single call.
+        
+        Lemma lookups and synset fetches are deduplicated across the whole batch
+        and run concurrently, so a meaning shared by several words is fetched once.
+        
+        NOTE: Each distinct lookup and each distinct synset consumes 1 Babelcoin
+        (daily limit: 1000).
+        
+        Args:
+            words: Words to define. Each item is a word, or an object with "word"
+                and optional "from_langs" and "pos" overriding the defaults
+            from_langs: Default source languages (e.g., ['en', 'it']). Default: ['en']
+            pos: Default part-of-speech filter (optional)
+            max_definitions: Maximum number of synsets per word (default: 20)
+        
+        Returns:
+            Dictionary containing:
+            - total_words: number of input items
+            - unique_lookups / unique_synsets: upstream work after deduplication
+            - results: one entry per input item, in order, shaped like the result of
+              get_definition, or with an "error" field if the item failed
+        """
+        queries = parse_batch_items(words, from_langs, pos=pos)
+        unique = list(dict.fromkeys(queries))
+        logger.info(f"Getting definitions for {len(queries)} words ({len(unique)} distinct)")
+        
+        if client.budget is not None:
+            max_definitions = client.budget.cap_definitions(max_definitions)
+        
+        # Resolve every distinct lemma, then every distinct synset, concurrently
+        lookups = await asyncio.gather(
+            *(aclient.get_synset_ids(q.word, q.search_langs, poses=q.poses) for q in unique),
+            return_exceptions=True,
+        )
+        items_by_query: Dict[Any, Any] = {}
+        synset_ids: Dict[str, None] = {}
+        for query, response in zip(unique, lookups):
+            if isinstance(response, BaseException):
+                items_by_query[query] = response
+                continue
+            items = [item for item in response[:max_definitions] if item.get("id")]
+            items_by_query[query] = items
+            synset_ids.update((item["id"], None) for item in items)
+        
+        fetched = await aclient.get_synsets(list(synset_ids), projection)
+        synsets = dict(zip(synset_ids, fetched))
+        
+        results: List[Dict[str, Any]] = []
+        for query in queries:
+            items = items_by_query[query]
+            if isinstance(items, BaseException):
+                results.append(error_result(query.word, items))
+                continue
+            
+            definitions: List[Dict[str, Any]] = []
+            budget_exhausted = False
+            for item in items:
+                synset = synsets[item["id"]]
+                if isinstance(synset, BudgetExhaustedError):
+                    budget_exhausted = True
+                    continue
+                if isinstance(synset, BaseException):
+                    logger.warning(f"Failed to load synset {item['id']}: {synset}")
+                    continue
+                try:
+                    definition = _format_definition(query.word, query.from_languages, item, synset)
+                except Exception as e:
+                    logger.warning(f"Failed to load synset {item['id']}: {e}")
+                    continue
+                if definition is not None:
+                    definitions.append(definition)
+            
+            result: Dict[str, Any] = {
+                "word": query.word,
+                "from_languages": query.from_languages,
+                "pos": query.pos,
+                "total_meanings": len(definitions),
+                "definitions": definitions
+            }
+            if budget_exhausted:
+                result["budget_exhausted"] = True
+            results.append(result)
+        
+        return {
+            "total_words": len(queries),
+            "unique_lookups": len(unique),
+            "unique_synsets": len(synset_ids),
+            "results": results
         }
\ No newline at end of file
@@ -0,0 +1,198 @@
+"""
+Tools for exploring semantic relations between synsets in BabelNet.
+"""
+
+import logging
+from itertools import combinations
+from typing import Optional, Dict, Any, List
+
+from ..async_client import AsyncBabelNetClient
+from ..constants import LANGUAGE_MAP, SUPPORTED_RELATIONS
+from ..decode import SynsetProjection
+from ..graph import hypernym_path, walk_relations
+from ..http_client import BabelNetHTTPClient
+from ..hypernyms import HypernymGraph, expand_hypernyms
+
+logger = logging.getLogger("babelnet-mcp")
+
+
+def register_relation_tools(
+    mcp: Any,
+    client: BabelNetHTTPClient,
+    async_client: Optional[AsyncBabelNetClient] = None
+) -> None:
+    """Register all relation-related tools."""
+    aclient = async_client or AsyncBabelNetClient(client)
+    # Shared by the similarity tools: each hypernym edge list is parsed once per process
+    hypernyms = HypernymGraph()
+    
+    async def add_lemmas(nodes: List[Dict[str, Any]], lang: str) -> None:
+        """Label nodes with their main lemma in the given language."""
+        tag = LANGUAGE_MAP.get(lang.lower(), lang).upper()
+        # Only the senses in that language, and of those only what the label reads
+        projection = SynsetProjection(
+            ("senses",), ("language", "lemma", "fullLemma"), [tag]
+        ) if client.selective_decode else None
+        synsets = await aclient.get_synsets([node["synset_id"] for node in nodes], projection)
+        for node, synset in zip(nodes, synsets):
+            if isinstance(synset, BaseException):
+                continue
+            for sense in synset.get("senses", []):
+                props = sense.get("properties", {})
+                if props.get("language", "").upper() == tag:
+                    node["lemma"] = props.get("lemma", {}).get("lemma") or props.get("fullLemma")
+                    break
+    
+    @mcp.tool()
+    async def get_related_synsets(
+        synset_id: str,
+        relation: str = "hypernym",
+        depth: int = 1,
+        max_nodes: int = 50,
+        with_lemmas: bool = False,
+        lang: str = "en"
+    ) -> Dict[str, Any]:
+        """
+        Walk the semantic relations of a synset up to a given depth.
+        
+        Outgoing edges are filtered by relation type, each level is fetched
+        concurrently and every synset is visited once.
+        
+        NOTE: Each expanded synset consumes 1 Babelcoin (daily limit: 1000),
+        plus 1 per labelled node when with_lemmas is set. Only the first
+        max_nodes nodes are labelled, so a call costs at most 2 * max_nodes.
+        
+        Args:
+            synset_id: BabelNet synset ID to start from (e.g., 'bn:00008364n')
+            relation: 'hypernym', 'hyponym', 'meronym', 'holonym', 'antonym' or 'all'
+            depth: Number of hops to follow (default: 1)
+            max_nodes: Maximum number of synsets to expand (default: 50)
+            with_lemmas: Label the first max_nodes reached synsets with their main
+                lemma (default: False)
+            lang: Language of the lemma labels (default: 'en')
+        
+        Returns:
+            Dictionary with the reached nodes (ID, depth, parent, relation),
+            the traversed edges and whether the walk was truncated by the limits;
+            with with_lemmas, "unlabeled" counts the nodes left without a label
+        """
+        if relation not in SUPPORTED_RELATIONS:
+            return {
+                "error": "unsupported_relation",
+                "message": f"relation must be one of {SUPPORTED_RELATIONS}"
+            }
+        logger.info(f"Walking '{relation}' relations of {synset_id} (depth: {depth})")
+        
+        walk = await walk_relations(aclient, synset_id, relation, depth, max_nodes)
+        if with_lemmas:
+            # Leaves reached by the last level can far outnumber the expanded synsets
+            await add_lemmas(walk["nodes"][:max_nodes], lang)
+            walk["unlabeled"] = max(0, len(walk["nodes"]) - max_nodes)
+        
+        return {
+            "synset_id": synset_id,
+            "relation": relation,
+            "depth": depth,
+            "total_nodes": len(walk["nodes"]) - 1,
+            **walk
+        }
+    
+    @mcp.tool()
+    async def get_hypernym_path(
+        synset_id: str,
+        max_depth: int = 20,
+        with_lemmas: bool = False,
+        lang: str = "en"
+    ) -> Dict[str, Any]:
+        """
+        Follow the hypernym ("is-a") chain of a synset up to its root concept.
+        
+        At each step the manually curated, highest-weighted hypernym is taken.
+        
+        NOTE: Each step consumes 1 Babelcoin (daily limit: 1000), plus 1 per
+        synset when with_lemmas is set.
+        
+        Args:
+            synset_id: BabelNet synset ID to start from (e.g., 'bn:00008364n')
+            max_depth: Maximum length of the chain (default: 20)
+            with_lemmas: Label each synset with its main lemma (default: False)
+            lang: Language of the lemma labels (default: 'en')
+        
+        Returns:
+            Dictionary with the chain (starting synset first), its length and why
+            it stopped: 'root', 'cycle', 'max_depth', 'budget_exhausted' or
+            'error' (then 'error' holds the failure and the chain ends at the
+            synset whose hypernyms could not be loaded)
+        """
+        logger.info(f"Getting hypernym path of {synset_id}")
+        chain = await hypernym_path(aclient, synset_id, max_depth)
+        if with_lemmas:
+            await add_lemmas(chain["path"], lang)
+        return {"synset_id": synset_id, **chain}
+    
+    @mcp.tool()
+    async def synset_similarity(
+        synset_ids: List[str],
+        max_fetches: int = 200
+    ) -> Dict[str, Any]:
+        """
+        Score how similar synsets are, pairwise, from their hypernym ("is-a") hierarchy.
+        
+        For every pair the lowest common hypernym is found and two scores are
+        computed: path similarity, 1 / (1 + length of the shortest is-a path),
+        and Wu-Palmer similarity, based on the depth of the common hypernym.
+        Both range from 0 to 1 (identical synsets). Hypernyms are kept locally,
+        so only ancestors never seen before are fetched.
+        
+        NOTE: Each synset whose hypernyms are not yet known consumes 1 Babelcoin
+        (daily limit: 1000); scoring itself is free.
+        
+        Args:
+            synset_ids: BabelNet synset IDs to compare (e.g., ['bn:00015267n', 'bn:00010605n'])
+            max_fetches: Maximum number of hypernym lookups (default: 200)
+        
+        Returns:
+            Dictionary containing:
+            - pairs: For each pair, the common hypernym, path length, path and wup scores
+              (None when the synsets share no known hypernym)
+            - complete: False if some ancestors could not be fetched within max_fetches
+        """
+        logger.info(f"Scoring similarity of {len(synset_ids)} synsets")
+        expansion = await expand_hypernyms(hypernyms, aclient, synset_ids, max_fetches)
+        pairs = [hypernyms.similarity(a, b) for a, b in combinations(dict.fromkeys(synset_ids), 2)]
+        return {"pairs": pairs, **expansion}
+    
+    @mcp.tool()
+    async def lowest_common_hypernym(
+        synset_ids: List[str],
+        max_fetches: int = 200,
+        with_lemmas: bool = False,
+        lang: str = "en"
+    ) -> Dict[str, Any]:
+        """
+        Find the most specific concept that all the given synsets are a kind of.
+        
+        E.g., for 'dog' and 'cat' this is 'carnivore'. Hypernyms are kept
+        locally, so only ancestors never seen before are fetched.
+        
+        NOTE: Each synset whose hypernyms are not yet known consumes 1 Babelcoin
+        (daily limit: 1000), plus 1 when with_lemmas is set.
+        
+        Args:
+            synset_ids: BabelNet synset IDs (at least one)
+            max_fetches: Maximum number of hypernym lookups (default: 200)
+            with_lemmas: Label the hypernym with its main lemma (default: False)
+            lang: Language of the lemma label (default: 'en')
+        
+        Returns:
+            Dictionary containing:
+            - hypernym: synset_id, depth (distance from the root) and the distance
+              from each input synset, or None if they share no known hypernym
+            - complete: False if some ancestors could not be fetched within max_fetches
+        """
+        logger.info(f"Finding the lowest common hypernym of {synset_ids}")
+        expansion = await expand_hypernyms(hypernyms, aclient, synset_ids, max_fetches)
+        hypernym = hypernyms.lowest_common_hypernym(synset_ids)
+        if hypernym is not None and with_lemmas:
+            await add_lemmas([hypernym], lang)
+        return {"synset_ids": synset_ids, "hypernym": hypernym, **expansion}
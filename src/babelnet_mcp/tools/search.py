@@ -0,0 +1,62 @@
+"""
+Tool for searching the local gloss index.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from ..constants import LANGUAGE_MAP, POS_MAP
+from ..http_client import BabelNetHTTPClient
+
+logger = logging.getLogger("babelnet-mcp")
+
+
+def register_search_tools(mcp: Any, client: BabelNetHTTPClient) -> None:
+    """Register the gloss search tool."""
+
+    @mcp.tool()
+    def search_glosses(
+        query: str,
+        langs: Optional[List[str]] = None,
+        pos: Optional[str] = None,
+        sources: Optional[List[str]] = None,
+        limit: int = 10,
+        match_any: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Find concepts whose definition (or lemmas) mention some words.
+
+        Searches the glosses and lemmas of every synset fetched so far, ranked
+        by relevance. Only synsets already fetched (or indexed from a dump) can
+        be found; use get_definition or get_synsets to discover new ones.
+
+        NOTE: Runs locally and does not consume any Babelcoin.
+
+        Args:
+            query: Words to search for, all required unless match_any (e.g., 'river slope');
+                   'word*' matches words starting with 'word'
+            langs: Only glosses in these languages (e.g., ['en', 'it'])
+            pos: Part-of-speech: 'noun', 'verb', 'adjective', 'adverb' (optional)
+            sources: Only glosses from these sources (e.g., ['WN', 'WIKI'])
+            limit: Maximum number of synsets (default: 10)
+            match_any: Match glosses containing any of the words (default: False)
+
+        Returns:
+            Dictionary containing:
+            - query: The query
+            - results: One entry per synset with synset_id, pos, language, source,
+              gloss, lemmas, a snippet with the matches in [brackets] and a score
+              (lower is better)
+        """
+        if client.gloss_index is None:
+            return {
+                "error": "gloss_index_disabled",
+                "message": "The gloss index is disabled; set GLOSS_INDEX_ENABLED: true",
+            }
+        tags = [LANGUAGE_MAP.get(lang.lower(), lang).upper() for lang in langs or []]
+        pos_tag = POS_MAP.get(pos.lower(), pos) if pos else None
+        results = client.gloss_index.search(
+            query, langs=tags, pos=pos_tag, sources=sources, limit=limit, match_any=match_any
+        )
+        logger.info(f"Gloss search '{query}' returned {len(results)} synset(s)")
+        return {"query": query, "results": results}
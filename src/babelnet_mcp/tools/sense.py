@@ -4,18 +4,30 @@ Tools for sense management in BabelNet.
 
 from typing import Optional, Dict, Any, List
 
+from ..async_client import AsyncBabelNetClient
+from ..budget import BudgetExhaustedError
 from ..constants import LANGUAGE_MAP, POS_MAP
 from ..http_client import BabelNetHTTPClient
+from ..shaping import project_senses, view_key
 
 
-def register_sense_tools(mcp: Any, client: BabelNetHTTPClient) -> None:
+def register_sense_tools(
+    mcp: Any,
+    client: BabelNetHTTPClient,
+    async_client: Optional[AsyncBabelNetClient] = None
+) -> None:
     """Register all sense-related tools."""
+    aclient = async_client or AsyncBabelNetClient(client)
     
     @mcp.tool()
-    def get_senses(
+    async def get_senses(
         word: str,
         from_langs: List[str] = ["en"],
-        pos: Optional[str] = None
+        pos: Optional[str] = None,
+        langs: Optional[List[str]] = None,
+        sources: Optional[List[str]] = None,
+        max_senses: Optional[int] = None,
+        compact: bool = False
     ) -> Dict[str, Any]:
         """
         Retrieve all senses of a word.
@@ -27,17 +39,37 @@ def register_sense_tools(mcp: Any, client: BabelNetHTTPClient) -> None:
             word: The word to search for
             from_langs: Source languages. Default: ['en']
             pos: Part-of-speech: 'noun', 'verb', 'adjective', 'adverb' (optional)
+            langs: Only keep senses in these languages, e.g. ['en'] (optional)
+            sources: Only keep senses from these sources, e.g. ['WN', 'WIKI'] (optional)
+            max_senses: Maximum number of senses to return (optional)
+            compact: Reduce each sense to lemma, language, POS, source and synset ID
         
         Returns:
             Dictionary with the word and list of found senses
         """
         poses = [POS_MAP.get(pos.lower())] if pos else None
-        synset_ids = client.get_senses(
-            lemma=word,
-            search_langs=[LANGUAGE_MAP.get(lang.lower(), lang).upper() for lang in from_langs],
-            target_langs=None,
-            poses=[p for p in poses] if poses else None,
-        )        
+        search_langs = [LANGUAGE_MAP.get(lang.lower(), lang).upper() for lang in from_langs]
+        view = view_key(langs=langs, sources=sources, max_senses=max_senses, compact=compact)
+        try:
+            if not view:
+                synset_ids = await aclient.get_senses(
+                    lemma=word,
+                    search_langs=search_langs,
+                    target_langs=None,
+                    poses=[p for p in poses if p] if poses else None,
+                )
+            else:
+                synset_ids = await aclient.get_view(
+                    "getSenses",
+                    client.lemma_query(
+                        word, search_langs, None, [p for p in poses if p] if poses else None
+                    ),
+                    view,
+                    lambda senses: project_senses(senses, langs, sources, max_senses, compact),
+                )
+        except BudgetExhaustedError as e:
+            return e.to_result()
+
         return {
             "word": word,
             "from_languages": from_langs,
@@ -0,0 +1,21 @@
+"""
+Resources exposing client statistics and metrics for tuning under load.
+"""
+
+from typing import Any, Dict
+
+from ..http_client import BabelNetHTTPClient
+
+
+def register_stats_tools(mcp: Any, client: BabelNetHTTPClient) -> None:
+    """Register the statistics and metrics resources."""
+
+    @mcp.resource("babelnet://stats")
+    def stats_resource() -> Dict[str, Any]:
+        """Upstream request counts, retries, latency percentiles, coalescing and cache hit rates."""
+        return client.stats()
+
+    @mcp.resource("babelnet://metrics")
+    def metrics_resource() -> Dict[str, Any]:
+        """Per-tool and per-endpoint latency histograms, response sizes, errors and coins spent."""
+        return client.metrics.snapshot()
@@ -2,17 +2,27 @@
 Tools for synset management in BabelNet.
 """
 
-from typing import Optional, Dict, Any, List
+import asyncio
+from typing import Optional, Dict, Any, List, Union
 
+from ..async_client import AsyncBabelNetClient
+from ..budget import BudgetExhaustedError
 from ..constants import LANGUAGE_MAP, POS_MAP
 from ..http_client import BabelNetHTTPClient
+from ..shaping import project_synset, view_key
+from .batch import error_result, parse_batch_items
 
 
-def register_synset_tools(mcp: Any, client: BabelNetHTTPClient) -> None:
+def register_synset_tools(
+    mcp: Any,
+    client: BabelNetHTTPClient,
+    async_client: Optional[AsyncBabelNetClient] = None
+) -> None:
     """Register all synset-related tools."""
+    aclient = async_client or AsyncBabelNetClient(client)
     
     @mcp.tool()
-    def get_synsets(
+    async def get_synsets(
         word: str,
         from_langs: List[str] = ["en"],
         to_langs: Optional[List[str]] = None,
@@ -33,19 +43,18 @@ def register_synset_tools(mcp: Any, client: BabelNetHTTPClient) -> None:
             Dictionary with the searched word and list of found synsets
         """
         poses = [POS_MAP.get(pos.lower())] if pos else None
-        synset_ids = client.get_synset_ids(
-            lemma=word,
-            search_langs=[LANGUAGE_MAP.get(lang.lower(), lang).upper() for lang in from_langs],
-            target_langs=[LANGUAGE_MAP.get(lang.lower(), lang).upper() for lang in to_langs] if to_langs else None,
-            poses=[p for p in poses] if poses else None,
-        )
-        results: List[Dict[str, Any]] = []
-        synset_ids = client.get_synset_ids(
-            lemma=word,
-            search_langs=[LANGUAGE_MAP.get(lang.lower(), lang).upper() for lang in from_langs],
-            target_langs=[LANGUAGE_MAP.get(lang.lower(), lang).upper() for lang in to_langs] if to_langs else None,
-            poses=[p for p in poses] if poses else None,
-        )
+        try:
+            synset_ids = await aclient.get_synset_ids(
+                lemma=word,
+                search_langs=[LANGUAGE_MAP.get(lang.lower(), lang).upper() for lang in from_langs],
+                target_langs=(
+                    [LANGUAGE_MAP.get(lang.lower(), lang).upper() for lang in to_langs]
+                    if to_langs else None
+                ),
+                poses=[p for p in poses if p] if poses else None,
+            )
+        except BudgetExhaustedError as e:
+            return e.to_result()
         
         return {
             "word": word,
@@ -57,22 +66,105 @@ def register_synset_tools(mcp: Any, client: BabelNetHTTPClient) -> None:
         }
     
     @mcp.tool()
-    def get_synset_by_id(
-        synset_id: str
+    async def get_synsets_batch(
+        words: List[Union[str, Dict[str, Any]]],
+        from_langs: List[str] = ["en"],
+        to_langs: Optional[List[str]] = None,
+        pos: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Retrieve the synsets of many words in a single call.
+        
+        Identical lookups in the batch are sent only once, and distinct lookups
+        run concurrently.
+        
+        NOTE: Each distinct lookup consumes 1 Babelcoin (daily limit: 1000).
+        
+        Args:
+            words: Words to search for. Each item is a word, or an object with "word"
+                and optional "from_langs", "to_langs" and "pos" overriding the defaults
+            from_langs: Default source languages. Default: ['en']
+            to_langs: Default target languages for translations (optional)
+            pos: Default part-of-speech: 'noun', 'verb', 'adjective', 'adverb' (optional)
+        
+        Returns:
+            Dictionary with one result per input item, in order. Failed items carry
+            an "error" field instead of synsets.
+        """
+        queries = parse_batch_items(words, from_langs, to_langs, pos)
+        unique = list(dict.fromkeys(queries))
+        responses = await asyncio.gather(
+            *(
+                aclient.get_synset_ids(q.word, q.search_langs, q.target_langs, q.poses)
+                for q in unique
+            ),
+            return_exceptions=True,
+        )
+        by_query = dict(zip(unique, responses))
+        
+        results: List[Dict[str, Any]] = []
+        for query in queries:
+            response = by_query[query]
+            if isinstance(response, BaseException):
+                results.append(error_result(query.word, response))
+                continue
+            results.append({
+                "word": query.word,
+                "from_languages": query.from_languages,
+                "to_languages": query.to_languages,
+                "pos": query.pos,
+                "total_synsets": len(response),
+                "synsets": response,
+            })
+        
+        return {
+            "total_words": len(queries),
+            "unique_lookups": len(unique),
+            "results": results,
+        }
+    
+    @mcp.tool()
+    async def get_synset_by_id(
+        synset_id: str,
+        fields: Optional[List[str]] = None,
+        langs: Optional[List[str]] = None,
+        sources: Optional[List[str]] = None,
+        max_senses: Optional[int] = None,
+        compact: bool = False
     ) -> Dict[str, Any]:
         """
         Retrieve a specific synset by its BabelNet ID.
         Useful for getting complete details about a specific concept.
         
+        Full synsets are large (senses in every language, images, categories);
+        use the projection options to keep only what you need.
+        
         NOTE: Each request consumes 1 Babelcoin.
         
         Args:
             synset_id: BabelNet synset ID (e.g., 'bn:00000356n')
+            fields: Top-level fields to return, e.g. ['senses', 'glosses'] (optional)
+            langs: Only keep senses, glosses and examples in these languages (optional)
+            sources: Only keep senses and glosses from these sources, e.g. ['WN'] (optional)
+            max_senses: Maximum number of senses to return (optional)
+            compact: Return only senses, glosses and synset type, in reduced form
         
         Returns:
             Dictionary with detailed synset information
         """
-        synset = client.get_synset(synset_id)
-        
-        
-        return synset
+        tags = [LANGUAGE_MAP.get(lang.lower(), lang).upper() for lang in langs] if langs else None
+        view = view_key(
+            fields=fields, langs=tags, sources=sources, max_senses=max_senses, compact=compact
+        )
+        try:
+            if not view:
+                return await aclient.get_synset(synset_id)
+            shaped: Dict[str, Any] = await aclient.get_view(
+                "getSynset",
+                {"id": synset_id},
+                view,
+                lambda synset: project_synset(synset, fields, tags, sources, max_senses, compact),
+            )
+            return shaped
+        except BudgetExhaustedError as e:
+            return e.to_result()
@@ -0,0 +1,195 @@
+"""
+Tool for translating a word into many languages at once.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..async_client import AsyncBabelNetClient
+from ..budget import BudgetExhaustedError
+from ..constants import LANGUAGE_MAP, POS_MAP
+from ..http_client import BabelNetHTTPClient
+from ..model import Synset, tag_text
+
+logger = logging.getLogger("babelnet-mcp")
+
+# getSynset accepts at most this many target languages per request
+TARGET_LANG_BATCH = 3
+
+# Supported language tags split into fixed batches, so that a language is always
+# requested together with the same neighbors and its batch is cached once
+_LANGUAGE_BATCHES: List[Tuple[str, ...]] = [
+    tuple(list(LANGUAGE_MAP.values())[i:i + TARGET_LANG_BATCH])
+    for i in range(0, len(LANGUAGE_MAP), TARGET_LANG_BATCH)
+]
+
+# Relative trust in lemma sources when ranking translations
+_SOURCE_WEIGHTS = {"WN": 1.0, "OMWN": 1.0, "WIKI": 0.8, "WIKIDATA": 0.7, "WIKIRED": 0.5}
+_DEFAULT_SOURCE_WEIGHT = 0.6
+
+
+def language_batches(tags: List[str]) -> List[Tuple[str, ...]]:
+    """
+    Group target languages into the fixed batches that cover them.
+
+    Args:
+        tags: Uppercase language tags
+
+    Returns:
+        The batches to request, in order; unsupported tags get a batch of their own
+    """
+    batches: Dict[Tuple[str, ...], None] = {}
+    for tag in tags:
+        batch = next((b for b in _LANGUAGE_BATCHES if tag in b), (tag,))
+        batches.setdefault(batch)
+    return list(batches)
+
+
+def rank_translations(
+    synsets: List[Synset], targets: List[str], max_lemmas: int
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Rank the lemmas of the candidate synsets per target language.
+
+    A lemma scores higher when it comes from a top-ranked synset, from a curated
+    source such as WordNet, and when it lexicalizes several candidate synsets.
+
+    Args:
+        synsets: Candidate synsets, most relevant first
+        targets: Uppercase target language tags
+        max_lemmas: Maximum number of lemmas per language
+
+    Returns:
+        Target language tag -> ranked lemmas with score and synset IDs
+    """
+    scores: Dict[str, Dict[str, Dict[str, Any]]] = {tag: {} for tag in targets}
+    for rank, synset in enumerate(synsets):
+        for sense in synset.senses:
+            entries = scores.get(tag_text(sense.language))
+            if entries is None:
+                continue
+            lemma = sense.lemma.replace("_", " ")
+            entry = entries.setdefault(lemma.lower(), {"lemma": lemma, "score": 0.0, "synsets": []})
+            if synset.id in entry["synsets"]:
+                continue
+            weight = _SOURCE_WEIGHTS.get(tag_text(sense.source), _DEFAULT_SOURCE_WEIGHT)
+            entry["score"] += weight / (rank + 1)
+            entry["synsets"].append(synset.id)
+    return {
+        tag: [
+            {"lemma": e["lemma"], "score": round(e["score"], 3), "synset_ids": e["synsets"]}
+            for e in sorted(entries.values(), key=lambda e: -e["score"])[:max_lemmas]
+        ]
+        for tag, entries in scores.items()
+    }
+
+
+def _merge_senses(synset_id: str, payloads: List[Dict[str, Any]]) -> Synset:
+    """Combine the per-batch payloads of one synset into a single Synset."""
+    merged = Synset.from_json(payloads[0], synset_id)
+    seen = {(s.language, s.lemma) for s in merged.senses}
+    extra = []
+    for payload in payloads[1:]:
+        for sense in Synset.from_json(payload, synset_id).senses:
+            if (sense.language, sense.lemma) not in seen:
+                seen.add((sense.language, sense.lemma))
+                extra.append(sense)
+    merged.senses = merged.senses + tuple(extra)
+    return merged
+
+
+def register_translate_tools(
+    mcp: Any,
+    client: BabelNetHTTPClient,
+    async_client: Optional[AsyncBabelNetClient] = None
+) -> None:
+    """Register the translation tool."""
+    aclient = async_client or AsyncBabelNetClient(client)
+
+    @mcp.tool()
+    async def translate_word(
+        word: str,
+        to_langs: List[str],
+        from_lang: str = "en",
+        pos: Optional[str] = None,
+        max_synsets: int = 5,
+        max_lemmas: int = 5
+    ) -> Dict[str, Any]:
+        """
+        Translate a word into several languages at once.
+
+        The word's top synsets are fetched with all the target languages in as few
+        requests as possible, and the lemmas of each language are ranked across them.
+        Languages are requested in fixed groups of three, so once a group is cached,
+        translating into any language of that group costs nothing.
+
+        NOTE: Costs 1 Babelcoin for the lookup plus 1 per synset and group of three
+        target languages, for anything not cached (daily limit: 1000).
+
+        Args:
+            word: The word to translate
+            to_langs: Target languages (e.g., ['it', 'fr', 'de'])
+            from_lang: Language of the word. Default: 'en'
+            pos: Part-of-speech: 'noun', 'verb', 'adjective', 'adverb' (optional)
+            max_synsets: Number of top meanings to translate (default: 5)
+            max_lemmas: Maximum number of translations per language (default: 5)
+
+        Returns:
+            Dictionary containing:
+            - word, from_lang, pos
+            - translations: target language -> ranked lemmas with score and synset IDs
+            - synsets: the meanings considered, with a gloss in the source language
+        """
+        source = LANGUAGE_MAP.get(from_lang.lower(), from_lang).upper()
+        targets = list(dict.fromkeys(
+            LANGUAGE_MAP.get(lang.lower(), lang).upper() for lang in to_langs
+        ))
+        poses = [POS_MAP[pos.lower()]] if pos and pos.lower() in POS_MAP else None
+        logger.info(f"Translating '{word}' from {source} into {targets}")
+
+        try:
+            items = await aclient.get_synset_ids(lemma=word, search_langs=[source], poses=poses)
+        except BudgetExhaustedError as e:
+            return e.to_result()
+        synset_ids = [item["id"] for item in items if item.get("id")][:max_synsets]
+
+        # One request per synset and language batch; the source language rides along
+        batches = language_batches(targets + [source])
+        requests = [(sid, batch) for sid in synset_ids for batch in batches]
+        responses = await asyncio.gather(
+            *(aclient.get_synset(sid, list(batch)) for sid, batch in requests),
+            return_exceptions=True,
+        )
+        payloads: Dict[str, List[Dict[str, Any]]] = {sid: [] for sid in synset_ids}
+        budget_exhausted = False
+        for (sid, _), response in zip(requests, responses):
+            if isinstance(response, BudgetExhaustedError):
+                budget_exhausted = True
+            elif isinstance(response, BaseException):
+                logger.warning(f"Failed to load synset {sid}: {response}")
+            else:
+                payloads[sid].append(response)
+
+        synsets = [_merge_senses(sid, payloads[sid]) for sid in synset_ids if payloads[sid]]
+        translations = rank_translations(synsets, targets, max_lemmas)
+        result: Dict[str, Any] = {
+            "word": word,
+            "from_lang": from_lang,
+            "pos": pos,
+            "translations": {
+                lang: translations[LANGUAGE_MAP.get(lang.lower(), lang).upper()]
+                for lang in to_langs
+            },
+            "synsets": [
+                {
+                    "synset_id": synset.id,
+                    "pos": tag_text(synset.pos),
+                    "gloss": next(iter(synset.glosses_in(source)), None),
+                }
+                for synset in synsets
+            ],
+        }
+        if budget_exhausted:
+            result["budget_exhausted"] = True
+        return result
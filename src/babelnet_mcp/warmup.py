@@ -0,0 +1,195 @@
+"""
+Cache warm-up: prefetch hot concepts and their neighbors within a coin budget.
+"""
+
+import asyncio
+import logging
+from pathlib import Path
+from typing import Any, Awaitable, Dict, List, Optional, Tuple
+
+from .async_client import AsyncBabelNetClient
+from .budget import BudgetExhaustedError
+from .http_client import BabelNetHTTPClient
+
+logger = logging.getLogger(__name__)
+
+
+def read_seed_file(path: Path) -> List[str]:
+    """
+    Read seeds from a text file.
+
+    One seed per line: a synset ID ('bn:...') or a lemma. Blank lines and
+    lines starting with '#' are ignored.
+
+    Args:
+        path: Seed file
+
+    Returns:
+        Seeds in file order, without duplicates
+    """
+    seeds: Dict[str, None] = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            seed = line.strip()
+            if seed and not seed.startswith('#'):
+                seeds[seed] = None
+    return list(seeds)
+
+
+def seeds_from_cache(client: BabelNetHTTPClient, limit: int) -> List[str]:
+    """
+    Mine the most frequently hit lemmas and synsets from the cache.
+
+    Args:
+        client: Client whose cache is inspected
+        limit: Maximum number of seeds
+
+    Returns:
+        Seeds, most used first
+    """
+    if client.cache is None:
+        return []
+    seeds: Dict[str, None] = {}
+    for path, params, _ in client.cache.entries():
+        if path in ("getSynset", "getOutgoingEdges") and params.get("id"):
+            seeds[str(params["id"])] = None
+        elif path in ("getSynsetIds", "getSenses") and params.get("lemma"):
+            seeds[str(params["lemma"])] = None
+        if len(seeds) >= limit:
+            break
+    return list(seeds)
+
+
+class Prefetcher:
+    """Populates the cache for seed concepts and their 1-hop neighbors."""
+
+    def __init__(
+        self,
+        client: BabelNetHTTPClient,
+        coins: int,
+        search_langs: Optional[List[str]] = None,
+        neighbors: bool = True,
+        async_client: Optional[AsyncBabelNetClient] = None,
+    ) -> None:
+        """
+        Initialize the prefetcher.
+
+        Args:
+            client: Client whose cache is warmed
+            coins: Maximum number of upstream (coin-costing) calls
+            search_langs: Languages used to resolve lemma seeds (default: ['EN'])
+            neighbors: Also fetch the synsets one edge away from each seed
+            async_client: Async client to fetch with (default: a new one)
+        """
+        self.client = client
+        self.aclient = async_client or AsyncBabelNetClient(client)
+        self.coins = coins
+        self.search_langs = [lang.upper() for lang in search_langs or ["EN"]]
+        self.neighbors = neighbors
+        self.spent = 0
+        self.exhausted = False
+        self.fetched: Dict[str, int] = {}
+
+    def _lemma_request(self, lemma: str) -> Tuple[str, Dict[str, Any]]:
+        # Same normalized parameters as the client's lookup, so they match its cache key
+        return "getSynsetIds", self.client.lemma_query(lemma, self.search_langs)
+
+    def _is_free(self, path: str, params: Dict[str, Any]) -> bool:
+        client = self.client
+        if client.cache is not None and client.cache.contains(path, params):
+            return True
+        return client.local_store is not None and client.local_store.lookup(path, params)[0]
+
+    def _affordable(
+        self, requests: List[Tuple[str, Dict[str, Any]]]
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """Drop already cached requests and keep as many others as the coins allow."""
+        if self.exhausted:
+            return []
+        todo = [(path, params) for path, params in requests if not self._is_free(path, params)]
+        todo = todo[:max(0, self.coins - self.spent)]
+        self.spent += len(todo)
+        return todo
+
+    async def _fetch_all(self, requests: List[Tuple[str, Dict[str, Any]]]) -> List[Any]:
+        calls: List[Awaitable[Any]] = []
+        for path, params in requests:
+            if path == "getSynsetIds":
+                calls.append(self.aclient.get_synset_ids(params["lemma"], params["searchLang"]))
+            elif path == "getSynset":
+                calls.append(self.aclient.get_synset(params["id"]))
+            else:
+                calls.append(self.aclient.get_outgoing_edges(params["id"]))
+            self.fetched[path] = self.fetched.get(path, 0) + 1
+        results = await asyncio.gather(*calls, return_exceptions=True)
+        for (path, params), result in zip(requests, results):
+            if isinstance(result, BudgetExhaustedError):
+                self.exhausted = True
+            elif isinstance(result, BaseException):
+                logger.warning(f"Prefetch of {path} {params} failed: {result}")
+        return results
+
+    async def _synset_ids(self, lemma: str) -> List[str]:
+        # Only resolve lemmas that no longer cost a coin
+        if not self._is_free(*self._lemma_request(lemma)):
+            return []
+        try:
+            items = await self.aclient.get_synset_ids(lemma, self.search_langs)
+        except Exception:
+            return []
+        return [item["id"] for item in items if item.get("id")]
+
+    async def run(self, seeds: List[str]) -> Dict[str, Any]:
+        """
+        Warm the cache for the given seeds.
+
+        Seeds are processed in order, so the most important ones should come first.
+
+        Args:
+            seeds: Synset IDs ('bn:...') and/or lemmas
+
+        Returns:
+            Summary with the coins spent and the requests issued per endpoint
+        """
+        lemmas = [s for s in seeds if not s.startswith("bn:")]
+        synset_ids: Dict[str, None] = {s: None for s in seeds if s.startswith("bn:")}
+
+        # 1. Resolve lemma seeds to synset IDs
+        await self._fetch_all(self._affordable([self._lemma_request(lemma) for lemma in lemmas]))
+        for ids in await asyncio.gather(*(self._synset_ids(lemma) for lemma in lemmas)):
+            synset_ids.update((sid, None) for sid in ids)
+
+        # 2. Seed synsets and their edges
+        requests: List[Tuple[str, Dict[str, Any]]] = []
+        for sid in synset_ids:
+            requests.append(("getSynset", {"id": sid}))
+            requests.append(("getOutgoingEdges", {"id": sid}))
+        await self._fetch_all(self._affordable(requests))
+
+        # 3. One-hop neighbors
+        neighbor_ids: Dict[str, None] = {}
+        if self.neighbors:
+            for sid in synset_ids:
+                if not self._is_free("getOutgoingEdges", {"id": sid}):
+                    continue
+                try:
+                    edges = await self.aclient.get_outgoing_edges(sid)
+                except Exception:
+                    continue
+                for edge in edges:
+                    target = edge.get("target")
+                    if target and target not in synset_ids:
+                        neighbor_ids[target] = None
+            await self._fetch_all(self._affordable(
+                [("getSynset", {"id": sid}) for sid in neighbor_ids]
+            ))
+
+        return {
+            "seeds": len(seeds),
+            "synsets": len(synset_ids),
+            "neighbors": len(neighbor_ids),
+            "coins_spent": self.spent,
+            "coin_limit": self.coins,
+            "budget_exhausted": self.exhausted,
+            "fetched": self.fetched,
+        }
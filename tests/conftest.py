@@ -0,0 +1,101 @@
+"""
+Shared fixtures: a recording stand-in for BabelNetHTTPClient and a minimal MCP.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pytest
+
+from babelnet_mcp.cache import ResponseCache
+from babelnet_mcp.http_client import BabelNetHTTPClient
+
+
+def fake_synset_ids(lemma: str, count: int = 3) -> List[Dict[str, Any]]:
+    return [{"id": f"bn:{i:08d}n", "pos": "NOUN", "source": "BABELNET"} for i in range(count)]
+
+
+def fake_synset(synset_id: str) -> Dict[str, Any]:
+    return {
+        "senses": [{
+            "type": "BabelSense",
+            "properties": {
+                "fullLemma": "bank",
+                "language": "EN",
+                "pos": "NOUN",
+                "synsetID": {"id": synset_id, "pos": "NOUN", "source": "BABELNET"},
+                "lemma": {"lemma": "bank", "type": "HIGH_QUALITY"},
+            },
+        }],
+        "glosses": [{"source": "WN", "language": "EN", "gloss": f"Gloss of {synset_id}"}],
+    }
+
+
+class RecordingClient(BabelNetHTTPClient):
+    """
+    BabelNetHTTPClient that records upstream requests instead of sending them.
+
+    Everything above the network (cache, coalescing, parameter building) is the
+    real client code; only _fetch is replaced with canned responses.
+    """
+
+    def __init__(self, synsets_per_lemma: int = 3, cache: Optional[ResponseCache] = None) -> None:
+        super().__init__("test-key", cache=cache)
+        self.synsets_per_lemma = synsets_per_lemma
+        self.requests: List[Tuple[str, Dict[str, Any]]] = []
+        # Count only the requests tools make, not the one-off version check
+        self.version_checked = True
+
+    def _fetch(self, path: str, params: Dict[str, Any]) -> Any:
+        self.requests.append((path, dict(params)))
+        if path in ("getSynsetIds", "getSenses"):
+            data: Any = fake_synset_ids(params["lemma"], self.synsets_per_lemma)
+        elif path == "getSynset":
+            data = fake_synset(params["id"])
+        elif path == "getOutgoingEdges":
+            data = []
+        else:
+            data = {"version": "V_TEST"}
+        if self.cache is not None:
+            self.cache.put(path, params, data)
+        return data
+
+    def count(self, path: Optional[str] = None) -> int:
+        """Number of upstream requests, optionally for one endpoint."""
+        return sum(1 for p, _ in self.requests if path is None or p == path)
+
+
+class FakeMCP:
+    """Collects the functions registered with @mcp.tool() and @mcp.resource()."""
+
+    def __init__(self) -> None:
+        self.tools: Dict[str, Callable[..., Any]] = {}
+        self.resources: Dict[str, Callable[..., Any]] = {}
+
+    def tool(self, *args: Any, **kwargs: Any) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+            self.tools[fn.__name__] = fn
+            return fn
+        return decorator
+
+    def resource(
+        self, uri: str, *args: Any, **kwargs: Any
+    ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+            self.resources[uri] = fn
+            return fn
+        return decorator
+
+
+@pytest.fixture
+def client() -> RecordingClient:
+    return RecordingClient()
+
+
+@pytest.fixture
+def cached_client() -> RecordingClient:
+    return RecordingClient(cache=ResponseCache(persistent=False))
+
+
+@pytest.fixture
+def mcp() -> FakeMCP:
+    return FakeMCP()
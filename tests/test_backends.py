@@ -0,0 +1,124 @@
+"""
+Tests for backend routing and fallback.
+"""
+
+import json
+import time
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from babelnet_mcp.backends import Backend, RestBackend, TieredRouter, is_public_url
+from babelnet_mcp.budget import BudgetManager
+from babelnet_mcp.cache import ResponseCache
+from babelnet_mcp.http_client import BabelNetHTTPClient
+
+
+class FakeBackend(Backend):
+    def __init__(
+        self, name: str, costs_coins: bool = False, delay: float = 0.0,
+        hit: bool = True, fail: bool = False,
+    ) -> None:
+        self.name = name
+        self.costs_coins = costs_coins
+        self.delay = delay
+        self.hit = hit
+        self.fail = fail
+        self.calls = 0
+
+    def fetch(self, path: str, params: Dict[str, Any]) -> Tuple[bool, Any]:
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError(f"{self.name} is down")
+        return self.hit, {"from": self.name} if self.hit else None
+
+
+def test_free_and_fast_backends_come_first() -> None:
+    public = FakeBackend("public", costs_coins=True)
+    slow = FakeBackend("slow", delay=0.01)
+    fast = FakeBackend("fast")
+    router = TieredRouter([public, slow, fast])
+    for _ in range(3):
+        router.fetch("getSynset", {"id": "bn:1n"})
+    # Both free backends got a first sample, then the faster one took over
+    assert [b.name for b in router.order()] == ["fast", "slow", "public"]
+    assert public.calls == 0
+
+
+def test_falls_back_on_miss_and_error() -> None:
+    local = FakeBackend("local", hit=False)
+    mirror = FakeBackend("mirror", fail=True)
+    public = FakeBackend("public", costs_coins=True)
+    router = TieredRouter([local, mirror, public])
+    backend, value = router.fetch("getSynset", {"id": "bn:1n"})
+    assert backend is public and value == {"from": "public"}
+    # The failed mirror is tried last while it cools down
+    assert [b.name for b in router.order()] == ["local", "public", "mirror"]
+    assert router.stats()[-1]["cooling_down"] is True
+
+
+def test_all_backends_failing_raises_last_error() -> None:
+    router = TieredRouter([FakeBackend("a", fail=True), FakeBackend("b", fail=True)])
+    with pytest.raises(ConnectionError, match="is down"):
+        router.fetch("getSynset", {"id": "bn:1n"})
+
+
+class FakeResponse:
+    def __init__(self, body: Any) -> None:
+        self.content = json.dumps(body).encode("utf-8")
+
+
+def test_only_coin_costing_backends_charge_the_budget(tmp_path: Any) -> None:
+    requested: List[str] = []
+
+    def request(url: str, query: Dict[str, Any]) -> FakeResponse:
+        requested.append(url)
+        return FakeResponse({"senses": [], "glosses": []})
+
+    budget = BudgetManager(daily_limit=10, path=None, rate=0)
+    mirror = RestBackend("mirror", "http://babelnet.lan/v9", request, "key", budget=budget)
+    public = RestBackend("public", "https://babelnet.io/v9", request, "key", budget=budget)
+    client = BabelNetHTTPClient(
+        "key", cache=ResponseCache(persistent=False), budget=budget, backends=[mirror, public]
+    )
+    client.get_synset("bn:00000001n")
+    client.get_synset("bn:00000001n")
+    # The first fetch also checks the BabelNet version, on the free mirror too
+    assert requested == ["http://babelnet.lan/v9/getVersion", "http://babelnet.lan/v9/getSynset"]
+    assert budget.remaining() == 10
+    assert client.stats()["backends"][0]["name"] == "mirror"
+
+
+def test_public_hosts() -> None:
+    assert is_public_url("https://babelnet.io/v9/service")
+    assert not is_public_url("http://babelnet.lan:8080/v9")
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int) -> None:
+        super().__init__(f"HTTP {status}")
+        self.response = type("Response", (), {"status_code": status})()
+
+
+def test_client_errors_are_raised_without_fallback() -> None:
+    class RejectingBackend(FakeBackend):
+        status = 404
+
+        def fetch(self, path: str, params: Dict[str, Any]) -> Tuple[bool, Any]:
+            self.calls += 1
+            raise HTTPError(self.status)
+
+    mirror = RejectingBackend("mirror")
+    public = FakeBackend("public", costs_coins=True)
+    router = TieredRouter([mirror, public])
+
+    with pytest.raises(HTTPError, match="404"):
+        router.fetch("getSynset", {"id": "bn:missing"})
+    assert public.calls == 0
+    assert router.stats()[0]["name"] == "mirror"
+    assert router.stats()[0]["cooling_down"] is False
+
+    mirror.status = 503
+    backend, _ = router.fetch("getSynset", {"id": "bn:1n"})
+    assert backend is public
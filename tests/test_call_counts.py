@@ -0,0 +1,185 @@
+"""
+Regression tests for the number of upstream BabelNet calls made per tool invocation.
+
+Every upstream call costs a Babelcoin, so a change that multiplies API traffic
+must fail here.
+"""
+
+import asyncio
+from pathlib import Path
+from typing import Any
+
+from babelnet_mcp.cache import ResponseCache
+from babelnet_mcp.singleflight import SingleFlight
+from babelnet_mcp.tools import (
+    register_definition_tool,
+    register_sense_tools,
+    register_synset_tools,
+)
+
+from conftest import FakeMCP, RecordingClient
+
+
+def run(coro: Any) -> Any:
+    return asyncio.run(coro)
+
+
+def register(mcp: FakeMCP, client: RecordingClient) -> None:
+    register_definition_tool(mcp, client)
+    register_synset_tools(mcp, client)
+    register_sense_tools(mcp, client)
+
+
+def test_get_synsets_calls_get_synset_ids_once(mcp: FakeMCP, client: RecordingClient) -> None:
+    register(mcp, client)
+    result = run(mcp.tools["get_synsets"]("bank", from_langs=["en"], to_langs=["it"]))
+    assert result["total_synsets"] == 3
+    assert client.requests == [
+        ("getSynsetIds", {"lemma": "bank", "searchLang": ["EN"], "targetLang": ["IT"]})
+    ]
+
+
+def test_get_definition_fetches_each_synset_once(mcp: FakeMCP, client: RecordingClient) -> None:
+    register(mcp, client)
+    result = run(mcp.tools["get_definition"]("bank"))
+    assert result["total_meanings"] == 3
+    assert client.count("getSynsetIds") == 1
+    assert client.count("getSynset") == 3
+    assert client.count() == 4
+
+
+def test_get_definition_respects_max_definitions(mcp: FakeMCP) -> None:
+    client = RecordingClient(synsets_per_lemma=30)
+    register(mcp, client)
+    result = run(mcp.tools["get_definition"]("bank", max_definitions=5))
+    assert result["total_meanings"] == 5
+    assert client.count() == 1 + 5
+
+
+def test_get_senses_calls_get_senses_once(mcp: FakeMCP, client: RecordingClient) -> None:
+    register(mcp, client)
+    run(mcp.tools["get_senses"]("bank", from_langs=["en", "it"], pos="noun"))
+    assert client.requests == [
+        ("getSenses", {"lemma": "bank", "searchLang": ["EN", "IT"], "pos": ["NOUN"]})
+    ]
+
+
+def test_batches_share_lookups_and_echo_the_given_languages(
+    mcp: FakeMCP, client: RecordingClient
+) -> None:
+    register(mcp, client)
+    words = ["bank", {"word": "bank", "from_langs": ["EN"]}, "bank"]
+
+    synsets = run(mcp.tools["get_synsets_batch"](words, from_langs=["en"]))
+    definitions = run(mcp.tools["get_definitions_batch"](words, from_langs=["en"]))
+
+    assert synsets["unique_lookups"] == definitions["unique_lookups"] == 1
+    assert client.count("getSynsetIds") == 2
+    for result in (synsets, definitions):
+        assert [r["from_languages"] for r in result["results"]] == [["en"], ["EN"], ["en"]]
+
+
+def test_get_synset_by_id_calls_get_synset_once(mcp: FakeMCP, client: RecordingClient) -> None:
+    register(mcp, client)
+    run(mcp.tools["get_synset_by_id"]("bn:00008364n"))
+    assert client.requests == [("getSynset", {"id": "bn:00008364n"})]
+
+
+def test_repeated_calls_are_served_from_cache(mcp: FakeMCP, cached_client: RecordingClient) -> None:
+    register(mcp, cached_client)
+    run(mcp.tools["get_definition"]("bank"))
+    run(mcp.tools["get_synsets"]("bank"))
+    run(mcp.tools["get_synset_by_id"]("bn:00000000n"))
+    before = cached_client.count()
+    run(mcp.tools["get_definition"]("bank"))
+    run(mcp.tools["get_synsets"]("bank"))
+    run(mcp.tools["get_synset_by_id"]("bn:00000000n"))
+    assert cached_client.count() == before
+
+
+def test_concurrent_identical_calls_are_coalesced(mcp: FakeMCP, client: RecordingClient) -> None:
+    register(mcp, client)
+
+    async def many() -> None:
+        await asyncio.gather(*(mcp.tools["get_synset_by_id"]("bn:00000001n") for _ in range(5)))
+
+    run(many())
+    assert client.count("getSynset") == 1
+    assert client.flights.stats()["coalesced"] == 4
+
+
+def test_cancelling_the_first_caller_does_not_cancel_the_others() -> None:
+    flights = SingleFlight()
+    calls = []
+
+    async def fetch() -> str:
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "synset"
+
+    async def scenario() -> Any:
+        leader = asyncio.ensure_future(flights.do_async("getSynset", fetch))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(flights.do_async("getSynset", fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+        result = await waiter
+        assert leader.cancelled()
+        return result
+
+    assert run(scenario()) == "synset"
+    assert len(calls) == 1
+    assert flights.stats()["in_flight"] == 0
+
+
+def test_call_is_cancelled_once_every_caller_has_gone() -> None:
+    flights = SingleFlight()
+    finished = []
+
+    async def fetch() -> None:
+        await asyncio.sleep(0.05)
+        finished.append(1)
+
+    async def scenario() -> None:
+        callers = [asyncio.ensure_future(flights.do_async("getSynset", fetch)) for _ in range(2)]
+        await asyncio.sleep(0)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.sleep(0.1)
+
+    run(scenario())
+    assert finished == []
+    assert flights.stats()["in_flight"] == 0
+
+
+def test_first_fetch_checks_the_babelnet_version_once(mcp: FakeMCP) -> None:
+    cache = ResponseCache(persistent=False)
+    cache.sync_version("V_OLD")
+    cache.put("getSynset", {"id": "bn:00000001n"}, {"senses": [], "glosses": []})
+    client = RecordingClient(cache=cache)
+    client.version_checked = False
+    register(mcp, client)
+
+    run(mcp.tools["get_synsets"]("bank"))
+    run(mcp.tools["get_synsets"]("river"))
+
+    assert [path for path, _ in client.requests] == ["getVersion", "getSynsetIds", "getSynsetIds"]
+    assert cache.babelnet_version() == "V_TEST"
+    assert not cache.contains("getSynset", {"id": "bn:00000001n"})
+
+
+def test_version_check_is_paid_once_across_processes(tmp_path: Path) -> None:
+    clients = []
+    for _ in range(2):
+        # One client per server process, sharing the persistent cache
+        client = RecordingClient(cache=ResponseCache(tmp_path / "cache.sqlite"))
+        client.version_checked = False
+        clients.append(client)
+
+    clients[0].get_synset_ids("bank", ["EN"])
+    clients[1].get_synset_ids("river", ["EN"])
+
+    assert [path for path, _ in clients[0].requests] == ["getVersion", "getSynsetIds"]
+    # The second process reads the version the first one cached
+    assert [path for path, _ in clients[1].requests] == ["getSynsetIds"]
+    assert clients[1].version_checked
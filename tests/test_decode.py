@@ -0,0 +1,148 @@
+"""
+Tests for selective decoding of getSynset responses.
+"""
+
+import asyncio
+import json
+from typing import Any, Dict, Iterator, List
+
+import pytest
+
+from babelnet_mcp.backends import RestBackend, TieredRouter
+from babelnet_mcp.budget import BudgetExhaustedError
+from babelnet_mcp.cache import ResponseCache
+from babelnet_mcp.decode import (
+    DEFINITION_PROJECTION,
+    VIEW_PARAM,
+    SynsetProjection,
+    decode_projected,
+    split_projection,
+)
+from babelnet_mcp.tools import register_definition_tool
+
+from conftest import FakeMCP, RecordingClient, fake_synset
+from test_backends import FakeBackend, FakeResponse
+
+
+def large_synset(languages: List[str]) -> Dict[str, Any]:
+    return {
+        "senses": [
+            {"type": "BabelSense", "properties": {
+                "fullLemma": f"lemma_{lang}_{n}", "language": lang, "pos": "NOUN",
+                "source": "WIKI", "senseKey": f"key_{n}", "frequency": n,
+                "lemma": {"lemma": f"lemma_{lang}_{n}", "type": "HIGH_QUALITY"},
+                "pronunciations": {"audios": [], "transcriptions": [f"/{n}/"]},
+            }}
+            for lang in languages for n in range(3)
+        ],
+        "glosses": [
+            {"source": "WN", "language": lang, "gloss": f"Gloss in {lang} with \"quotes\" é"}
+            for lang in languages
+        ],
+        "examples": [{"language": "EN", "example": "An example"}],
+        "images": [{"url": f"https://example.org/{n}.jpg", "thumbUrl": None} for n in range(5)],
+        "categories": [{"category": "Banks", "language": "EN"}],
+        "synsetType": "CONCEPT",
+        "bkeyConcepts": True,
+        "score": 0.5,
+    }
+
+
+def test_projection_keys_round_trip() -> None:
+    projection = SynsetProjection(["senses", "glosses"], ["lemma", "language"], ["it", "en"])
+
+    assert projection.key == "glosses,senses|language,lemma|EN,IT"
+    assert SynsetProjection.parse(projection.key) == projection
+    assert SynsetProjection.parse(SynsetProjection().key).sense_fields is None
+    assert split_projection({"id": "bn:1", VIEW_PARAM: projection.key}) == (
+        projection, {"id": "bn:1"}
+    )
+    assert split_projection({"id": "bn:1"}) == (None, {"id": "bn:1"})
+
+
+def test_decodes_only_the_projected_parts() -> None:
+    payload = large_synset(["EN", "IT", "DE"])
+    body = json.dumps(payload).encode("utf-8")
+    projection = SynsetProjection(["glosses", "senses", "synsetType"], ["lemma"], ["en", "it"])
+
+    decoded = decode_projected(body, projection)
+
+    assert decoded == projection.apply(payload)
+    assert decode_projected(body, projection, stream=True) == decoded
+    assert set(decoded) == {"glosses", "senses", "synsetType"}
+    assert [g["language"] for g in decoded["glosses"]] == ["EN", "IT"]
+    assert len(decoded["senses"]) == 6
+    assert decoded["senses"][0] == {
+        "type": "BabelSense",
+        "properties": {"lemma": {"lemma": "lemma_EN_0", "type": "HIGH_QUALITY"}},
+    }
+    # Chunk boundaries anywhere in the body give the same result
+    chunks = (body[i:i + 7] for i in range(0, len(body), 7))
+    assert decode_projected(chunks, projection, stream=True) == decoded
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_non_synset_bodies_are_kept(stream: bool) -> None:
+    message = b'{"message": "Your key is not valid", "senses": []}'
+
+    assert decode_projected(b"[1, 2.5, null]", DEFINITION_PROJECTION, stream) == [1, 2.5, None]
+    assert decode_projected(message, DEFINITION_PROJECTION, stream) == {
+        "message": "Your key is not valid", "senses": []
+    }
+
+
+class StreamedResponse(FakeResponse):
+    def iter_content(self, chunk_size: Any = None) -> Iterator[bytes]:
+        return (self.content[i:i + 64] for i in range(0, len(self.content), 64))
+
+    def close(self) -> None:
+        pass
+
+
+def test_rest_backend_projects_and_still_detects_the_quota() -> None:
+    bodies = [large_synset(["EN", "FR"]), {"message": "Daily limit exceeded"}]
+
+    def request(url: str, query: Dict[str, Any], **options: Any) -> FakeResponse:
+        assert VIEW_PARAM not in query
+        return StreamedResponse(bodies.pop(0))
+
+    backend = RestBackend("mirror", "http://babelnet.lan/v9", request, "key", stream=True)
+    params = DEFINITION_PROJECTION.params({"id": "bn:1"})
+
+    hit, value = backend.fetch("getSynset", params)
+
+    assert hit and set(value) == {"glosses", "senses"}
+    assert set(value["senses"][0]["properties"]) == {"language", "lemma", "pos", "source"}
+    with pytest.raises(BudgetExhaustedError):
+        backend.fetch("getSynset", params)
+
+
+def test_router_projects_for_backends_that_cannot() -> None:
+    class FullBackend(FakeBackend):
+        def fetch(self, path: str, params: Dict[str, Any]) -> Any:
+            assert VIEW_PARAM not in params
+            return True, large_synset(["EN"])
+
+    router = TieredRouter([FullBackend("local")])
+
+    _, value = router.fetch("getSynset", SynsetProjection(["glosses"]).params({"id": "bn:1"}))
+
+    assert value == {"glosses": large_synset(["EN"])["glosses"]}
+
+
+def test_definitions_use_cached_full_synsets_and_cache_projections(mcp: FakeMCP) -> None:
+    client = RecordingClient(cache=ResponseCache(persistent=False))
+    client.cache.put("getSynset", {"id": "bn:00000000n"}, fake_synset("bn:00000000n"))
+    register_definition_tool(mcp, client)
+
+    first = asyncio.run(mcp.tools["get_definition"]("bank"))
+    second = asyncio.run(mcp.tools["get_definition"]("bank"))
+
+    assert first == second
+    assert [d["main_sense"] for d in first["definitions"]] == ["bank"] * 3
+    # The cached full synset answered the first one; the others were fetched once, projected
+    assert client.count("getSynset") == 2
+    assert all(VIEW_PARAM in params for path, params in client.requests if path == "getSynset")
+    assert client.cache.contains(
+        "getSynset", DEFINITION_PROJECTION.params({"id": "bn:00000001n"})
+    )
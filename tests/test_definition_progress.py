@@ -0,0 +1,75 @@
+"""
+Tests for progress notifications and early cutoff in get_definition.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Tuple
+
+from babelnet_mcp.async_client import AsyncBabelNetClient
+from babelnet_mcp.tools import register_definition_tool
+
+from conftest import FakeMCP, RecordingClient
+
+
+class SlowClient(RecordingClient):
+    """RecordingClient whose requests take a while, like real round-trips."""
+
+    def _fetch(self, path: str, params: Dict[str, Any]) -> Any:
+        time.sleep(0.02)
+        return super()._fetch(path, params)
+
+
+class FakeContext:
+    """Records the notifications a tool sends through the FastMCP Context."""
+
+    def __init__(self) -> None:
+        self.progress: List[Tuple[float, float]] = []
+        self.messages: List[str] = []
+
+    async def report_progress(self, progress: float, total: float) -> None:
+        self.progress.append((progress, total))
+
+    async def info(self, message: str) -> None:
+        self.messages.append(message)
+
+
+def test_reports_each_definition(mcp: FakeMCP, client: RecordingClient) -> None:
+    register_definition_tool(mcp, client)
+    ctx = FakeContext()
+    result = asyncio.run(mcp.tools["get_definition"]("bank", ctx=ctx))
+    assert result["total_meanings"] == 3
+    assert ctx.progress == [(0, 3), (1, 3), (2, 3), (3, 3)]
+    assert len(ctx.messages) == 3
+    assert "stopped_early" not in result
+
+
+def test_stop_after_skips_remaining_synsets(mcp: FakeMCP) -> None:
+    client = SlowClient(synsets_per_lemma=10)
+    register_definition_tool(mcp, client, AsyncBabelNetClient(client, max_concurrency=1))
+    result: Any = asyncio.run(mcp.tools["get_definition"]("bank", stop_after=2))
+    assert result["stopped_early"] is True
+    assert result["total_meanings"] >= 2
+    ids = [d["synset_id"] for d in result["definitions"]]
+    assert ids == sorted(ids)
+    # One lookup, the two definitions needed and at most one request already running
+    assert client.count("getSynset") <= 3
+
+
+def test_stop_after_does_not_cancel_fetches_shared_with_other_calls(mcp: FakeMCP) -> None:
+    client = SlowClient(synsets_per_lemma=6)
+    register_definition_tool(mcp, client, AsyncBabelNetClient(client, max_concurrency=2))
+
+    async def both() -> Any:
+        return await asyncio.gather(
+            mcp.tools["get_definition"]("bank", stop_after=1),
+            mcp.tools["get_definition"]("bank"),
+        )
+
+    stopped, full = asyncio.run(both())
+    assert stopped["stopped_early"] is True
+    assert full["total_meanings"] == 6
+    assert "stopped_early" not in full
+    # Both calls shared the lookup and each synset fetch
+    assert client.count("getSynsetIds") == 1
+    assert client.count("getSynset") == 6
@@ -0,0 +1,53 @@
+"""
+End-to-end tests of the HTTP client against the benchmark fake server.
+"""
+
+import sys
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+pytest.importorskip("requests")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+
+from fake_server import FIXTURES_DIR, FakeBabelNet, load_fixtures  # noqa: E402
+
+from babelnet_mcp.budget import BudgetExhaustedError  # noqa: E402
+from babelnet_mcp.http_client import BabelNetHTTPClient  # noqa: E402
+from babelnet_mcp.model import Synset  # noqa: E402
+
+
+@pytest.fixture
+def fake() -> Iterator[FakeBabelNet]:
+    server = FakeBabelNet(load_fixtures([FIXTURES_DIR]), seed=0)
+    yield server
+    server.stop()
+
+
+def test_serves_fixtures_and_synthetic_responses(fake: FakeBabelNet) -> None:
+    client = BabelNetHTTPClient("key", base_url=fake.start())
+    ids = [item["id"] for item in client.get_synset_ids("bank", ["EN"])]
+    assert ids[0] == "bn:00008364n"
+    synset = Synset.from_json(client.get_synset(ids[0]), ids[0])
+    assert synset.glosses_in("EN")[0].startswith("A financial")
+    assert client.get_synset_ids("zebrafish", ["EN"])
+    assert fake.counts == {"getSynsetIds": 2, "getSynset": 1}
+
+
+def test_injected_errors_are_retried(fake: FakeBabelNet) -> None:
+    fake.error_rate = 0.5
+    client = BabelNetHTTPClient("key", base_url=fake.start(), max_retries=10, backoff_base=0.001)
+    for n in range(10):
+        client.get_synset(f"bn:{n:08d}n")
+    assert client.request_stats.snapshot()["retries"] > 0
+    assert client.request_stats.failures == 0
+
+
+def test_quota_message_raises(fake: FakeBabelNet) -> None:
+    fake.quota_after = 1
+    client = BabelNetHTTPClient("key", base_url=fake.start())
+    client.get_version()
+    with pytest.raises(BudgetExhaustedError):
+        client.get_synset("bn:00008364n")
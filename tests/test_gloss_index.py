@@ -0,0 +1,108 @@
+"""
+Tests for the local gloss index and the search_glosses tool.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List
+
+from babelnet_mcp.cache import ResponseCache
+from babelnet_mcp.gloss_index import GlossIndex, fts_query
+from babelnet_mcp.tools import register_search_tools
+
+from conftest import FakeMCP, RecordingClient
+
+
+def synset(synset_id: str, lemmas: Dict[str, str], glosses: List[Dict[str, str]]) -> Dict[str, Any]:
+    return {
+        "senses": [
+            {"properties": {
+                "language": lang, "pos": "NOUN", "source": "WN",
+                "synsetID": {"id": synset_id, "pos": "NOUN"},
+                "lemma": {"lemma": lemma, "type": "HIGH_QUALITY"},
+            }}
+            for lang, lemma in lemmas.items()
+        ],
+        "glosses": glosses,
+    }
+
+
+RIVER_BANK = synset("bn:00008363n", {"EN": "bank", "IT": "sponda"}, [
+    {"language": "EN", "source": "WN", "gloss": "Sloping land beside a body of water"},
+    {"language": "IT", "source": "WIKI", "gloss": "Terreno in pendenza lungo un fiume"},
+])
+BANK = synset("bn:00008364n", {"EN": "bank"}, [
+    {"language": "EN", "source": "WN", "gloss": "A financial institution that accepts deposits"},
+])
+SLOPE = synset("bn:00071849n", {"EN": "slope"}, [
+    {
+        "language": "EN", "source": "WN",
+        "gloss": "An elevated geological formation; land that slopes",
+    },
+])
+
+
+def test_fts_query_quotes_words() -> None:
+    assert fts_query('river "bank" NOT') == '"river" """bank""" "NOT"'
+    assert fts_query("slop* water", match_any=True) == '"slop"* OR "water"'
+    assert fts_query("  ") == ""
+
+
+def test_search_ranks_and_filters(tmp_path: Path) -> None:
+    index = GlossIndex(tmp_path / "glosses.sqlite")
+    index.add_many([("bn:00008363n", RIVER_BANK), ("bn:00008364n", BANK), ("bn:00071849n", SLOPE)])
+
+    assert {r["synset_id"] for r in index.search("land")} == {"bn:00008363n", "bn:00071849n"}
+    assert [r["synset_id"] for r in index.search("bank water")] == ["bn:00008363n"]
+    # A lemma match outranks a gloss-only match
+    assert [r["synset_id"] for r in index.search("slop*", langs=["EN"])] == [
+        "bn:00071849n", "bn:00008363n"
+    ]
+    italian = index.search("fiume", langs=["IT"])
+    assert italian[0]["lemmas"] == ["sponda"]
+    assert italian[0]["snippet"] == "Terreno in pendenza lungo un [fiume]"
+    assert index.search("fiume", langs=["EN"]) == []
+    assert index.search("deposits", sources=["WIKI"]) == []
+
+
+def test_add_replaces_only_the_languages_in_the_payload(tmp_path: Path) -> None:
+    index = GlossIndex(tmp_path / "glosses.sqlite")
+    index.add("bn:00008363n", RIVER_BANK)
+    english_only = synset("bn:00008363n", {"EN": "bank"}, [
+        {"language": "EN", "source": "WN", "gloss": "The side of a river"},
+    ])
+    index.add("bn:00008363n", english_only)
+
+    assert index.search("sloping") == []
+    assert len(index.search("river")) == 1
+    assert len(index.search("fiume")) == 1
+    assert index.stats() == {"synsets": 1, "rows": 2}
+
+
+def test_fetched_synsets_are_searchable(tmp_path: Path, mcp: FakeMCP) -> None:
+    client = RecordingClient(cache=ResponseCache(persistent=False))
+    client.gloss_index = GlossIndex(tmp_path / "glosses.sqlite")
+    register_search_tools(mcp, client)
+
+    client.get_synset("bn:00000001n")
+    client.get_synset("bn:00000001n")
+    result = mcp.tools["search_glosses"]("gloss", langs=["en"], pos="noun")
+
+    assert [r["synset_id"] for r in result["results"]] == ["bn:00000001n"]
+    assert client.count("getSynset") == 1
+
+
+def test_rebuild_from_cache(tmp_path: Path) -> None:
+    cache = ResponseCache(tmp_path / "cache.sqlite")
+    cache.put("getSynset", {"id": "bn:00008364n"}, BANK)
+    cache.put("getSynsetIds", {"lemma": "bank", "searchLang": ["EN"]}, [])
+    index = GlossIndex(tmp_path / "glosses.sqlite")
+
+    count = index.add_many((params["id"], value) for params, value in cache.responses("getSynset"))
+
+    assert count == 1
+    assert index.search("financial")[0]["synset_id"] == "bn:00008364n"
+
+
+def test_search_without_index(client: RecordingClient, mcp: FakeMCP) -> None:
+    register_search_tools(mcp, client)
+    assert mcp.tools["search_glosses"]("bank")["error"] == "gloss_index_disabled"
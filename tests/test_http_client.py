@@ -0,0 +1,130 @@
+"""
+Tests for retries and backoff in BabelNetHTTPClient.
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+requests = pytest.importorskip("requests")
+
+from babelnet_mcp import http_client  # noqa: E402
+from babelnet_mcp.budget import BudgetManager  # noqa: E402
+from babelnet_mcp.http_client import BabelNetHTTPClient  # noqa: E402
+
+
+class FakeResponse:
+    def __init__(self, status: int, body: Any = None, headers: Optional[Dict[str, str]] = None):
+        self.status_code = status
+        self._body = body if body is not None else []
+        self.headers = headers or {}
+        self.closed = False
+
+    @property
+    def content(self) -> bytes:
+        return json.dumps(self._body).encode("utf-8")
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"HTTP {self.status_code}")
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeSession:
+    """Replays a scripted sequence of responses or exceptions."""
+
+    def __init__(self, script: List[Any]) -> None:
+        self.script = list(script)
+        self.calls = 0
+
+    def get(self, url: str, params: Dict[str, Any], timeout: Any, **options: Any) -> FakeResponse:
+        self.calls += 1
+        item = self.script.pop(0)
+        if isinstance(item, BaseException):
+            raise item
+        return item
+
+
+@pytest.fixture
+def sleeps(monkeypatch: pytest.MonkeyPatch) -> List[float]:
+    recorded: List[float] = []
+    monkeypatch.setattr(http_client.time, "sleep", recorded.append)
+    return recorded
+
+
+def make_client(
+    script: List[Any], max_retries: int = 3, budget: Optional[BudgetManager] = None
+) -> BabelNetHTTPClient:
+    client = BabelNetHTTPClient("key", max_retries=max_retries, budget=budget)
+    client._session = FakeSession(script)  # type: ignore[assignment]
+    return client
+
+
+def test_retries_transient_errors(sleeps: List[float]) -> None:
+    client = make_client([
+        requests.ConnectionError("reset"),
+        FakeResponse(503),
+        FakeResponse(200, [{"id": "bn:1"}]),
+    ])
+    assert client.get_synset_ids("bank", ["EN"]) == [{"id": "bn:1"}]
+    stats = client.request_stats.snapshot()
+    assert stats["requests"] == 3
+    assert stats["retries"] == 2
+    assert len(sleeps) == 2
+
+
+def test_honors_retry_after_on_429(sleeps: List[float]) -> None:
+    client = make_client([
+        FakeResponse(429, headers={"Retry-After": "7"}),
+        FakeResponse(200, {"version": "V1"}),
+    ])
+    assert client.get_version() == {"version": "V1"}
+    assert sleeps == [7.0]
+
+
+def test_gives_up_after_max_retries(sleeps: List[float]) -> None:
+    client = make_client([FakeResponse(500)] * 3, max_retries=2)
+    with pytest.raises(requests.HTTPError):
+        client.get_synset("bn:1")
+    assert client.request_stats.snapshot()["failures"] == 1
+
+
+def test_closes_streamed_responses_it_does_not_return(sleeps: List[float]) -> None:
+    responses = [FakeResponse(503), FakeResponse(503)]
+    client = make_client(list(responses), max_retries=1)
+
+    with pytest.raises(requests.HTTPError):
+        client._request("https://babelnet.io/v9/getSynset", {"id": "bn:1"}, stream=True)
+
+    assert [resp.closed for resp in responses] == [True, True]
+
+
+def test_does_not_retry_client_errors(sleeps: List[float]) -> None:
+    client = make_client([FakeResponse(400)])
+    with pytest.raises(requests.HTTPError):
+        client.get_synset("bn:1")
+    assert sleeps == []
+
+
+def test_charges_each_answered_attempt(sleeps: List[float]) -> None:
+    budget = BudgetManager(daily_limit=100, path=None, rate=0, reserve=0)
+    client = make_client([
+        requests.ConnectionError("reset"),
+        FakeResponse(503),
+        FakeResponse(200, [{"id": "bn:1"}]),
+    ], budget=budget)
+    client.get_synset_ids("bank", ["EN"])
+    # The failed connection never reached BabelNet; the 503 and the answer did
+    assert budget.status()["spent"] == 2
+    assert client.metrics.snapshot()["coins_spent"] == {"getSynsetIds/none": 2}
+
+
+def test_unanswered_requests_cost_nothing(sleeps: List[float]) -> None:
+    budget = BudgetManager(daily_limit=100, path=None, rate=0, reserve=0)
+    client = make_client([requests.Timeout("slow")] * 2, max_retries=1, budget=budget)
+    with pytest.raises(requests.Timeout):
+        client.get_synset("bn:1")
+    assert budget.status()["spent"] == 0
@@ -0,0 +1,166 @@
+"""
+Tests for the hypernym DAG and the similarity tools.
+"""
+
+import asyncio
+from typing import Any, Dict, List
+
+import pytest
+
+from babelnet_mcp.async_client import AsyncBabelNetClient
+from babelnet_mcp.decode import VIEW_PARAM
+from babelnet_mcp.hypernyms import HypernymGraph
+from babelnet_mcp.tools import register_relation_tools
+
+from conftest import FakeMCP, RecordingClient
+
+# child -> hypernyms
+TAXONOMY = {
+    "entity": [],
+    "animal": ["entity"],
+    "carnivore": ["animal"],
+    "dog": ["carnivore"],
+    "cat": ["carnivore"],
+    "bird": ["animal"],
+    "pet": ["entity"],
+    "puppy": ["dog", "pet"],
+}
+
+
+def hypernym_edges(synset_id: str) -> List[Dict[str, Any]]:
+    edges = [
+        {
+            "target": target,
+            "language": "EN",
+            "pointer": {"name": "Hypernym", "shortName": "@", "relationGroup": "HYPERNYM"},
+            "normalizedWeight": 0.0,
+        }
+        for target in TAXONOMY.get(synset_id, [])
+    ]
+    # Other relations are ignored
+    edges.append({"target": "tail", "pointer": {"name": "Part of", "relationGroup": "HOLONYM"}})
+    return edges
+
+
+class TaxonomyClient(RecordingClient):
+    def _fetch(self, path: str, params: Dict[str, Any]) -> Any:
+        if path != "getOutgoingEdges":
+            return super()._fetch(path, params)
+        self.requests.append((path, dict(params)))
+        return hypernym_edges(params["id"])
+
+
+def build_graph() -> HypernymGraph:
+    graph = HypernymGraph()
+    for synset_id in TAXONOMY:
+        graph.add_edges(synset_id, hypernym_edges(synset_id))
+    return graph
+
+
+def test_ancestors_and_depths() -> None:
+    graph = build_graph()
+
+    ancestors = {graph.name(node): d for node, d in graph.ancestors("puppy").items()}
+
+    assert ancestors == {"puppy": 0, "dog": 1, "pet": 1, "carnivore": 2, "animal": 3, "entity": 2}
+    assert graph.depth("entity") == 0
+    assert graph.depth("dog") == 3
+    assert graph.depth("puppy") == 2
+
+
+def test_similarity_scores() -> None:
+    graph = build_graph()
+
+    dog_cat = graph.similarity("dog", "cat")
+    dog_bird = graph.similarity("dog", "bird")
+
+    assert dog_cat["lcs"] == "carnivore"
+    assert dog_cat["path"] == pytest.approx(1 / 3, abs=1e-4)
+    assert dog_cat["wup"] == pytest.approx(0.75)
+    assert dog_bird["lcs"] == "animal"
+    assert dog_bird["wup"] < dog_cat["wup"]
+    assert graph.similarity("dog", "dog")["wup"] == 1.0
+    assert graph.lowest_common_hypernym(["dog", "cat", "bird"])["synset_id"] == "animal"
+
+
+def test_cycles_and_unknown_ancestors() -> None:
+    graph = HypernymGraph()
+    cycle = {"pointer": {"name": "Hypernym", "relationGroup": "HYPERNYM"}}
+    graph.add_edges("a", [dict(cycle, target="b")])
+    graph.add_edges("b", [dict(cycle, target="a")])
+
+    assert set(graph.ancestors("a").values()) == {0, 1}
+    assert graph.missing(["a", "c"]) == ["c"]
+    assert graph.similarity("a", "c")["wup"] is None
+
+
+def test_tools_fetch_only_missing_ancestors(mcp: FakeMCP) -> None:
+    client = TaxonomyClient()
+    register_relation_tools(mcp, client, AsyncBabelNetClient(client))
+
+    first = asyncio.run(mcp.tools["synset_similarity"](["dog", "cat"]))
+    fetched = client.count("getOutgoingEdges")
+    second = asyncio.run(mcp.tools["lowest_common_hypernym"](["dog", "cat", "bird"]))
+
+    assert first["pairs"][0]["lcs"] == "carnivore"
+    assert first["complete"] is True
+    assert fetched == 5
+    # Only "bird" was new; its ancestors were already known
+    assert client.count("getOutgoingEdges") == fetched + 1
+    assert second["hypernym"]["synset_id"] == "animal"
+    assert second["hypernym"]["distances"] == {"dog": 2, "cat": 2, "bird": 1}
+
+
+def test_max_fetches_bounds_the_expansion(mcp: FakeMCP) -> None:
+    client = TaxonomyClient()
+    register_relation_tools(mcp, client, AsyncBabelNetClient(client))
+
+    result = asyncio.run(mcp.tools["synset_similarity"](["dog", "cat"], max_fetches=2))
+
+    assert client.count("getOutgoingEdges") == 2
+    assert result["complete"] is False
+    # Scored on the known part of the hierarchy
+    assert result["pairs"][0]["lcs"] == "carnivore"
+
+
+def test_hypernym_path_keeps_the_chain_walked_before_an_error(mcp: FakeMCP) -> None:
+    class FailingClient(TaxonomyClient):
+        def _fetch(self, path: str, params: Dict[str, Any]) -> Any:
+            if path == "getOutgoingEdges" and params["id"] == "carnivore":
+                raise TimeoutError("Read timed out")
+            return super()._fetch(path, params)
+
+    client = FailingClient()
+    register_relation_tools(mcp, client, AsyncBabelNetClient(client))
+
+    result = asyncio.run(mcp.tools["get_hypernym_path"]("puppy"))
+
+    assert [step["synset_id"] for step in result["path"]] == ["puppy", "dog", "carnivore"]
+    assert result["stopped"] == "error"
+    assert result["error"] == "Read timed out"
+
+
+def test_lemma_labels_are_bounded_by_max_nodes(mcp: FakeMCP) -> None:
+    class WideClient(RecordingClient):
+        def _fetch(self, path: str, params: Dict[str, Any]) -> Any:
+            if path != "getOutgoingEdges":
+                return super()._fetch(path, params)
+            self.requests.append((path, dict(params)))
+            pointer = {"name": "Hyponym", "relationGroup": "HYPONYM"}
+            return [{"target": f"bn:{n:08d}n", "pointer": pointer} for n in range(1, 201)]
+
+    client = WideClient()
+    register_relation_tools(mcp, client, AsyncBabelNetClient(client))
+
+    result = asyncio.run(mcp.tools["get_related_synsets"](
+        "bn:00000000n", relation="all", max_nodes=10, with_lemmas=True
+    ))
+
+    assert result["total_nodes"] == 200
+    assert client.count("getOutgoingEdges") == 1
+    # Only the first max_nodes nodes are labelled, from projected synsets
+    assert client.count("getSynset") == 10
+    assert all(VIEW_PARAM in params for path, params in client.requests if path == "getSynset")
+    assert [node.get("lemma") for node in result["nodes"][:10]] == ["bank"] * 10
+    assert "lemma" not in result["nodes"][10]
+    assert result["unlabeled"] == 191
@@ -0,0 +1,189 @@
+"""
+Tests for the local synset store and the import-dump command.
+"""
+
+import argparse
+import gzip
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from babelnet_mcp.backends import LocalStoreBackend, TieredRouter
+from babelnet_mcp.local_store import LocalSynsetStore, iter_dump
+
+from conftest import fake_synset
+from test_backends import FakeBackend
+
+
+def italian_synset(synset_id: str) -> Dict[str, Any]:
+    synset = fake_synset(synset_id)
+    synset["senses"].append({
+        "type": "BabelSense",
+        "properties": {
+            "fullLemma": "banca",
+            "language": "IT",
+            "pos": "NOUN",
+            "synsetID": {"id": synset_id, "pos": "NOUN", "source": "BABELNET"},
+            "lemma": {"lemma": "banca", "type": "HIGH_QUALITY"},
+        },
+    })
+    return synset
+
+
+EDGES: List[Dict[str, Any]] = [
+    {"target": "bn:00000009n", "pointer": {"name": "Hypernym", "shortName": "@"}},
+    {"target": "bn:00000008n", "pointer": {"name": "Part of", "shortName": "%p"}},
+]
+
+
+def write_dumps(directory: Path) -> Path:
+    """Write the same kind of records as a .jsonl file, a gzipped .json list and junk."""
+    directory.mkdir()
+    with open(directory / "synsets.jsonl", "w", encoding="utf-8") as f:
+        f.write(json.dumps({"synset": italian_synset("bn:00000000n"), "edges": EDGES}) + "\n\n")
+        f.write(json.dumps(fake_synset("bn:00000001n")) + "\n")
+        f.write(json.dumps({"synset": {"senses": []}}) + "\n")
+    with gzip.open(directory / "more.json.gz", "wt", encoding="utf-8") as f:
+        json.dump([{"id": "bn:00000002n", "synset": fake_synset("bn:00000002n")}], f)
+    (directory / "README.txt").write_text("not a dump")
+    return directory
+
+
+def test_iter_dump_reads_every_format(tmp_path: Path) -> None:
+    records = list(iter_dump([write_dumps(tmp_path / "dumps")]))
+
+    # Files are read in name order; the record without an ID is skipped
+    assert [r["id"] for r in records] == ["bn:00000002n", "bn:00000000n", "bn:00000001n"]
+    assert records[1]["edges"] == EDGES
+    assert records[2]["edges"] is None
+
+
+def test_store_serves_imported_synsets(tmp_path: Path) -> None:
+    store = LocalSynsetStore(tmp_path / "store.sqlite")
+
+    assert store.import_dump([write_dumps(tmp_path / "dumps")], batch_size=2) == 3
+
+    assert store.get_synset("bn:00000000n") == italian_synset("bn:00000000n")
+    assert store.get_synset("bn:00000099n") is None
+    assert store.get_synset_ids("Bank", ["en"]) == [
+        {"id": f"bn:{i:08d}n", "pos": "NOUN", "source": "BABELNET"} for i in range(3)
+    ]
+    assert [s["id"] for s in store.get_synset_ids("banca", ["IT"], poses=["noun"])] == [
+        "bn:00000000n"
+    ]
+    assert store.get_synset_ids("banca", ["IT"], poses=["VERB"]) == []
+    assert [s["properties"]["language"] for s in store.get_senses("bank", ["EN", "IT"])] == [
+        "EN", "EN", "EN"
+    ]
+    assert store.get_outgoing_edges("bn:00000000n") == EDGES
+    assert store.get_outgoing_edges("bn:00000000n", "@") == EDGES[:1]
+    assert store.get_outgoing_edges("bn:00000001n") is None
+    assert store.stats() == {"synsets": 3, "lemmas": 4, "edges": 1, "complete_langs": 0}
+    store.close()
+
+
+def test_lemma_lookups_are_answered_only_in_complete_languages(tmp_path: Path) -> None:
+    path = tmp_path / "store.sqlite"
+    store = LocalSynsetStore(path)
+    store.import_dump([write_dumps(tmp_path / "dumps")])
+    english = {"lemma": "bank", "searchLang": ["EN"]}
+
+    # Synsets are always served by ID, but a partial dump may miss some of a lemma's synsets
+    assert store.lookup("getSynset", {"id": "bn:00000001n"})[0]
+    assert store.lookup("getSynsetIds", english) == (False, None)
+
+    store.mark_complete(["en"])
+    store.commit()
+    store.close()
+    store = LocalSynsetStore(path)
+
+    hit, value = store.lookup("getSynsetIds", english)
+    assert hit and len(value) == 3
+    # A missing lemma in a complete language is known not to exist
+    assert store.lookup("getSenses", {"lemma": "qwzx", "searchLang": ["EN"]}) == (True, [])
+    assert store.lookup("getSynsetIds", {"lemma": "bank", "searchLang": ["EN", "IT"]}) == (
+        False, None
+    )
+    store.close()
+
+
+def test_partial_lemma_hits_go_upstream(tmp_path: Path) -> None:
+    store = LocalSynsetStore(tmp_path / "store.sqlite")
+    store.import_dump([write_dumps(tmp_path / "dumps")], complete_langs=["EN"])
+    upstream = FakeBackend("public", costs_coins=True)
+    router = TieredRouter([LocalStoreBackend(store), upstream])
+
+    backend, _ = router.fetch("getSynsetIds", {"lemma": "banca", "searchLang": ["IT"]})
+    assert backend is upstream
+    backend, value = router.fetch("getSynsetIds", {"lemma": "banca", "searchLang": ["EN"]})
+    assert backend.name == "local" and value == []
+    assert upstream.calls == 1
+
+
+def test_lookups_match_the_rest_answers(tmp_path: Path) -> None:
+    store = LocalSynsetStore(tmp_path / "store.sqlite")
+    wordnet = fake_synset("wn:02787772n")
+    wordnet["senses"][0]["properties"]["synsetID"]["source"] = "WN"
+    store.add_synset("wn:02787772n", wordnet)
+    store.add_synset("bn:00000000n", italian_synset("bn:00000000n"))
+    store.mark_complete(["EN", "IT"])
+
+    # The ID source is the synset's own, not assumed
+    assert store.get_synset_ids("bank", ["EN"]) == [
+        {"id": "bn:00000000n", "pos": "NOUN", "source": "BABELNET"},
+        {"id": "wn:02787772n", "pos": "NOUN", "source": "WN"},
+    ]
+    hit, synset = store.lookup("getSynset", {"id": "bn:00000000n", "targetLang": ["IT"]})
+    assert hit and [s["properties"]["language"] for s in synset["senses"]] == ["IT"]
+    assert synset["glosses"] == []
+    translated = {"lemma": "bank", "searchLang": ["EN"], "targetLang": ["IT"]}
+    assert store.lookup("getSenses", translated) == (False, None)
+    store.close()
+
+
+def test_stores_imported_without_id_sources_leave_them_out(tmp_path: Path) -> None:
+    path = tmp_path / "store.sqlite"
+    conn = sqlite3.connect(str(path))
+    conn.executescript(
+        """
+        CREATE TABLE synsets (id TEXT PRIMARY KEY, pos TEXT, data TEXT NOT NULL);
+        CREATE TABLE lemmas (
+            lemma TEXT NOT NULL, lang TEXT NOT NULL, pos TEXT NOT NULL,
+            synset_id TEXT NOT NULL, rank INTEGER NOT NULL,
+            PRIMARY KEY (lemma, lang, pos, synset_id)
+        ) WITHOUT ROWID;
+        INSERT INTO synsets VALUES ('bn:00000001n', 'NOUN', '{}');
+        INSERT INTO lemmas VALUES ('bank', 'EN', 'NOUN', 'bn:00000001n', 0);
+        """
+    )
+    conn.close()
+
+    store = LocalSynsetStore(path)
+    store.add_synset("bn:00000002n", fake_synset("bn:00000002n"))
+
+    assert store.get_synset_ids("bank", ["EN"]) == [
+        {"id": "bn:00000001n", "pos": "NOUN"},
+        {"id": "bn:00000002n", "pos": "NOUN", "source": "BABELNET"},
+    ]
+    store.close()
+
+
+def test_import_dump_command(tmp_path: Path) -> None:
+    pytest.importorskip("mcp")
+    from babelnet_mcp.server import run_import_dump
+
+    path = tmp_path / "store.sqlite"
+    args = argparse.Namespace(
+        paths=[str(write_dumps(tmp_path / "dumps"))], store=str(path), complete_langs=["it"]
+    )
+
+    run_import_dump(args)
+
+    store = LocalSynsetStore(path)
+    assert store.stats()["synsets"] == 3
+    assert store.lookup("getSynsetIds", {"lemma": "banca", "searchLang": ["IT"]})[0]
+    assert not store.lookup("getSynsetIds", {"lemma": "bank", "searchLang": ["EN"]})[0]
+    store.close()
@@ -0,0 +1,70 @@
+"""
+Tests for tool and request instrumentation.
+"""
+
+import asyncio
+import inspect
+from typing import Any
+
+import pytest
+
+from babelnet_mcp.async_client import AsyncBabelNetClient
+from babelnet_mcp.metrics import Histogram, InstrumentedMCP, Metrics, instrument_tool
+from babelnet_mcp.tools import register_definition_tool
+
+from conftest import FakeMCP, RecordingClient
+
+
+def test_histogram_quantiles() -> None:
+    histogram = Histogram((0.1, 1.0, 10.0))
+    for value in (0.05, 0.05, 0.5, 5.0):
+        histogram.observe(value)
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 4
+    assert snapshot["p50"] == 0.1
+    assert snapshot["p99"] == 5.0
+
+
+def test_wrapper_keeps_signature_and_records_errors() -> None:
+    metrics = Metrics()
+
+    async def lookup(word: str, limit: int = 3) -> Any:
+        raise ValueError(word)
+
+    wrapped = instrument_tool(metrics, "lookup", lookup)
+    assert inspect.signature(wrapped) == inspect.signature(lookup)
+    assert inspect.iscoroutinefunction(wrapped)
+    with pytest.raises(ValueError):
+        asyncio.run(wrapped("bank"))
+    snapshot = metrics.snapshot()
+    assert snapshot["tool_seconds"]["lookup"]["count"] == 1
+    assert snapshot["tool_errors"] == {"lookup/ValueError": 1}
+
+
+def test_tools_and_requests_are_instrumented(cached_client: RecordingClient) -> None:
+    mcp = FakeMCP()
+    register_definition_tool(InstrumentedMCP(mcp, cached_client.metrics), cached_client)
+    asyncio.run(mcp.tools["get_definition"]("bank"))
+    asyncio.run(mcp.tools["get_definition"]("bank"))
+    snapshot = cached_client.metrics.snapshot()
+    assert snapshot["tool_seconds"]["get_definition"]["count"] == 2
+    assert snapshot["cache_requests"] == {
+        "getSynset/hit": 3, "getSynset/miss": 3, "getSynsetIds/hit": 1, "getSynsetIds/miss": 1,
+    }
+    assert snapshot["cache_hit_rate"] == 0.5
+    assert 'babelnet_cache_requests_total{endpoint="getSynset",outcome="hit"} 3' in (
+        cached_client.metrics.prometheus()
+    )
+
+
+def test_coins_are_attributed_to_the_calling_tool(mcp: FakeMCP, client: RecordingClient) -> None:
+    aclient = AsyncBabelNetClient(client)
+    server = InstrumentedMCP(mcp, client.metrics)
+
+    @server.tool()
+    async def spend() -> None:
+        # Runs on the worker pool, like a real upstream request
+        await aclient._call(client.metrics.record_coin, "getSynset")
+
+    asyncio.run(mcp.tools["spend"]())
+    assert client.metrics.snapshot()["coins_spent"] == {"getSynset/spend": 1}
@@ -0,0 +1,57 @@
+"""
+Tests for the compact synset model.
+"""
+
+import json
+
+from babelnet_mcp.constants import LANGUAGE_MAP, POS_MAP, RELATION_GROUPS
+from babelnet_mcp.model import (
+    POS,
+    Language,
+    Pointer,
+    RelationGroup,
+    Source,
+    parse_edges,
+    parse_synset,
+)
+
+from conftest import fake_synset
+
+
+def test_parse_synset_from_bytes() -> None:
+    body = json.dumps(fake_synset("bn:00008364n")).encode("utf-8")
+    synset = parse_synset(body)
+    assert synset.id == "bn:00008364n"
+    assert synset.pos == "NOUN"
+    assert synset.senses[0].language is Language.EN
+    assert synset.glosses[0].source is Source.WN
+    assert synset.lemmas("en") == ["bank"]
+    assert synset.glosses_in("EN") == ["Gloss of bn:00008364n"]
+    assert synset.to_dict()["senses"] == [{
+        "lemma": "bank", "language": "EN", "pos": "NOUN", "source": "", "synset_id": "bn:00008364n",
+    }]
+
+
+def test_unknown_tags_are_interned() -> None:
+    payload = fake_synset("bn:1n")
+    payload["glosses"][0]["language"] = "la"
+    gloss = parse_synset(payload).glosses[0]
+    assert gloss.language == "LA"
+    assert gloss.language is parse_synset(payload).glosses[0].language
+
+
+def test_edges_share_pointers() -> None:
+    pointer = {"fSymbol": "@", "name": "Hypernym", "shortName": "is-a", "relationGroup": "HYPERNYM"}
+    edges = parse_edges(json.dumps([
+        {"language": "EN", "pointer": dict(pointer), "target": "bn:1n", "normalizedWeight": 0.5},
+        {"language": "EN", "pointer": dict(pointer), "target": "bn:2n"},
+    ]))
+    assert edges[0].pointer is edges[1].pointer is Pointer.get(pointer)
+    assert edges[0].pointer.group is RelationGroup.HYPERNYM
+    assert edges[0].weight == 0.5
+
+
+def test_enums_cover_the_constants() -> None:
+    assert [tag.value for tag in Language] == list(LANGUAGE_MAP.values())
+    assert [tag.value for tag in POS] == list(POS_MAP.values())
+    assert {tag.value for tag in RelationGroup} == {*RELATION_GROUPS.values(), "ANTONYM", "OTHER"}
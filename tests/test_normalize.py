@@ -0,0 +1,79 @@
+"""
+Tests for lemma normalization and negative caching of empty lookups.
+"""
+
+import asyncio
+import unicodedata
+from pathlib import Path
+
+from babelnet_mcp.cache import ResponseCache
+from babelnet_mcp.normalize import LemmaNormalizer, normalize_lemma
+from babelnet_mcp.tools import register_sense_tools, register_synset_tools
+from babelnet_mcp.warmup import Prefetcher
+
+from conftest import FakeMCP, RecordingClient
+
+
+def test_normalize_lemma() -> None:
+    assert normalize_lemma("  Bank\t") == "bank"
+    assert normalize_lemma("river   Bank") == "river bank"
+    assert normalize_lemma(unicodedata.normalize("NFD", "Café")) == "café"
+    assert normalize_lemma("Straße") == "straße"
+
+
+def test_lemma_table(tmp_path: Path) -> None:
+    table = tmp_path / "lemmas.tsv"
+    table.write_text("# inflections\nEN\tBanks\tbank\nIT\tbanche\tbanca\n", encoding="utf-8")
+    normalizer = LemmaNormalizer.from_file(table)
+    assert normalizer("banks", ["EN"]) == "bank"
+    assert normalizer("banks", ["IT"]) == "banks"
+    assert normalizer("Banche ", ["EN", "IT"]) == "banca"
+
+
+def test_spelling_variants_share_one_lookup(mcp: FakeMCP) -> None:
+    client = RecordingClient(cache=ResponseCache(persistent=False))
+    client.normalizer = LemmaNormalizer({"EN": {"banks": "bank"}})
+    register_synset_tools(mcp, client)
+    for word in ("bank", "Bank", " bank ", "banks"):
+        asyncio.run(mcp.tools["get_synsets"](word))
+    assert client.count("getSynsetIds") == 1
+    assert client.requests[0][1]["lemma"] == "bank"
+
+
+def test_unknown_pos_is_left_out_of_the_lookup(mcp: FakeMCP) -> None:
+    client = RecordingClient()
+    register_synset_tools(mcp, client)
+    register_sense_tools(mcp, client)
+
+    asyncio.run(mcp.tools["get_synsets"]("bank", pos="bogus"))
+    asyncio.run(mcp.tools["get_senses"]("bank", pos="bogus"))
+    asyncio.run(mcp.tools["get_senses"]("bank", pos="bogus", compact=True))
+
+    # Sent as an unfiltered lookup rather than a [None] POS filter
+    assert [params for _, params in client.requests] == [
+        {"lemma": "bank", "searchLang": ["EN"]}
+    ] * 3
+
+
+def test_warmup_resolves_lemma_seeds_under_their_normalized_key() -> None:
+    client = RecordingClient(cache=ResponseCache(persistent=False))
+    summary = asyncio.run(Prefetcher(client, coins=10, neighbors=False).run(["Bank"]))
+    assert summary["synsets"] == 3
+    assert client.count("getSynsetIds") == 1
+    assert client.cache is not None
+    assert client.cache.contains("getSynsetIds", {"lemma": "bank", "searchLang": ["EN"]})
+
+
+def test_empty_lookups_are_cached_with_their_own_ttl() -> None:
+    client = RecordingClient(synsets_per_lemma=0, cache=ResponseCache(persistent=False))
+    assert client.get_synset_ids("bnak", ["EN"]) == []
+    assert client.get_synset_ids("Bnak", ["EN"]) == []
+    assert client.count("getSynsetIds") == 1
+    assert client.cache.stats()["negative_hits"] == 1
+
+    expired = RecordingClient(
+        synsets_per_lemma=0, cache=ResponseCache(persistent=False, negative_ttl=-1)
+    )
+    expired.get_synset_ids("bnak", ["EN"])
+    expired.get_synset_ids("bnak", ["EN"])
+    assert expired.count("getSynsetIds") == 2
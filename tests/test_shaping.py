@@ -0,0 +1,81 @@
+"""
+Tests for field projection of synsets and senses.
+"""
+
+import asyncio
+from typing import Any, Dict
+
+from babelnet_mcp.shaping import project_senses, project_synset
+from babelnet_mcp.tools import register_sense_tools, register_synset_tools
+
+from conftest import FakeMCP, RecordingClient
+
+
+def sense(lemma: str, lang: str, source: str = "WN") -> Dict[str, Any]:
+    return {"properties": {
+        "lemma": {"lemma": lemma}, "language": lang, "pos": "NOUN", "source": source,
+        "synsetID": {"id": "bn:00008364n"},
+    }}
+
+
+SYNSET = {
+    "senses": [sense("bank", "EN"), sense("banca", "IT"), sense("Bank", "EN", "WIKI")],
+    "glosses": [
+        {"language": "EN", "gloss": "A financial institution", "source": "WN"},
+        {"language": "IT", "gloss": "Istituto di credito", "source": "WIKI"},
+    ],
+    "images": [{"url": "https://example.org/bank.png"}],
+    "synsetType": "CONCEPT",
+}
+
+
+def test_project_synset_filters_languages_and_fields() -> None:
+    result = project_synset(SYNSET, fields=["senses", "glosses"], langs=["en"])
+    assert set(result) == {"senses", "glosses"}
+    assert [s["properties"]["lemma"]["lemma"] for s in result["senses"]] == ["bank", "Bank"]
+    assert [g["language"] for g in result["glosses"]] == ["EN"]
+    # Kept entries are shared, not copied
+    assert result["senses"][0] is SYNSET["senses"][0]
+
+
+def test_project_synset_compact() -> None:
+    result = project_synset(SYNSET, sources=["wn"], max_senses=1, compact=True)
+    assert set(result) == {"senses", "glosses", "synsetType"}
+    assert result["senses"] == [{
+        "lemma": "bank", "language": "EN", "pos": "NOUN", "source": "WN",
+        "synset_id": "bn:00008364n",
+    }]
+    assert result["glosses"] == [
+        {"language": "EN", "gloss": "A financial institution", "source": "WN"}
+    ]
+
+
+def test_project_senses() -> None:
+    assert len(project_senses(SYNSET["senses"], langs=["it"])) == 1
+    assert len(project_senses(SYNSET["senses"], max_senses=2)) == 2
+
+
+def test_projected_views_are_cached(mcp: FakeMCP, cached_client: RecordingClient) -> None:
+    register_synset_tools(mcp, cached_client)
+    register_sense_tools(mcp, cached_client)
+    first = asyncio.run(mcp.tools["get_synset_by_id"]("bn:00000001n", compact=True))
+    assert set(first) == {"senses", "glosses"}
+    asyncio.run(mcp.tools["get_senses"]("bank", compact=True, max_senses=1))
+    before = cached_client.count()
+    again = asyncio.run(mcp.tools["get_synset_by_id"]("bn:00000001n", compact=True))
+    asyncio.run(mcp.tools["get_senses"]("bank", compact=True, max_senses=1))
+    assert again == first
+    assert cached_client.count() == before == 2
+
+
+def test_get_senses_filters_languages(mcp: FakeMCP, cached_client: RecordingClient) -> None:
+    assert cached_client.cache is not None
+    query = cached_client.lemma_query("bank", ["EN", "IT"])
+    cached_client.cache.put("getSenses", query, SYNSET["senses"])
+    register_sense_tools(mcp, cached_client)
+    italian = asyncio.run(mcp.tools["get_senses"]("bank", from_langs=["en", "it"], langs=["it"]))
+    everything = asyncio.run(mcp.tools["get_senses"]("bank", from_langs=["en", "it"]))
+    assert italian["senses"] == [SYNSET["senses"][1]]
+    assert everything["senses"] == SYNSET["senses"]
+    # Both were derived from the cached raw response
+    assert cached_client.count() == 0
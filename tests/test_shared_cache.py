@@ -0,0 +1,124 @@
+"""
+Tests for sharing the cache, fetch locks and Babelcoin accounting between processes.
+"""
+
+import multiprocessing
+import sqlite3
+import time
+from pathlib import Path
+
+import pytest
+
+from babelnet_mcp import cache as cache_module
+from babelnet_mcp.budget import BudgetManager
+from babelnet_mcp.cache import ResponseCache
+from babelnet_mcp.locking import ProcessLock, fcntl
+
+from conftest import RecordingClient
+
+needs_fcntl = pytest.mark.skipif(fcntl is None, reason="fcntl locks are POSIX only")
+
+
+def _hold_lock(
+    path: str, key: str, seconds: float, ready: "multiprocessing.synchronize.Event"
+) -> None:
+    lock = ProcessLock(Path(path))
+    with lock.hold(key):
+        ready.set()
+        time.sleep(seconds)
+
+
+def test_cache_file_is_in_wal_mode(tmp_path: Path) -> None:
+    ResponseCache(tmp_path / "cache.sqlite")
+    conn = sqlite3.connect(str(tmp_path / "cache.sqlite"))
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_second_process_reads_what_the_first_fetched(tmp_path: Path) -> None:
+    first = RecordingClient(cache=ResponseCache(tmp_path / "cache.sqlite"))
+    second = RecordingClient(cache=ResponseCache(tmp_path / "cache.sqlite"))
+
+    first.get_synset("bn:00000001n")
+    second.get_synset("bn:00000001n")
+
+    assert first.count() == 1
+    assert second.count() == 0
+
+
+def test_get_shared_sees_entries_stored_after_a_miss(tmp_path: Path) -> None:
+    first = ResponseCache(tmp_path / "cache.sqlite")
+    second = ResponseCache(tmp_path / "cache.sqlite")
+    params = {"id": "bn:00000001n"}
+
+    assert second.get("getSynset", params) == (False, None)
+    first.put("getSynset", params, {"senses": []})
+
+    assert second.get_shared("getSynset", params) == (True, {"senses": []})
+    assert second.stats()["shared_hits"] == 1
+    assert second.stats()["misses"] == 1
+
+
+@needs_fcntl
+def test_process_lock_excludes_other_processes(tmp_path: Path) -> None:
+    path = tmp_path / "cache.sqlite.lock"
+    ctx = multiprocessing.get_context("fork")
+    ready = ctx.Event()
+    holder = ctx.Process(target=_hold_lock, args=(str(path), "getSynset?bn:1", 0.3, ready))
+    holder.start()
+    try:
+        assert ready.wait(5)
+        lock = ProcessLock(path)
+        with lock.hold("getSynset?bn:2", timeout=0) as other_key:
+            assert other_key
+        start = time.monotonic()
+        with lock.hold("getSynset?bn:1") as same_key:
+            assert same_key
+        assert time.monotonic() - start >= 0.1
+        assert lock.waits == 1
+    finally:
+        holder.join()
+
+
+def test_budget_is_shared_between_managers(tmp_path: Path) -> None:
+    path = tmp_path / "budget.json"
+    first = BudgetManager(daily_limit=100, path=path, rate=0, reserve=0)
+    second = BudgetManager(daily_limit=100, path=path, rate=0, reserve=0)
+
+    for _ in range(3):
+        first.acquire("getSynset")
+    for _ in range(2):
+        second.acquire("getSynset")
+
+    assert first.remaining() == 95
+    assert second.status()["spent"] == 5
+
+
+def test_disk_hits_are_reads_and_keep_their_expiry(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+    writer = ResponseCache(tmp_path / "cache.sqlite", ttls={"getSynset": 100})
+    writer.put("getSynset", {"id": "bn:1"}, {"senses": []})
+    reader = ResponseCache(tmp_path / "cache.sqlite", ttls={"getSynset": 100})
+    assert reader._disk is not None
+    changes = reader._disk._conn.total_changes
+
+    now[0] += 60
+    assert reader.get("getSynset", {"id": "bn:1"}) == (True, {"senses": []})
+    assert reader._disk._conn.total_changes == changes
+    # Served from memory until the stored expiry, not for another full TTL
+    now[0] += 50
+    assert reader.get("getSynset", {"id": "bn:1"}) == (False, None)
+
+
+def test_batched_hits_reach_the_entry_order(tmp_path: Path) -> None:
+    cache = ResponseCache(tmp_path / "cache.sqlite", memory_max_bytes=0)
+    cache.put("getSynset", {"id": "bn:1"}, {"senses": []})
+    cache.put("getSynset", {"id": "bn:2"}, {"senses": []})
+    for _ in range(3):
+        cache.get("getSynset", {"id": "bn:2"})
+
+    assert [(params["id"], hits) for _, params, hits in cache.entries()] == [
+        ("bn:2", 3), ("bn:1", 0)
+    ]
@@ -0,0 +1,116 @@
+"""
+Tests for exporting and importing cache snapshots.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from babelnet_mcp.backends import LocalStoreBackend, TieredRouter
+from babelnet_mcp.cache import ResponseCache, cache_key
+from babelnet_mcp.http_client import BabelNetHTTPClient
+from babelnet_mcp.snapshot import (
+    SnapshotError,
+    SnapshotReader,
+    export_cache,
+    import_snapshot,
+    write_snapshot,
+)
+
+from conftest import fake_synset, fake_synset_ids
+from test_backends import FakeResponse
+
+
+def filled_cache(path: Path, synsets: int = 50) -> ResponseCache:
+    cache = ResponseCache(path)
+    cache.sync_version("5.3")
+    for i in range(synsets):
+        cache.put("getSynset", {"id": f"bn:{i:08d}n"}, fake_synset(f"bn:{i:08d}n"))
+    cache.put("getSynsetIds", {"lemma": "bank", "searchLang": ["EN"]}, fake_synset_ids("bank"))
+    cache.put("getSynsetIds", {"lemma": "qwzx", "searchLang": ["EN"]}, [])
+    cache.put("getVersion", {}, {"version": "V5_3"})
+    return cache
+
+
+def test_export_and_import_round_trip(tmp_path: Path) -> None:
+    source = filled_cache(tmp_path / "source.sqlite")
+    header = export_cache(source, tmp_path / "warm.bnsnap", "5.3", chunk_bytes=4096)
+    target = ResponseCache(tmp_path / "target.sqlite")
+
+    reader = SnapshotReader(tmp_path / "warm.bnsnap")
+    counts = import_snapshot(target, reader)
+
+    assert header["entries"] == 52
+    assert header["chunks"] > 1
+    assert header["endpoints"]["getSynset"] == 50
+    assert reader.babelnet_version == "5.3"
+    assert counts == {"imported": 52, "skipped": 0}
+    assert target.get("getSynset", {"id": "bn:00000007n"}) == (True, fake_synset("bn:00000007n"))
+    assert target.get("getSynsetIds", {"searchLang": ["EN"], "lemma": "qwzx"}) == (True, [])
+    # getVersion is not shipped
+    assert not target.contains("getVersion", {})
+    assert import_snapshot(target, reader) == {"imported": 0, "skipped": 52}
+    # Exported in cache key order, straight from the SQLite index
+    keys = [cache_key(path, params) for path, params, _ in reader]
+    assert keys == sorted(keys)
+
+
+def test_lookups_decompress_only_their_chunk(tmp_path: Path) -> None:
+    records = [
+        ("getSynset", {"id": f"bn:{i:08d}n"}, fake_synset(f"bn:{i:08d}n")) for i in range(200)
+    ]
+    header = write_snapshot(tmp_path / "warm.bnsnap", records, "5.3", chunk_bytes=2048)
+    reader = SnapshotReader(tmp_path / "warm.bnsnap", cached_chunks=2)
+
+    assert reader.get("getSynset", {"id": "bn:00000123n"}) == (True, fake_synset("bn:00000123n"))
+    assert reader.get("getSynset", {"id": "bn:99999999n"}) == (False, None)
+    assert len(reader) == 200
+    assert len(reader._decoded) == 1 < header["chunks"]
+
+
+def test_snapshot_serves_as_a_backend(tmp_path: Path) -> None:
+    write_snapshot(
+        tmp_path / "warm.bnsnap", [("getSynset", {"id": "bn:1"}, fake_synset("bn:1"))], "5.3"
+    )
+    backend = LocalStoreBackend(SnapshotReader(tmp_path / "warm.bnsnap"), "snapshot")
+    router = TieredRouter([backend])
+
+    answered_by, value = router.fetch("getSynset", {"id": "bn:1"})
+
+    assert answered_by.name == "snapshot"
+    assert value == fake_synset("bn:1")
+    with pytest.raises(LookupError):
+        router.fetch("getSynset", {"id": "bn:2"})
+
+
+def test_rejects_other_files(tmp_path: Path) -> None:
+    (tmp_path / "empty").write_bytes(b"")
+    (tmp_path / "junk").write_bytes(b"not a snapshot at all, just some bytes")
+
+    with pytest.raises(SnapshotError):
+        SnapshotReader(tmp_path / "empty")
+    with pytest.raises(SnapshotError):
+        SnapshotReader(tmp_path / "junk")
+
+
+def test_client_stops_serving_a_snapshot_from_another_release(tmp_path: Path) -> None:
+    write_snapshot(
+        tmp_path / "warm.bnsnap", [("getSynset", {"id": "bn:1"}, fake_synset("bn:1"))], "5.3"
+    )
+    client = BabelNetHTTPClient(
+        "key", cache=ResponseCache(persistent=False),
+        snapshot=SnapshotReader(tmp_path / "warm.bnsnap"),
+    )
+    rest = client.router.backends[-1]
+    requested: List[str] = []
+
+    def request(url: str, query: Dict[str, Any], **options: Any) -> FakeResponse:
+        requested.append(url.rsplit("/", 1)[1])
+        return FakeResponse({"version": "V5_4"} if url.endswith("getVersion") else {"live": 1})
+
+    rest.request = request  # type: ignore[attr-defined]
+
+    assert client.get_synset("bn:1") == {"live": 1}
+    assert requested == ["getVersion", "getSynset"]
+    assert "snapshot" not in [backend.name for backend in client.router.backends]
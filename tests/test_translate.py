@@ -0,0 +1,84 @@
+"""
+Tests for translate_word: batched target languages and translation ranking.
+"""
+
+import asyncio
+from typing import Any, Dict, List
+
+from babelnet_mcp.async_client import AsyncBabelNetClient
+from babelnet_mcp.cache import ResponseCache
+from babelnet_mcp.tools import register_translate_tools
+from babelnet_mcp.tools.translate import language_batches
+
+from conftest import FakeMCP, RecordingClient, fake_synset
+
+LEMMAS = {"EN": "bank", "IT": "banca", "FR": "banque", "DE": "Bank", "ES": "banco"}
+
+
+class MultilingualClient(RecordingClient):
+    """RecordingClient whose synsets carry a sense in each requested target language."""
+
+    def _fetch(self, path: str, params: Dict[str, Any]) -> Any:
+        if path != "getSynset":
+            return super()._fetch(path, params)
+        self.requests.append((path, dict(params)))
+        data = fake_synset(params["id"])
+        template = data["senses"][0]
+        for lang in params.get("targetLang", []):
+            if lang != "EN" and lang in LEMMAS:
+                props = dict(template["properties"], language=lang, fullLemma=LEMMAS[lang])
+                props["lemma"] = {"lemma": LEMMAS[lang], "type": "HIGH_QUALITY"}
+                data["senses"].append({"type": "BabelSense", "properties": props})
+        if self.cache is not None:
+            self.cache.put(path, params, data)
+        return data
+
+
+def _translate(client: RecordingClient, mcp: FakeMCP, **kwargs: Any) -> Dict[str, Any]:
+    return asyncio.run(mcp.tools["translate_word"](**kwargs))
+
+
+def test_language_batches_are_fixed() -> None:
+    assert language_batches(["IT", "EN"]) == [("EN", "IT", "ES")]
+    assert language_batches(["FR", "IT", "XX"]) == [("FR", "DE", "PT"), ("EN", "IT", "ES"), ("XX",)]
+
+
+def test_translate_ranks_lemmas_per_language(mcp: FakeMCP) -> None:
+    client = MultilingualClient(synsets_per_lemma=2, cache=ResponseCache(persistent=False))
+    register_translate_tools(mcp, client, AsyncBabelNetClient(client))
+
+    result = _translate(client, mcp, word="bank", to_langs=["it", "fr"])
+
+    assert result["translations"]["it"][0]["lemma"] == "banca"
+    assert result["translations"]["fr"][0]["synset_ids"] == ["bn:00000000n", "bn:00000001n"]
+    assert [s["gloss"] for s in result["synsets"]] == [
+        "Gloss of bn:00000000n", "Gloss of bn:00000001n"
+    ]
+    # One lookup, then one request per synset and language batch
+    assert client.count("getSynsetIds") == 1
+    assert client.count("getSynset") == 2 * 2
+
+
+def test_translate_reuses_cached_language_batch(mcp: FakeMCP) -> None:
+    client = MultilingualClient(synsets_per_lemma=2, cache=ResponseCache(persistent=False))
+    register_translate_tools(mcp, client, AsyncBabelNetClient(client))
+
+    _translate(client, mcp, word="bank", to_langs=["it"])
+    before = client.count()
+    result = _translate(client, mcp, word="bank", to_langs=["es"])
+
+    assert client.count() == before
+    assert result["translations"]["es"][0]["lemma"] == "banco"
+
+
+def test_translate_skips_languages_without_senses(mcp: FakeMCP) -> None:
+    client = MultilingualClient(synsets_per_lemma=1)
+    register_translate_tools(mcp, client, AsyncBabelNetClient(client))
+
+    result = _translate(client, mcp, word="bank", to_langs=["ja"])
+
+    assert result["translations"] == {"ja": []}
+    requested: List[List[str]] = [
+        p["targetLang"] for path, p in client.requests if path == "getSynset"
+    ]
+    assert requested == [["ZH", "JA", "RU"], ["EN", "IT", "ES"]]